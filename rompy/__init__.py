@@ -7,6 +7,7 @@
 # -----------------------------------------------------------------------------
 
 import logging
+import os
 from pathlib import Path
 
 # from . import _version
@@ -18,3 +19,4 @@ __version__ = "0.2.6"
 
 ROOT_DIR = Path(__file__).parent.resolve()
 TEMPLATES_DIR = ROOT_DIR / "templates"
+CACHE_DIR = Path(os.environ.get("ROMPY_CACHE_DIR", Path.home() / ".cache" / "rompy"))
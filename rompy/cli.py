@@ -2,6 +2,7 @@
 
 import json
 import logging
+from datetime import datetime
 from importlib.metadata import entry_points
 
 import click
@@ -14,11 +15,30 @@ logging.basicConfig(level=logging.INFO)
 installed = entry_points(group="rompy.config").names
 
 
-@click.command()
+class RompyGroup(click.Group):
+    """Command group defaulting to the run command.
+
+    This keeps the `rompy <model> config.yml` usage working alongside subcommands.
+
+    """
+
+    def parse_args(self, ctx, args):
+        subcommands = list(self.commands) + ctx.help_option_names
+        if not args or args[0] not in subcommands:
+            args = ["run"] + args
+        return super().parse_args(ctx, args)
+
+
+@click.group(cls=RompyGroup)
+def main():
+    """Relocatable Ocean Modelling in PYthon (rompy)."""
+
+
+@main.command()
 @click.argument("model", type=click.Choice(installed), envvar="ROMPY_MODEL")
 @click.argument("config", envvar="ROMPY_CONFIG")
 @click.option("zip", "--zip/--no-zip", default=False, envvar="ROMPY_ZIP")
-def main(model, config, zip):
+def run(model, config, zip):
     """Run model
     Usage: rompy <model> config.yml
     Args:
@@ -44,5 +64,56 @@ def main(model, config, zip):
         model.zip()
 
 
+@main.group()
+def cache():
+    """Inspect and prune the persistent output cache."""
+
+
+@cache.command()
+def info():
+    """List the entries in the output cache."""
+    from rompy.core.cache import OUTPUT_CACHE
+
+    entries = OUTPUT_CACHE.entries()
+    for entry in entries[::-1]:
+        last_used = datetime.fromtimestamp(entry["last_used"])
+        click.echo(
+            f"{entry['key']}  {entry['size'] / 1e6:10.1f} MB  "
+            f"{last_used:%Y-%m-%dT%H:%M:%S}  {' '.join(entry['files'])}"
+        )
+    click.echo(
+        f"{len(entries)} entries, {OUTPUT_CACHE.size() / 1e6:.1f} MB in "
+        f"{OUTPUT_CACHE.cachedir} (max {OUTPUT_CACHE.maxsize / 1e6:.1f} MB)"
+    )
+
+
+@cache.command()
+@click.option("--max-size", type=float, default=None, help="Maximum cache size in MB")
+@click.option(
+    "--older-than",
+    type=float,
+    default=None,
+    help="Also evict entries unused for this many days",
+)
+def prune(max_size, older_than):
+    """Evict least recently used entries from the output cache."""
+    from rompy.core.cache import OUTPUT_CACHE
+
+    removed = OUTPUT_CACHE.prune(
+        maxsize=None if max_size is None else int(max_size * 1e6),
+        older_than=None if older_than is None else older_than * 86400,
+    )
+    click.echo(f"Removed {len(removed)} entries from {OUTPUT_CACHE.cachedir}")
+
+
+@cache.command()
+def clear():
+    """Remove all entries from the output cache."""
+    from rompy.core.cache import OUTPUT_CACHE
+
+    OUTPUT_CACHE.clear()
+    click.echo(f"Cleared {OUTPUT_CACHE.cachedir}")
+
+
 if __name__ == "__main__":
     main()
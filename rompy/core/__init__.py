@@ -5,3 +5,4 @@ from .grid import BaseGrid, RegularGrid
 from .spectrum import LogFrequency
 from .time import TimeRange
 from .types import *
+from .writer import DataWriter
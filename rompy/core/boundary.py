@@ -1,76 +1,128 @@
 """Boundary classes."""
 
 import logging
+import threading
+from collections import OrderedDict, namedtuple
 from pathlib import Path
 from typing import Literal, Optional, Union
 import numpy as np
 import xarray as xr
 from pydantic import Field, field_validator
+from scipy.spatial import cKDTree
 
 from rompy.core.data import DataGrid
 from rompy.core.grid import RegularGrid
+from rompy.core.interpolate import interpolation_plan
 from rompy.core.time import TimeRange
 from rompy.utils import load_entry_points
 
 logger = logging.getLogger(__name__)
 
 
-def find_minimum_distance(points: list[tuple[float, float]]) -> float:
-    """Find the minimum distance between a set of points.
+SpacingStats = namedtuple("SpacingStats", ["min", "median", "mean", "max", "count"])
+
+
+def _lonlat_to_xyz(lon: np.ndarray, lat: np.ndarray) -> np.ndarray:
+    """Cartesian coordinates of lon/lat points on the unit sphere."""
+    lon, lat = np.radians(lon), np.radians(lat)
+    return np.column_stack(
+        [np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)]
+    )
+
+
+def nearest_neighbour_distances(x, y, geodesic: bool = False) -> np.ndarray:
+    """Distance from each point to its nearest neighbour.
 
     Parameters
     ----------
-    points: list[tuple[float, float]]
-        List of points as (x, y) tuples.
+    x: array-like
+        The x coordinates of the points.
+    y: array-like
+        The y coordinates of the points.
+    geodesic: bool
+        Compute great-circle distances in degrees treating x and y as longitudes
+        and latitudes, cartesian distances are computed otherwise.
 
     Returns
     -------
-    min_distance: float
-        Minimum distance between all points.
+    distances: np.ndarray
+        Distance from each point to the closest other point, inf if there are less
+        than two points.
 
     """
+    x = np.asarray(x, dtype=float).ravel()
+    y = np.asarray(y, dtype=float).ravel()
+    if x.size <= 1:
+        return np.full(x.size, np.inf)
+    if geodesic:
+        xyz = _lonlat_to_xyz(x, y)
+        chord = cKDTree(xyz).query(xyz, k=2)[0][:, 1]
+        return np.degrees(2 * np.arcsin(np.clip(chord / 2, 0.0, 1.0)))
+    xy = np.column_stack([x, y])
+    return cKDTree(xy).query(xy, k=2)[0][:, 1]
 
-    def calculate_distance(x1, y1, x2, y2):
-        return np.sqrt((x2 - x1) ** 2 + (y2 - y1) ** 2)
 
-    n = len(points)
-    if n <= 1:
-        return float("inf")
+def spacing_stats(x, y, geodesic: bool = False) -> SpacingStats:
+    """Distribution of the nearest neighbour spacing between points.
 
-    # Sort points by x-coordinate
-    points.sort()
+    Parameters
+    ----------
+    x: array-like
+        The x coordinates of the points.
+    y: array-like
+        The y coordinates of the points.
+    geodesic: bool
+        Compute great-circle distances in degrees treating x and y as longitudes
+        and latitudes, cartesian distances are computed otherwise.
 
-    # Recursive step
-    if n == 2:
-        return calculate_distance(*points[0], *points[1])
+    Returns
+    -------
+    stats: SpacingStats
+        The min, median, mean and max nearest neighbour spacing and the number of
+        points.
 
-    mid = n // 2
-    left_points = points[:mid]
-    right_points = points[mid:]
+    """
+    distances = nearest_neighbour_distances(x, y, geodesic=geodesic)
+    if distances.size <= 1:
+        return SpacingStats(np.inf, np.inf, np.inf, np.inf, distances.size)
+    return SpacingStats(
+        min=float(distances.min()),
+        median=float(np.median(distances)),
+        mean=float(distances.mean()),
+        max=float(distances.max()),
+        count=distances.size,
+    )
 
-    # Divide and conquer
-    left_min = find_minimum_distance(left_points)
-    right_min = find_minimum_distance(right_points)
 
-    min_distance = min(left_min, right_min)
+def find_minimum_distance(points, geodesic: bool = False) -> float:
+    """Find the minimum distance between a set of points.
 
-    # Find the closest pair across the dividing line
-    strip = []
-    for point in points:
-        if abs(point[0] - points[mid][0]) < min_distance:
-            strip.append(point)
+    Parameters
+    ----------
+    points: list[tuple[float, float]] | np.ndarray
+        List of points as (x, y) tuples or array of shape (n, 2), not modified.
+    geodesic: bool
+        Compute great-circle distances in degrees treating x and y as longitudes
+        and latitudes, cartesian distances are computed otherwise.
 
-    strip_min = min_distance
-    strip_len = len(strip)
-    for i in range(strip_len - 1):
-        j = i + 1
-        while j < strip_len and (strip[j][1] - strip[i][1]) < strip_min:
-            distance = calculate_distance(*strip[i], *strip[j])
-            if distance < strip_min:
-                strip_min = distance
-            j += 1
+    Returns
+    -------
+    min_distance: float
+        Minimum distance between all points.
+
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    if len(points) <= 1:
+        return float("inf")
+    distances = nearest_neighbour_distances(points[:, 0], points[:, 1], geodesic)
+    return float(distances.min())
 
-    return min(min_distance, strip_min)
+
+# Parent spacing of station sources keyed by source fingerprint, bbox and geodesic
+SPACING_CACHE = OrderedDict()
+SPACING_CACHE_SIZE = 64
+# Data objects are fetched concurrently so cache updates must hold the lock
+SPACING_LOCK = threading.RLock()
 
 
 class DataBoundary(DataGrid):
@@ -168,9 +220,12 @@ class DataBoundary(DataGrid):
         """
         if self.crop_data and time is not None:
             self._filter_time(time)
+        outfile = Path(destdir) / self.outfile
+        if self._restore(destdir, grid) is not None:
+            return outfile
         ds = self._sel_boundary(grid)
-        outfile = Path(destdir) / f"{self.id}.nc"
-        ds.to_netcdf(outfile)
+        outfile = self.writer.write(ds, outfile)
+        self._store([outfile], grid)
         return outfile
 
     def plot(self, model_grid=None, cmap="turbo", fscale=10, ax=None, **kwargs):
@@ -234,6 +289,20 @@ class BoundaryWaveStation(DataBoundary):
         default=2.0,
         description="Space to buffer the grid bounding box if `filter_grid` is True",
     )
+    time_chunk: Optional[int] = Field(
+        default=None,
+        description=(
+            "Number of times per chunk when applying the interpolation weights to "
+            "the spectra, by default the chunking of the source dataset is used"
+        ),
+    )
+    geodesic: bool = Field(
+        default=False,
+        description=(
+            "Define the parent spacing from great-circle distances in degrees "
+            "instead of cartesian distances in longitude and latitude"
+        ),
+    )
 
     def model_post_init(self, __context):
         self.variables = ["efth", "lon", "lat"]
@@ -253,10 +322,23 @@ class BoundaryWaveStation(DataBoundary):
         dy = np.diff(ybnd).min()
         buffer = 2 * min(dx, dy)
         x0, y0, x1, y1 = grid.bbox(buffer=buffer)
-        ds = self.ds.spec.sel([x0, x1], [y0, y1], method="bbox")
-        # Return the closest distance between adjacent points in cropped dataset
-        points = list(zip(ds.lon.values, ds.lat.values))
-        return find_minimum_distance(points)
+        key = (self.source.fingerprint, (x0, y0, x1, y1), self.geodesic)
+        with SPACING_LOCK:
+            if key in SPACING_CACHE:
+                SPACING_CACHE.move_to_end(key)
+                return SPACING_CACHE[key].min
+        # Closest distance between adjacent points in the cropped dataset
+        lon = self.ds.lon.values
+        lat = self.ds.lat.values
+        inside = (lon >= x0) & (lon <= x1) & (lat >= y0) & (lat <= y1)
+        stats = spacing_stats(lon[inside], lat[inside], geodesic=self.geodesic)
+        logger.debug(f"Spacing between points in {self.source}: {stats}")
+        with SPACING_LOCK:
+            SPACING_CACHE[key] = stats
+            SPACING_CACHE.move_to_end(key)
+            while len(SPACING_CACHE) > SPACING_CACHE_SIZE:
+                SPACING_CACHE.popitem(last=False)
+        return stats.min
 
     def _set_spacing(self, grid) -> float:
         """Define spacing from the parent dataset if required."""
@@ -277,13 +359,16 @@ class BoundaryWaveStation(DataBoundary):
     def _sel_boundary(self, grid) -> xr.Dataset:
         """Select the boundary points from the dataset."""
         xbnd, ybnd = self._boundary_points(grid=grid)
-        ds = self.ds.spec.sel(
-            lons=xbnd,
-            lats=ybnd,
-            method=self.sel_method,
+        ds = self.ds
+        plan = interpolation_plan(
+            self.sel_method,
+            ds.lon.values,
+            ds.lat.values,
+            xbnd,
+            ybnd,
             **self.sel_method_kwargs,
         )
-        return ds
+        return plan.apply(ds, time_chunk=self.time_chunk)
 
     @property
     def ds(self):
@@ -313,6 +398,8 @@ class BoundaryWaveStation(DataBoundary):
             Path to the netcdf file.
 
         """
+        import wavespectra  # noqa: F401 - registers the spec accessor
+
         if self.crop_data:
             if time is not None:
                 self._filter_time(time)
@@ -0,0 +1,208 @@
+"""Persistent cache of the data files staged by data objects."""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+import uuid
+from pathlib import Path
+from typing import Optional
+
+from rompy import CACHE_DIR
+
+
+logger = logging.getLogger(__name__)
+
+
+def cache_key(*parts) -> str:
+    """Content hash of json-serialisable parts defining a cache entry."""
+    text = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def _size(path: Path) -> int:
+    """Size in bytes of a file or directory."""
+    if path.is_dir():
+        return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+    return path.stat().st_size
+
+
+def _link(src: Path, dst: Path):
+    """Hard-link file or directory src to dst, copying if linking fails."""
+    if dst.is_dir() and not dst.is_symlink():
+        shutil.rmtree(dst)
+    elif dst.exists() or dst.is_symlink():
+        dst.unlink()
+    if src.is_dir():
+        try:
+            shutil.copytree(src, dst, copy_function=os.link)
+        except OSError:
+            shutil.rmtree(dst, ignore_errors=True)
+            shutil.copytree(src, dst)
+    else:
+        try:
+            os.link(src, dst)
+        except OSError:
+            shutil.copy2(src, dst)
+
+
+class OutputCache:
+    """Size-bounded, least-recently-used on-disk cache of staged data files.
+
+    Each entry lives in its own directory named after the content key and holds the
+    cached files together with an `entry.json` file with the entry metadata. Entries
+    are restored by hard-linking the cached files into the destination directory, or
+    copying them when the cache is on a different filesystem. Staged files should
+    therefore be treated as read-only.
+
+    Parameters
+    ----------
+    cachedir : str | Path
+        Directory to store the cache entries.
+    maxsize : int
+        Maximum size of the cache in bytes, least recently used entries are evicted
+        when it is exceeded.
+
+    """
+
+    def __init__(self, cachedir: str | Path, maxsize: int):
+        self.cachedir = Path(cachedir)
+        self.maxsize = maxsize
+
+    def _entry(self, key: str) -> Path:
+        return self.cachedir / key
+
+    def get(self, key: str, destdir: str | Path) -> Optional[dict]:
+        """Restore the files of a cache entry.
+
+        Parameters
+        ----------
+        key : str
+            The entry key.
+        destdir : str | Path
+            Directory to restore the cached files to.
+
+        Returns
+        -------
+        meta : dict | None
+            The entry metadata or None if the key is not cached.
+
+        """
+        entry = self._entry(key)
+        index = entry / "entry.json"
+        if not index.is_file():
+            return None
+        meta = json.loads(index.read_text())
+        destdir = Path(destdir)
+        destdir.mkdir(parents=True, exist_ok=True)
+        for name in meta["files"]:
+            _link(entry / name, destdir / name)
+        index.touch()
+        logger.info(f"Restored {meta['files']} from the output cache {entry}")
+        return meta["meta"]
+
+    def put(self, key: str, files: list[str | Path], meta: dict = {}):
+        """Add files to the cache.
+
+        Parameters
+        ----------
+        key : str
+            The entry key.
+        files : list[str | Path]
+            The files or directories to cache.
+        meta : dict
+            Json-serialisable metadata to store with the entry.
+
+        """
+        entry = self._entry(key)
+        if entry.exists():
+            return
+        files = [Path(f) for f in files]
+        tmp = self.cachedir / f".{key}.{uuid.uuid4().hex}"
+        tmp.mkdir(parents=True)
+        try:
+            for filename in files:
+                _link(filename, tmp / filename.name)
+            index = dict(
+                files=[f.name for f in files],
+                meta=meta,
+                size=sum(_size(tmp / f.name) for f in files),
+                created=time.time(),
+            )
+            (tmp / "entry.json").write_text(json.dumps(index, default=str))
+            tmp.rename(entry)
+        except OSError as err:
+            logger.debug(f"Cannot add {key} to the output cache: {err}")
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+        self.prune()
+
+    def entries(self) -> list[dict]:
+        """Cache entries sorted from the least to the most recently used."""
+        entries = []
+        if not self.cachedir.is_dir():
+            return entries
+        for index in self.cachedir.glob("*/entry.json"):
+            try:
+                entry = json.loads(index.read_text())
+            except (OSError, ValueError):
+                continue
+            entry.update(key=index.parent.name, last_used=index.stat().st_mtime)
+            entries.append(entry)
+        return sorted(entries, key=lambda entry: entry["last_used"])
+
+    def size(self) -> int:
+        """Total size of the cache entries in bytes."""
+        return sum(entry["size"] for entry in self.entries())
+
+    def remove(self, key: str):
+        """Remove an entry from the cache."""
+        shutil.rmtree(self._entry(key), ignore_errors=True)
+
+    def prune(self, maxsize: Optional[int] = None, older_than: Optional[float] = None):
+        """Evict least recently used entries.
+
+        Parameters
+        ----------
+        maxsize : int, optional
+            Evict entries until the cache is smaller than maxsize bytes, by default
+            the cache maxsize.
+        older_than : float, optional
+            Also evict entries not used for more than older_than seconds.
+
+        Returns
+        -------
+        removed : list[str]
+            Keys of the evicted entries.
+
+        """
+        maxsize = self.maxsize if maxsize is None else maxsize
+        entries = self.entries()
+        total = sum(entry["size"] for entry in entries)
+        removed = []
+        for entry in entries:
+            expired = older_than is not None and (
+                time.time() - entry["last_used"] > older_than
+            )
+            if total <= maxsize and not expired:
+                continue
+            self.remove(entry["key"])
+            total -= entry["size"]
+            removed.append(entry["key"])
+        if removed:
+            logger.debug(f"Evicted {len(removed)} entries from the output cache")
+        return removed
+
+    def clear(self):
+        """Remove all the entries from the cache."""
+        for entry in self.entries():
+            self.remove(entry["key"])
+
+
+# Process-wide output cache, size limit in bytes defined from ROMPY_OUTPUT_CACHE_SIZE
+OUTPUT_CACHE = OutputCache(
+    cachedir=CACHE_DIR / "outputs",
+    maxsize=int(float(os.environ.get("ROMPY_OUTPUT_CACHE_SIZE", 20e9))),
+)
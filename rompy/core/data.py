@@ -6,16 +6,15 @@ from pathlib import Path
 from shutil import copytree
 from typing import Literal, Optional, Union
 
-import cartopy.crs as ccrs
-import cartopy.feature as cfeature
-import matplotlib.pyplot as plt
 from cloudpathlib import AnyPath
 from pydantic import Field, PrivateAttr
 
+from rompy.core.cache import OUTPUT_CACHE, cache_key
 from rompy.core.filters import Filter
 from rompy.core.grid import BaseGrid, RegularGrid
 from rompy.core.time import TimeRange
 from rompy.core.types import DatasetCoords, RompyBaseModel, Slice
+from rompy.core.writer import DataWriter
 from rompy.utils import load_entry_points
 
 
@@ -152,6 +151,17 @@ class DataPoint(DataBlob):
             "if `filter_time` is True"
         ),
     )
+    writer: DataWriter = Field(
+        default_factory=DataWriter,
+        description="Format, chunking and compression options to write the data",
+    )
+    cache: bool = Field(
+        default=False,
+        description=(
+            "Restore the staged data from the persistent output cache when the "
+            "source, variables, filters and writer options are unchanged"
+        ),
+    )
 
     def _filter_grid(self, grid: GRID_TYPES):
         """No spatial selection is required for timeseries data."""
@@ -181,7 +191,34 @@ class DataPoint(DataBlob):
 
     @property
     def outfile(self) -> str:
-        return f"{self.id}.nc"
+        return f"{self.id}{self.writer.suffix}"
+
+    def _output_cache_key(self, grid: Optional[GRID_TYPES] = None) -> str:
+        """Key of the staged data in the output cache.
+
+        The key is defined after the crop filters have been updated from the grid and
+        time objects so it accounts for the final selection from the source. The key
+        is persisted across runs so the source fingerprint must identify the content,
+        in-memory sources are fingerprinted from a hash of their values.
+
+        """
+        return cache_key(
+            self.__class__.__name__,
+            self.source.fingerprint,
+            self.model_dump(exclude={"source"}),
+            grid.model_dump() if grid is not None else None,
+        )
+
+    def _restore(self, destdir: str | Path, grid: Optional[GRID_TYPES] = None):
+        """Restore the staged data from the output cache, None if not cached."""
+        if not self.cache:
+            return None
+        return OUTPUT_CACHE.get(self._output_cache_key(grid), destdir)
+
+    def _store(self, files: list, grid: Optional[GRID_TYPES] = None, **meta):
+        """Add the staged data to the output cache."""
+        if self.cache:
+            OUTPUT_CACHE.put(self._output_cache_key(grid), files, meta)
 
     def get(
         self,
@@ -194,7 +231,7 @@ class DataPoint(DataBlob):
         Parameters
         ----------
         destdir : str | Path
-            The destination directory to write the netcdf data to.
+            The destination directory to write the data to.
         grid: GRID_TYPES, optional
             The grid to filter the data to, only used if `self.crop_data` is True.
         time: TimeRange, optional
@@ -212,7 +249,10 @@ class DataPoint(DataBlob):
             if time is not None:
                 self._filter_time(time)
         outfile = Path(destdir) / self.outfile
-        self.ds.to_netcdf(outfile)
+        if self._restore(destdir, grid) is not None:
+            return outfile
+        outfile = self.writer.write(self.ds, outfile)
+        self._store([outfile], grid)
         return outfile
 
 
@@ -272,6 +312,9 @@ class DataGrid(DataPoint):
         **kwargs,
     ):
         """Plot the grid."""
+        import cartopy.crs as ccrs
+        import cartopy.feature as cfeature
+        import matplotlib.pyplot as plt
 
         projection = ccrs.PlateCarree()
         transform = ccrs.PlateCarree()
@@ -6,8 +6,13 @@
 # The full license is in the LICENSE file, distributed with this software.
 # -----------------------------------------------------------------------------
 
+import ast
+import operator
+from functools import lru_cache, reduce
 from typing import Optional
 
+import numpy as np
+import pandas as pd
 import xarray as xr
 
 from .types import RompyBaseModel, Slice
@@ -35,12 +40,80 @@ class Filter(RompyBaseModel):
 
     def __call__(self, ds):
         filters = get_filter_fns()
-        for fn in filters:
-            params = getattr(self, fn)
-            if params:
-                ds = filters[fn](ds, **params)
+        for fn, params in self.plan(ds):
+            ds = filters[fn](ds, **params)
         return ds
 
+    @property
+    def _sort_coords(self) -> list:
+        coords = self.sort.get("coords", [])
+        return [coords] if isinstance(coords, str) else coords
+
+    def plan(self, ds) -> list[tuple[str, dict]]:
+        """Plan the filter operations to apply to the dataset.
+
+        Filters are applied in the order defined by `get_filter_fns` except that crops
+        are moved before sorts when the dataset indexes allow it, so sorting only
+        operates on the cropped data. Crop slices on descending indexes that are also
+        sorted are reversed to select the same data the sorted index would.
+
+        Parameters
+        ----------
+        ds: xr.Dataset
+            The dataset to plan the filters for, only its indexes are inspected.
+
+        Returns
+        -------
+        plan: list[tuple[str, dict]]
+            The filter function names and parameters in the order to apply them.
+
+        """
+        steps = [(fn, getattr(self, fn)) for fn in get_filter_fns()]
+        steps = [(fn, params) for fn, params in steps if params]
+        if not (self.sort and self.crop):
+            return steps
+        crop = dict(self.crop)
+        for key, value in self.crop.items():
+            if key not in self._sort_coords or key not in ds.indexes:
+                continue
+            index = ds.indexes[key]
+            if index.is_monotonic_increasing:
+                continue
+            elif index.is_monotonic_decreasing and index.is_unique:
+                crop[key] = Slice(start=value.stop, stop=value.start)
+            else:
+                # Unsorted index, it must be sorted before it can be sliced
+                return steps
+        params = {**dict(steps), "crop": crop}
+        order = ["subset", "crop", "sort", "timenorm", "rename", "derived"]
+        return [(fn, params[fn]) for fn in order if fn in params]
+
+    def crop_windows(self, ds) -> dict:
+        """Index windows of the dimension coordinates selected by the planned crop.
+
+        The windows are defined from the crop slices as they are planned for the
+        dataset, coordinates sorted before they are cropped are not windowed.
+
+        Parameters
+        ----------
+        ds: xr.Dataset
+            The unfiltered dataset, only its indexes are inspected.
+
+        Returns
+        -------
+        indexers: dict
+            Contiguous integer slices to pass to `ds.isel`, see `crop_indexers`.
+
+        """
+        plan = self.plan(ds)
+        steps = [fn for fn, _ in plan]
+        if "crop" not in steps:
+            return {}
+        crop = dict(plan)["crop"]
+        if "sort" in steps and steps.index("sort") < steps.index("crop"):
+            crop = {k: v for k, v in crop.items() if k not in self._sort_coords}
+        return crop_indexers(ds, **crop)
+
     def __repr__(self):
         return self.__str__()
 
@@ -48,6 +121,294 @@ class Filter(RompyBaseModel):
         return f"Filter(sort={self.sort}, subset={self.subset}, crop={self.crop}, timenorm={self.timenorm}, rename={self.rename}, derived={self.derived})"
 
 
+# Operators and functions allowed in derived variable expressions
+_BINOPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+    ast.BitAnd: operator.and_,
+    ast.BitOr: operator.or_,
+}
+_UNARYOPS = {ast.USub: operator.neg, ast.UAdd: operator.pos, ast.Invert: operator.inv}
+_CMPOPS = {
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+}
+_SYMBOLS = {
+    operator.add: "+",
+    operator.sub: "-",
+    operator.mul: "*",
+    operator.truediv: "/",
+    operator.pow: "**",
+    operator.and_: "&",
+    operator.or_: "|",
+    operator.neg: "-",
+    operator.pos: "+",
+    operator.inv: "~",
+    operator.gt: ">",
+    operator.ge: ">=",
+    operator.lt: "<",
+    operator.le: "<=",
+    operator.eq: "==",
+    operator.ne: "!=",
+}
+EXPRESSION_FUNCTIONS = (
+    "abs",
+    "arccos",
+    "arcsin",
+    "arctan",
+    "arctan2",
+    "ceil",
+    "cos",
+    "cosh",
+    "degrees",
+    "exp",
+    "expm1",
+    "floor",
+    "fmax",
+    "fmin",
+    "hypot",
+    "isnan",
+    "log",
+    "log10",
+    "log1p",
+    "maximum",
+    "minimum",
+    "mod",
+    "radians",
+    "sin",
+    "sinh",
+    "sqrt",
+    "tan",
+    "tanh",
+    "where",
+)
+EXPRESSION_CONSTANTS = {"pi": np.pi, "e": np.e, "nan": np.nan}
+# Functions numexpr can evaluate, other functions fall back to numpy
+_NUMEXPR_FUNCTIONS = (
+    "arccos",
+    "arcsin",
+    "arctan",
+    "arctan2",
+    "cos",
+    "cosh",
+    "exp",
+    "expm1",
+    "log",
+    "log10",
+    "log1p",
+    "sin",
+    "sinh",
+    "sqrt",
+    "tan",
+    "tanh",
+    "where",
+)
+
+
+class Expression:
+    """Derived variable expression.
+
+    Expressions are parsed with `ast` and only arithmetic, comparison and bitwise
+    operators, numeric constants, the functions in `EXPRESSION_FUNCTIONS` (optionally
+    prefixed by `np.`) and dataset variables are allowed. Variables can be referenced
+    as `ds.name`, `ds["name"]` or simply `name`. The expression is evaluated as a
+    single kernel applied with `xarray.apply_ufunc`, so it is lazy and fused per chunk
+    on dask-backed datasets, and numexpr is used to evaluate the kernel if available.
+
+    Parameters
+    ----------
+    expr: str
+        The expression, e.g., `"np.sqrt(ds.u10 ** 2 + ds.v10 ** 2)"`.
+
+    """
+
+    def __init__(self, expr: str):
+        self.expr = expr
+        self.variables = []
+        try:
+            tree = ast.parse(expr.strip(), mode="eval")
+        except SyntaxError as err:
+            raise ValueError(f"Invalid expression '{expr}': {err}") from err
+        self._tree = self._compile(tree.body)
+        self._numexpr = self._numexpr_source(self._tree)
+        self._dtypes = {}
+
+    def __repr__(self):
+        return f"Expression({self.expr!r})"
+
+    def _error(self, node):
+        return ValueError(
+            f"{ast.unparse(node)} ({type(node).__name__}) is not allowed in "
+            f"expression '{self.expr}'"
+        )
+
+    def _variable(self, name: str) -> tuple:
+        if name.startswith("__"):
+            raise ValueError(f"Invalid variable name {name} in '{self.expr}'")
+        if name not in self.variables:
+            self.variables.append(name)
+        return ("var", self.variables.index(name))
+
+    def _function(self, node) -> str:
+        if isinstance(node, ast.Name):
+            name = node.id
+        elif isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name):
+            if node.value.id not in ("np", "numpy"):
+                raise self._error(node)
+            name = node.attr
+        else:
+            raise self._error(node)
+        if name not in EXPRESSION_FUNCTIONS:
+            raise self._error(node)
+        return name
+
+    def _compile(self, node) -> tuple:
+        """Compile the ast node into a tree of allowed operations."""
+        if isinstance(node, ast.BinOp) and type(node.op) in _BINOPS:
+            op = _BINOPS[type(node.op)]
+            return ("op", op, self._compile(node.left), self._compile(node.right))
+        elif isinstance(node, ast.UnaryOp) and type(node.op) in _UNARYOPS:
+            return ("op", _UNARYOPS[type(node.op)], self._compile(node.operand))
+        elif isinstance(node, ast.Compare) and len(node.ops) == 1:
+            if type(node.ops[0]) not in _CMPOPS:
+                raise self._error(node)
+            op = _CMPOPS[type(node.ops[0])]
+            left, right = node.left, node.comparators[0]
+            return ("op", op, self._compile(left), self._compile(right))
+        elif isinstance(node, ast.Constant):
+            if not isinstance(node.value, (int, float)):
+                raise self._error(node)
+            return ("const", node.value)
+        elif isinstance(node, ast.Name):
+            if node.id in EXPRESSION_CONSTANTS:
+                return ("const", EXPRESSION_CONSTANTS[node.id])
+            elif node.id in ("ds", "np", "numpy"):
+                raise self._error(node)
+            return self._variable(node.id)
+        elif isinstance(node, ast.Attribute):
+            if not isinstance(node.value, ast.Name) or node.value.id != "ds":
+                raise self._error(node)
+            return self._variable(node.attr)
+        elif isinstance(node, ast.Subscript):
+            key = node.slice
+            if (
+                not isinstance(node.value, ast.Name)
+                or node.value.id != "ds"
+                or not isinstance(key, ast.Constant)
+                or not isinstance(key.value, str)
+            ):
+                raise self._error(node)
+            return self._variable(key.value)
+        elif isinstance(node, ast.Call) and not node.keywords:
+            name = self._function(node.func)
+            return ("call", name, *[self._compile(arg) for arg in node.args])
+        raise self._error(node)
+
+    def _numexpr_source(self, tree: tuple) -> Optional[str]:
+        """Numexpr source for the tree, None if numexpr cannot evaluate it."""
+        kind = tree[0]
+        if kind == "var":
+            return f"v{tree[1]}"
+        elif kind == "const":
+            return repr(tree[1]) if np.isfinite(tree[1]) else None
+        args = [self._numexpr_source(arg) for arg in tree[2:]]
+        if None in args:
+            return None
+        elif kind == "call":
+            if tree[1] not in _NUMEXPR_FUNCTIONS:
+                return None
+            return f"{tree[1]}({', '.join(args)})"
+        elif tree[1] not in _SYMBOLS:
+            return None
+        elif len(args) == 1:
+            return f"({_SYMBOLS[tree[1]]}{args[0]})"
+        return f"({args[0]} {_SYMBOLS[tree[1]]} {args[1]})"
+
+    def _evaluate(self, tree: tuple, arrays: tuple):
+        """Evaluate the tree on numpy arrays."""
+        kind = tree[0]
+        if kind == "var":
+            return arrays[tree[1]]
+        elif kind == "const":
+            return tree[1]
+        args = [self._evaluate(arg, arrays) for arg in tree[2:]]
+        if kind == "call":
+            return getattr(np, tree[1])(*args)
+        return tree[1](*args)
+
+    def result_dtype(self, *dtypes) -> np.dtype:
+        """Dtype of the expression evaluated by numpy on arrays of these dtypes."""
+        if dtypes not in self._dtypes:
+            samples = [np.ones(1, dtype=dtype) for dtype in dtypes]
+            with np.errstate(all="ignore"):
+                sample = self._evaluate(self._tree, samples)
+            self._dtypes[dtypes] = np.asarray(sample).dtype
+        return self._dtypes[dtypes]
+
+    def kernel(self, *arrays):
+        """Evaluate the expression on numpy arrays, one for each of `variables`.
+
+        Numexpr upcasts float32 operands mixed with python scalars to float64, so its
+        result is cast to the dtype numpy would give for the same expression.
+
+        """
+        if self._numexpr is not None:
+            try:
+                import numexpr
+            except ImportError:
+                pass
+            else:
+                local_dict = {f"v{ind}": arr for ind, arr in enumerate(arrays)}
+                result = numexpr.evaluate(self._numexpr, local_dict=local_dict)
+                dtype = self.result_dtype(*[arr.dtype for arr in arrays])
+                return result.astype(dtype, copy=False)
+        return self._evaluate(self._tree, arrays)
+
+    def __call__(self, ds: xr.Dataset) -> xr.DataArray:
+        """Lazily evaluate the expression on the dataset.
+
+        Parameters
+        ----------
+        ds: xr.Dataset
+            Dataset with the variables referenced in the expression.
+
+        Returns
+        -------
+        darr: xr.DataArray
+            The expression result, dask-backed if the dataset variables are.
+
+        """
+        missing = [name for name in self.variables if name not in ds.variables]
+        if missing:
+            raise ValueError(
+                f"Variables {missing} in expression '{self.expr}' not in dataset"
+            )
+        inputs = [ds[name] for name in self.variables]
+        if not inputs:
+            return xr.DataArray(self._evaluate(self._tree, ()))
+        return xr.apply_ufunc(
+            self.kernel,
+            *inputs,
+            dask="parallelized",
+            output_dtypes=[self.result_dtype(*[v.dtype for v in inputs])],
+        )
+
+
+@lru_cache(maxsize=128)
+def compile_expression(expr: str) -> Expression:
+    """Compile and cache the expression."""
+    return Expression(expr)
+
+
 def derived_filter(ds, derived_variables):
     """Add derived variable to Dataset.
 
@@ -57,8 +418,9 @@ def derived_filter(ds, derived_variables):
         Input dataset to add derived variables to.
     derived_variables: dict
         Mapping {`derived_variable_name`: `derived_variable_definition`} where
-        `derived_variable_definition` is a string to be evaluated defining some
-        transformation based on existing variables in the input dataset `ds`.
+        `derived_variable_definition` is a string expression defining some
+        transformation based on existing variables in the input dataset `ds`, see
+        `Expression` for the allowed syntax.
 
     Returns
     -------
@@ -73,15 +435,40 @@ def derived_filter(ds, derived_variables):
 
     """
     for var, expr in derived_variables.items():
-        ds[var] = eval(expr)
+        ds[var] = compile_expression(expr)(ds)
     return ds
 
 
 def sort_filter(ds, coords: list = []):
-    coords = list[coords] if isinstance(coords, str) else coords
+    """Sort dataset by coordinates.
+
+    Monotonic increasing coordinates are left untouched and strictly decreasing ones
+    are reversed with a slice view rather than sorted.
+
+    Parameters
+    ----------
+    ds: xr.Dataset
+        Input dataset to transform.
+    coords: list
+        Coordinates to sort the dataset by.
+
+    Returns
+    -------
+    ds: xr.Dataset
+
+    """
+    coords = [coords] if isinstance(coords, str) else coords
     for c in coords:
-        if c in ds:
-            ds = ds.sortby(c)
+        if c not in ds:
+            continue
+        if ds[c].ndim == 1:
+            index = pd.Index(ds[c].values)
+            if index.is_monotonic_increasing:
+                continue
+            elif index.is_monotonic_decreasing and index.is_unique:
+                ds = ds.isel({ds[c].dims[0]: slice(None, None, -1)})
+                continue
+        ds = ds.sortby(c)
     return ds
 
 
@@ -105,6 +492,39 @@ def subset_filter(ds, data_vars=None) -> xr.Dataset:
     return ds
 
 
+def _where_indexers(ds, conditions: list) -> dict:
+    """Indexers selecting the labels kept by successive `ds.where(cond, drop=True)`.
+
+    Conditions are evaluated on the coordinate arrays only, restricted to the labels
+    kept by the previous conditions, so data variables are never masked at full size.
+    Contiguous selections are returned as slices so they are views of the data.
+
+    """
+    indexers = {dim: np.arange(size) for dim, size in ds.sizes.items()}
+    for name, op, value in conditions:
+        coord = ds[name].variable
+        values = coord.values[np.ix_(*[indexers[dim] for dim in coord.dims])]
+        cond = op(values, value)
+        for axis, dim in enumerate(coord.dims):
+            other = tuple(i for i in range(cond.ndim) if i != axis)
+            keep = cond.any(axis=other) if other else cond
+            indexers[dim] = indexers[dim][keep]
+    out = {}
+    for dim, index in indexers.items():
+        if index.size == ds.sizes[dim]:
+            continue
+        elif index.size and index[-1] - index[0] + 1 == index.size:
+            out[dim] = slice(index[0], index[-1] + 1)
+        else:
+            out[dim] = index
+    return out
+
+
+def _to_slice(value) -> slice:
+    """Slice from a `Slice` object or from a plain slice."""
+    return value if isinstance(value, slice) else value.to_slice()
+
+
 def crop_filter(ds, **data_slice) -> xr.Dataset:
     """
     Crop dataset.
@@ -120,21 +540,75 @@ def crop_filter(ds, **data_slice) -> xr.Dataset:
     -------
     ds: xr.Dataset
 
+    Note
+    ----
+    Crops on coordinates that are not dimensions, e.g., 2D curvilinear coordinates,
+    are equivalent to masking with `ds.where(..., drop=True)` but are performed by
+    selecting the bounding index windows first so only the window is masked.
+
     """
     if data_slice is not None:
         this_crop = {
-            k: data_slice[k].to_slice()
+            k: _to_slice(data_slice[k])
             for k in data_slice.keys()
             if k in ds.sizes.keys()
         }
         ds = ds.sel(this_crop)
+        conditions = []
         for k in data_slice.keys():
             if (k not in ds.sizes.keys()) and (k in ds.coords.keys()):
-                ds = ds.where(ds[k] > float(data_slice[k].start), drop=True)
-                ds = ds.where(ds[k] < float(data_slice[k].stop), drop=True)
+                conditions.append((k, operator.gt, float(data_slice[k].start)))
+                conditions.append((k, operator.lt, float(data_slice[k].stop)))
+        if conditions:
+            ds = ds.isel(_where_indexers(ds, conditions))
+            mask = reduce(
+                operator.and_, [op(ds[k], value) for k, op, value in conditions]
+            )
+            ds = ds.where(mask)
     return ds
 
 
+def crop_indexers(ds, **data_slice) -> dict:
+    """Index windows of the dimension coordinates selected by the crop.
+
+    parameters
+    ----------
+    ds: xr.Dataset
+        Input dataset, only the indexes of the dimension coordinates are used.
+    data_slice: Iterable
+        Data slice to crop
+
+    Returns
+    -------
+    indexers: dict
+        Contiguous integer slices to pass to `ds.isel`, only defined for monotonic
+        dimension coordinates in the crop.
+
+    Note
+    ----
+    The windows select the same labels as the `sel` call in `crop_filter`, including
+    empty windows when the slice bounds are reversed relative to the index, so
+    cropping the windowed dataset is identical to cropping the full dataset.
+
+    """
+    indexers = {}
+    for k, data in data_slice.items():
+        if k not in ds.dims or k not in ds.indexes:
+            continue
+        index = ds.indexes[k]
+        if not (index.is_monotonic_increasing or index.is_monotonic_decreasing):
+            continue
+        try:
+            window = index.slice_indexer(data.start, data.stop)
+        except (KeyError, TypeError, ValueError):
+            continue
+        i0, i1, _ = window.indices(index.size)
+        i1 = max(i0, i1)
+        if i1 - i0 < index.size:
+            indexers[k] = slice(i0, i1)
+    return indexers
+
+
 def timenorm_filter(ds, interval="hour", reftime=None) -> xr.Dataset:
     """Normalize time to lead time in hours
 
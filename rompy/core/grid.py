@@ -1,18 +1,48 @@
 import logging
 from typing import Any, Literal, Optional, Union
 
-import cartopy.crs as ccrs
-import cartopy.feature as cfeature
-import matplotlib.pyplot as plt
 import numpy as np
-from pydantic import Field, model_validator
-from shapely.geometry import MultiPoint, Polygon
+from pydantic import Field, PrivateAttr, model_validator
+import shapely
+from scipy.spatial import cKDTree
+from shapely.geometry import MultiPoint, Polygon, box
 
 from rompy.core.types import Bbox, RompyBaseModel
 
 logger = logging.getLogger(__name__)
 
 
+def interpolate_line(x, y, distances) -> tuple:
+    """Coordinates of points at distances along a line.
+
+    Vectorised equivalent of calling `shapely.LineString.interpolate` for each
+    distance, the line is parameterised by the cumulative length of its segments and
+    the coordinates are linearly interpolated at all distances at once.
+
+    Parameters
+    ----------
+    x: array-like
+        The x coordinates of the line vertices.
+    y: array-like
+        The y coordinates of the line vertices.
+    distances: array-like
+        Distances along the line, clipped to the line length.
+
+    Returns
+    -------
+    xi: np.ndarray
+        The x coordinates of the interpolated points.
+    yi: np.ndarray
+        The y coordinates of the interpolated points.
+
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    length = np.concatenate([[0.0], np.cumsum(np.hypot(np.diff(x), np.diff(y)))])
+    distances = np.clip(np.asarray(distances, dtype=float), 0.0, length[-1])
+    return np.interp(distances, length, x), np.interp(distances, length, y)
+
+
 class BaseGrid(RompyBaseModel):
     """Representation of a grid in geographic space.
 
@@ -24,6 +54,7 @@ class BaseGrid(RompyBaseModel):
     """
 
     grid_type: Literal["base"] = "base"
+    _kdtree: Optional[tuple] = PrivateAttr(default=None)
 
     @property
     def x(self) -> np.ndarray:
@@ -113,11 +144,95 @@ class BaseGrid(RompyBaseModel):
             if perimeter < spacing:
                 raise ValueError(f"Spacing = {spacing} > grid perimeter = {perimeter}")
             npts = int(np.ceil(perimeter / spacing))
-            points = [polygon.boundary.interpolate(i * spacing) for i in range(npts)]
-            xpts = [point.x for point in points]
-            ypts = [point.y for point in points]
+            xring, yring = polygon.exterior.coords.xy
+            xpts, ypts = interpolate_line(xring, yring, np.arange(npts) * spacing)
         return np.array(xpts), np.array(ypts)
 
+    @property
+    def _geometry_key(self):
+        """Key identifying the grid geometry, the spatial index is rebuilt on change."""
+        return repr(self.model_dump())
+
+    @property
+    def kdtree(self) -> cKDTree:
+        """KD-tree of the grid nodes, built on first use and cached with the grid."""
+        key = self._geometry_key
+        if self._kdtree is None or self._kdtree[0] != key:
+            xy = np.column_stack([np.ravel(self.x), np.ravel(self.y)])
+            valid = np.flatnonzero(np.isfinite(xy).all(axis=1))
+            self._kdtree = (key, cKDTree(xy[valid]), valid)
+        return self._kdtree[1]
+
+    def nearest(self, x, y) -> tuple:
+        """Nearest grid nodes to points.
+
+        Parameters
+        ----------
+        x: array-like
+            The x coordinates of the points.
+        y: array-like
+            The y coordinates of the points.
+
+        Returns
+        -------
+        distance: np.ndarray
+            Distance from each point to the nearest grid node.
+        index: tuple
+            Index arrays of the nearest grid nodes in the grid coordinate arrays.
+
+        """
+        xy = np.column_stack([np.ravel(x), np.ravel(y)])
+        distance, inode = self.kdtree.query(xy)
+        valid = self._kdtree[2]
+        index = np.unravel_index(valid[inode], np.shape(self.x))
+        return distance, index
+
+    def contains_points(self, x, y, tolerance=0.0) -> np.ndarray:
+        """Whether points are inside the grid domain.
+
+        Parameters
+        ----------
+        x: array-like
+            The x coordinates of the points.
+        y: array-like
+            The y coordinates of the points.
+        tolerance: float
+            Distance outside the grid domain within which points are still inside.
+
+        Returns
+        -------
+        inside: np.ndarray
+            Boolean array, True for the points inside the grid domain.
+
+        Note
+        ----
+        The grid domain is defined by the `boundary` polygon, points on the boundary
+        are considered inside.
+
+        """
+        polygon = self.boundary()
+        if tolerance:
+            polygon = polygon.buffer(tolerance)
+        return shapely.intersects_xy(polygon, np.asarray(x), np.asarray(y))
+
+    def covers(self, geometry, tolerance=0.0) -> bool:
+        """Whether a bbox or geometry is fully inside the grid domain.
+
+        Parameters
+        ----------
+        geometry: list | shapely.Geometry
+            Bounding box [x0, y0, x1, y1] or shapely geometry to test.
+        tolerance: float
+            Distance outside the grid domain within which geometries are still inside.
+
+        """
+        if not isinstance(geometry, shapely.Geometry):
+            geometry = box(*geometry)
+        polygon = self.boundary()
+        if tolerance:
+            polygon = polygon.buffer(tolerance)
+        return polygon.covers(geometry)
+
     def _figsize(self, x0, x1, y0, y1, fscale):
         xlen = abs(x1 - x0)
         ylen = abs(y1 - y0)
@@ -138,6 +253,9 @@ class BaseGrid(RompyBaseModel):
         coastline=True,
     ):
         """Plot the grid"""
+        import cartopy.crs as ccrs
+        import cartopy.feature as cfeature
+        import matplotlib.pyplot as plt
 
         projection = ccrs.PlateCarree()
         transform = ccrs.PlateCarree()
@@ -217,6 +335,14 @@ class RegularGrid(BaseGrid):
     ny: Optional[int] = Field(
         default=None, description="Number of grid points in the y direction"
     )
+    lazy: bool = Field(
+        default=False,
+        description=(
+            "Define the x and y coordinates as dask arrays evaluated blockwise on "
+            "demand so the full mesh is never held in memory"
+        ),
+    )
+    _coords: Optional[tuple] = PrivateAttr(default=None)
 
     @model_validator(mode="after")
     def generate(self) -> "RegularGrid":
@@ -227,15 +353,112 @@ class RegularGrid(BaseGrid):
         # Ensure x, y 2D coordinates are defined
         return self
 
+    @property
+    def _coords_key(self) -> tuple:
+        """Parameters defining the coordinates, the cache is invalidated on change."""
+        return (self.x0, self.y0, self.rot, self.dx, self.dy, self.nx, self.ny)
+
+    def _cached_coords(self) -> tuple:
+        """The x and y coordinates, only generated when the grid parameters change.
+
+        The cached arrays are read-only, the public `x` and `y` properties return
+        copies so callers can modify them in place.
+
+        """
+        key = (self._coords_key, self.lazy)
+        if self._coords is None or self._coords[0] != key:
+            if self.lazy:
+                x, y = self._gen_reg_cgrid_lazy()
+            else:
+                x, y = self._gen_reg_cgrid()
+                x.flags.writeable = False
+                y.flags.writeable = False
+            self._coords = (key, x, y)
+        return self._coords[1:]
+
     @property
     def x(self) -> np.ndarray:
-        x, y = self._gen_reg_cgrid()
-        return x
+        """The x coordinates, a copy of the cached array unless the grid is lazy."""
+        x, y = self._cached_coords()
+        return x if self.lazy else x.copy()
 
     @property
     def y(self) -> np.ndarray:
-        x, y = self._gen_reg_cgrid()
-        return y
+        """The y coordinates, a copy of the cached array unless the grid is lazy."""
+        x, y = self._cached_coords()
+        return y if self.lazy else y.copy()
+
+    @property
+    def corners(self) -> tuple:
+        """Coordinates of the four corners of the grid.
+
+        The corners are ordered counter-clockwise in grid space from the origin and
+        computed analytically without generating the grid coordinates.
+
+        """
+        i = np.array([0.0, self.xlen, self.xlen, 0.0])
+        j = np.array([0.0, 0.0, self.ylen, self.ylen])
+        return self._rotate(i, j)
+
+    @property
+    def minx(self) -> float:
+        return np.min(self.corners[0])
+
+    @property
+    def maxx(self) -> float:
+        return np.max(self.corners[0])
+
+    @property
+    def miny(self) -> float:
+        return np.min(self.corners[1])
+
+    @property
+    def maxy(self) -> float:
+        return np.max(self.corners[1])
+
+    def _get_convex_hull(self, tolerance=0.2) -> Polygon:
+        """The convex hull of a rotated regular grid is defined by its corners."""
+        polygon = MultiPoint(list(zip(*self.corners))).convex_hull
+        polygon = polygon.simplify(tolerance=tolerance)
+        return polygon
+
+    @property
+    def _geometry_key(self) -> tuple:
+        return self._coords_key
+
+    def contains_points(self, x, y, tolerance=0.0) -> np.ndarray:
+        """Whether points are inside the grid domain.
+
+        Points are rotated into grid space and compared with the grid extents, so
+        the test is exact and does not require the grid coordinates.
+
+        """
+        alpha = -self.rot * np.pi / 180.0
+        R = np.array([[np.cos(alpha), -np.sin(alpha)], [np.sin(alpha), np.cos(alpha)]])
+        gx = np.asarray(x, dtype=float) - self.x0
+        gy = np.asarray(y, dtype=float) - self.y0
+        i = gx * R[0, 0] + gy * R[0, 1]
+        j = gx * R[1, 0] + gy * R[1, 1]
+        # Allow for round-off errors in points on the grid edges
+        tolerance += 1e-9 * max(self.xlen, self.ylen)
+        return (
+            (i >= -tolerance)
+            & (i <= self.xlen + tolerance)
+            & (j >= -tolerance)
+            & (j <= self.ylen + tolerance)
+        )
+
+    def covers(self, geometry, tolerance=0.0) -> bool:
+        """Whether a bbox or geometry is fully inside the grid domain.
+
+        The domain of a regular grid is convex so the geometry is inside if all its
+        vertices are.
+
+        """
+        if not isinstance(geometry, shapely.Geometry):
+            geometry = box(*geometry)
+        x, y = shapely.get_coordinates(geometry).T
+        return bool(self.contains_points(x, y, tolerance=tolerance).all())
 
     def _attrs_from_xy(self):
         """Generate regular grid attributes from x, y coordinates."""
@@ -256,23 +479,34 @@ class RegularGrid(BaseGrid):
     def ylen(self):
         return self.dy * (self.ny - 1)
 
+    def _rotate(self, i: np.ndarray, j: np.ndarray) -> tuple:
+        """Rotate and translate grid space coordinates into geographic space."""
+        alpha = -self.rot * np.pi / 180.0
+        R = np.array([[np.cos(alpha), -np.sin(alpha)], [np.sin(alpha), np.cos(alpha)]])
+        gg = np.dot(np.vstack([i.ravel(), j.ravel()]).T, R)
+        x = np.reshape(gg[:, 0] + self.x0, i.shape)
+        y = np.reshape(gg[:, 1] + self.y0, i.shape)
+        return x, y
+
     def _gen_reg_cgrid(self):
         # Grid at origin
         i = np.arange(0.0, self.dx * self.nx, self.dx)
         j = np.arange(0.0, self.dy * self.ny, self.dy)
         ii, jj = np.meshgrid(i, j)
 
-        # Rotation
-        alpha = -self.rot * np.pi / 180.0
-        R = np.array([[np.cos(alpha), -np.sin(alpha)], [np.sin(alpha), np.cos(alpha)]])
-        gg = np.dot(np.vstack([ii.ravel(), jj.ravel()]).T, R)
+        # Rotation and translation
+        return self._rotate(ii, jj)
 
-        # Translation
-        x = gg[:, 0] + self.x0
-        y = gg[:, 1] + self.y0
+    def _gen_reg_cgrid_lazy(self):
+        """Grid coordinates as dask arrays broadcast from the 1D grid axes."""
+        import dask.array as da
 
-        x = np.reshape(x, ii.shape)
-        y = np.reshape(y, ii.shape)
+        i = da.from_array(np.arange(0.0, self.dx * self.nx, self.dx), chunks="auto")
+        j = da.from_array(np.arange(0.0, self.dy * self.ny, self.dy), chunks="auto")
+        alpha = -self.rot * np.pi / 180.0
+        ii, jj = i[np.newaxis, :], j[:, np.newaxis]
+        x = ii * np.cos(alpha) + jj * np.sin(alpha) + self.x0
+        y = -ii * np.sin(alpha) + jj * np.cos(alpha) + self.y0
         return x, y
 
     def __eq__(self, other) -> bool:
@@ -0,0 +1,440 @@
+"""Sparse interpolation plans to select sites from spectral station datasets."""
+
+import hashlib
+import logging
+import os
+from pathlib import Path
+from typing import Literal, Optional
+
+import numpy as np
+import xarray as xr
+from scipy import sparse
+from scipy.spatial import cKDTree
+
+from rompy import CACHE_DIR
+from rompy.core.cache import cache_key
+
+
+logger = logging.getLogger(__name__)
+
+
+# Persisted interpolation plans, keyed on the method, parameters and coordinates
+PLAN_DIR = CACHE_DIR / "interp"
+
+
+def _array_hash(*arrays) -> str:
+    """Hash of the values and shapes of numeric arrays."""
+    sha = hashlib.sha1()
+    for array in arrays:
+        array = np.ascontiguousarray(array, dtype="float64")
+        sha.update(str(array.shape).encode("utf-8"))
+        sha.update(array.tobytes())
+    return sha.hexdigest()
+
+
+def _points(lons: np.ndarray, lats: np.ndarray) -> np.ndarray:
+    """Points where euclidean distances match the wavespectra site selection."""
+    return np.column_stack([np.asarray(lons) % 360, np.asarray(lats)]).astype(float)
+
+
+def _is_360(lons: np.ndarray) -> bool:
+    return lons.min() >= 0 and lons.max() <= 360
+
+
+def _swap_convention(lons: np.ndarray) -> np.ndarray:
+    """Swap longitudes between the [0, 360] and [-180, 180] conventions."""
+    lons = np.array(lons, dtype=float)
+    if lons.min() < 0 and lons.max() <= 180:
+        return lons % 360
+    if _is_360(lons):
+        lons[lons > 180] -= 360
+    return lons
+
+
+class InterpolationPlan:
+    """Sparse weights selecting or interpolating sites of a spectral station dataset.
+
+    The weights of the output sites (rows) from the dataset sites (columns) are
+    computed once with a KD-tree search and can be persisted and reapplied to any
+    dataset with the same sites, e.g., subsequent forecast cycles of the same source
+    on the same model grid. Weights are applied as a sparse matrix product over the
+    site dimension which is chunked along time with dask if required so memory is
+    bounded by the chunk size.
+
+    Parameters
+    ----------
+    weights : sparse.csr_matrix
+        Weights of shape (noutput, nsite).
+    lons : np.ndarray
+        Longitudes of the output sites.
+    lats : np.ndarray
+        Latitudes of the output sites.
+    mask : np.ndarray, optional
+        Output sites without enough neighbours, set to nan.
+    method : Literal["idw", "nearest"]
+        The selection method, `nearest` plans are applied by indexing the sites.
+
+    Note
+    ----
+    The plans reproduce the `idw` and `nearest` station selection methods in
+    wavespectra, with distances calculated in degrees from longitudes modulo 360.
+
+    """
+
+    def __init__(
+        self,
+        weights: sparse.csr_matrix,
+        lons: np.ndarray,
+        lats: np.ndarray,
+        mask: Optional[np.ndarray] = None,
+        method: Literal["idw", "nearest"] = "idw",
+    ):
+        self.weights = sparse.csr_matrix(weights)
+        self.lons = np.asarray(lons)
+        self.lats = np.asarray(lats)
+        if mask is None:
+            mask = np.zeros(self.weights.shape[0], dtype=bool)
+        self.mask = np.asarray(mask, dtype=bool)
+        self.method = method
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(method={self.method}, sites={self.nsite}, "
+            f"size={self.size}, masked={self.mask.sum()})"
+        )
+
+    @property
+    def size(self) -> int:
+        """Number of output sites."""
+        return self.weights.shape[0]
+
+    @property
+    def nsite(self) -> int:
+        """Number of sites in the source dataset."""
+        return self.weights.shape[1]
+
+    @classmethod
+    def idw(
+        cls,
+        site_lons: np.ndarray,
+        site_lats: np.ndarray,
+        lons: np.ndarray,
+        lats: np.ndarray,
+        tolerance: float = 2.0,
+        max_sites: Optional[int] = 4,
+    ) -> "InterpolationPlan":
+        """Inverse distance weighting plan.
+
+        Parameters
+        ----------
+        site_lons : np.ndarray
+            Longitudes of the sites in the dataset.
+        site_lats : np.ndarray
+            Latitudes of the sites in the dataset.
+        lons : np.ndarray
+            Longitudes of the sites to interpolate at.
+        lats : np.ndarray
+            Latitudes of the sites to interpolate at.
+        tolerance : float
+            Maximum distance to use a site for interpolation.
+        max_sites : int, optional
+            Maximum number of neighbour sites to use for interpolation.
+
+        Returns
+        -------
+        plan : InterpolationPlan
+            Plan with output sites at (lons, lats), masked where there are less than
+            two neighbours within tolerance unless they match a site exactly.
+
+        """
+        site_lons, site_lats = np.asarray(site_lons), np.asarray(site_lats)
+        lons, lats = np.atleast_1d(lons), np.atleast_1d(lats)
+        nsite = site_lons.size
+        k = nsite if max_sites is None else min(max_sites, nsite)
+        tree = cKDTree(_points(site_lons, site_lats))
+        dist, ind = tree.query(
+            _points(lons, lats),
+            k=[i + 1 for i in range(k)],
+            distance_upper_bound=np.nextafter(tolerance, np.inf),
+        )
+        valid = dist <= tolerance
+        exact = valid[:, 0] & (dist[:, 0] == 0)
+        count = valid.sum(axis=1)
+        mask = (count == 0) | ((count == 1) & ~exact)
+        with np.errstate(divide="ignore"):
+            factors = np.where(valid, 1.0 / dist, 0.0)
+        factors[exact] = 0.0
+        factors[exact, 0] = 1.0
+        factors[mask] = 0.0
+        total = factors.sum(axis=1, keepdims=True)
+        factors = np.divide(factors, total, out=factors, where=total > 0)
+        keep = factors > 0
+        rows = np.broadcast_to(np.arange(lons.size)[:, None], keep.shape)[keep]
+        weights = sparse.csr_matrix(
+            (factors[keep], (rows, ind[keep])), shape=(lons.size, nsite)
+        )
+        if mask.any():
+            logger.debug(f"{mask.sum()} sites without neighbours within {tolerance}")
+        return cls(weights, lons=lons, lats=lats, mask=mask, method="idw")
+
+    @classmethod
+    def nearest(
+        cls,
+        site_lons: np.ndarray,
+        site_lats: np.ndarray,
+        lons: np.ndarray,
+        lats: np.ndarray,
+        tolerance: float = 2.0,
+        unique: bool = False,
+        exact: bool = False,
+        missing: Literal["raise", "ignore"] = "raise",
+    ) -> "InterpolationPlan":
+        """Nearest site plan.
+
+        Parameters
+        ----------
+        site_lons : np.ndarray
+            Longitudes of the sites in the dataset.
+        site_lats : np.ndarray
+            Latitudes of the sites in the dataset.
+        lons : np.ndarray
+            Longitudes of the sites to select.
+        lats : np.ndarray
+            Latitudes of the sites to select.
+        tolerance : float
+            Maximum distance to select a site.
+        unique : bool
+            Only select unique sites in case of repeated inexact matches.
+        exact : bool
+            Require exact matches.
+        missing : Literal["raise", "ignore"]
+            Raise an error or skip sites with no neighbour within tolerance.
+
+        Returns
+        -------
+        plan : InterpolationPlan
+            Plan with output sites at the selected dataset sites.
+
+        """
+        site_lons, site_lats = np.asarray(site_lons), np.asarray(site_lats)
+        lons, lats = np.atleast_1d(lons), np.atleast_1d(lats)
+        tree = cKDTree(_points(site_lons, site_lats))
+        dist, ind = tree.query(_points(lons, lats), k=1)
+        far = dist > tolerance
+        if far.any() and missing == "raise":
+            i = np.flatnonzero(far)[0]
+            raise ValueError(
+                f"Nearest site in dataset from ({lons[i]}, {lats[i]}) is "
+                f"{dist[i]:g} deg away but tolerance is {tolerance:g} deg"
+            )
+        if exact and (dist[~far] > 0).any():
+            i = np.flatnonzero(~far & (dist > 0))[0]
+            raise ValueError(
+                f"Exact match required but no site in dataset at ({lons[i]}, "
+                f"{lats[i]}), nearest site is {dist[i]} deg away"
+            )
+        ids = ind[~far]
+        if unique:
+            ids = ids[np.sort(np.unique(ids, return_index=True)[1])]
+        if ids.size == 0:
+            raise ValueError(
+                f"No site in dataset found within tolerance={tolerance} deg of any "
+                f"site {list(zip(lons, lats))}"
+            )
+        weights = sparse.csr_matrix(
+            (np.ones(ids.size), (np.arange(ids.size), ids)),
+            shape=(ids.size, site_lons.size),
+        )
+        # Return longitudes in the convention provided
+        outlons = site_lons[ids]
+        if _is_360(site_lons) != _is_360(lons):
+            outlons = _swap_convention(outlons)
+        return cls(weights, lons=outlons, lats=site_lats[ids], method="nearest")
+
+    def _matmul(self, data: np.ndarray) -> np.ndarray:
+        """Apply the weights to the last axis of data."""
+        flat = data.reshape(-1, data.shape[-1])
+        out = np.asarray(self.weights.dot(flat.T).T)
+        out = out.astype(np.result_type(data.dtype, np.float32), copy=False)
+        out[:, self.mask] = np.nan
+        return out.reshape(data.shape[:-1] + (self.size,))
+
+    def _interp(
+        self,
+        darr: xr.DataArray,
+        sitename: str,
+        time_chunk: Optional[int],
+        timename: str,
+    ) -> xr.DataArray:
+        """Interpolate a data array with the sparse weights."""
+        if time_chunk is not None and timename in darr.dims:
+            darr = darr.chunk({timename: time_chunk})
+        if darr.chunks is not None:
+            darr = darr.chunk({sitename: -1})
+        darrout = xr.apply_ufunc(
+            self._matmul,
+            darr,
+            input_core_dims=[[sitename]],
+            output_core_dims=[[sitename]],
+            exclude_dims={sitename},
+            dask="parallelized",
+            output_dtypes=[np.result_type(darr.dtype, np.float32)],
+            dask_gufunc_kwargs={"output_sizes": {sitename: self.size}},
+            keep_attrs=True,
+        )
+        return darrout.transpose(*darr.dims)
+
+    def apply(
+        self,
+        dset: xr.Dataset,
+        sitename: str = "site",
+        lonname: str = "lon",
+        latname: str = "lat",
+        timename: str = "time",
+        time_chunk: Optional[int] = None,
+    ) -> xr.Dataset:
+        """Apply the plan to a station dataset.
+
+        Parameters
+        ----------
+        dset : xr.Dataset
+            Station dataset with the sites the plan was created for.
+        sitename : str
+            Name of the site dimension.
+        lonname : str
+            Name of the longitude variable.
+        latname : str
+            Name of the latitude variable.
+        timename : str
+            Name of the time dimension.
+        time_chunk : int, optional
+            Chunk the site variables along time with this size before interpolating,
+            by default the dataset chunking is used.
+
+        Returns
+        -------
+        dsout : xr.Dataset
+            Dataset at the output sites, lazy if the dataset is chunked.
+
+        """
+        if dset.sizes[sitename] != self.nsite:
+            raise ValueError(
+                f"Plan is defined for {self.nsite} sites but dataset has "
+                f"{dset.sizes[sitename]}"
+            )
+        if self.method == "nearest":
+            dsout = dset.isel({sitename: self.weights.indices})
+            for name, values in ((lonname, self.lons), (latname, self.lats)):
+                dsout[name] = dsout[name].copy(data=values.astype(dsout[name].dtype))
+            return dsout.assign_coords({sitename: np.arange(self.size)})
+
+        from wavespectra.core.attributes import set_spec_attributes
+
+        dsout = xr.Dataset(attrs=dset.attrs)
+        for name, darr in dset.data_vars.items():
+            if name in (lonname, latname):
+                continue
+            if sitename not in darr.dims:
+                dsout[name] = darr
+            elif darr.dtype.kind in "iuf":
+                dsout[name] = self._interp(darr, sitename, time_chunk, timename)
+            else:
+                logger.debug(f"Not interpolating non-numeric variable {name}")
+        dsout[sitename] = np.arange(self.size)
+        dsout[lonname] = ((sitename,), self.lons)
+        dsout[latname] = ((sitename,), self.lats)
+        set_spec_attributes(dsout)
+        return dsout
+
+    def save(self, filename: str | Path):
+        """Save the plan to a numpy npz file."""
+        filename = Path(filename)
+        filename.parent.mkdir(parents=True, exist_ok=True)
+        tmp = filename.with_name(f".{filename.stem}.{os.getpid()}.npz")
+        np.savez(
+            tmp,
+            data=self.weights.data,
+            indices=self.weights.indices,
+            indptr=self.weights.indptr,
+            shape=self.weights.shape,
+            lons=self.lons,
+            lats=self.lats,
+            mask=self.mask,
+            method=self.method,
+        )
+        tmp.replace(filename)
+
+    @classmethod
+    def load(cls, filename: str | Path) -> "InterpolationPlan":
+        """Load a plan saved with `save`."""
+        with np.load(filename) as data:
+            weights = sparse.csr_matrix(
+                (data["data"], data["indices"], data["indptr"]),
+                shape=tuple(data["shape"]),
+            )
+            return cls(
+                weights,
+                lons=data["lons"],
+                lats=data["lats"],
+                mask=data["mask"],
+                method=str(data["method"]),
+            )
+
+
+def interpolation_plan(
+    method: Literal["idw", "nearest"],
+    site_lons: np.ndarray,
+    site_lats: np.ndarray,
+    lons: np.ndarray,
+    lats: np.ndarray,
+    persist: bool = True,
+    **kwargs,
+) -> InterpolationPlan:
+    """Load the interpolation plan from `PLAN_DIR` or create and persist it.
+
+    Parameters
+    ----------
+    method : Literal["idw", "nearest"]
+        The selection method.
+    site_lons : np.ndarray
+        Longitudes of the sites in the dataset.
+    site_lats : np.ndarray
+        Latitudes of the sites in the dataset.
+    lons : np.ndarray
+        Longitudes of the sites to select.
+    lats : np.ndarray
+        Latitudes of the sites to select.
+    persist : bool
+        Load and save the plan from and to `PLAN_DIR`.
+    kwargs :
+        Keyword arguments for the method, see `InterpolationPlan.idw` and
+        `InterpolationPlan.nearest`.
+
+    Returns
+    -------
+    plan : InterpolationPlan
+        The interpolation plan.
+
+    """
+    if method not in ("idw", "nearest"):
+        raise ValueError(f"Unsupported interpolation method {method}")
+    key = cache_key(
+        method, kwargs, _array_hash(site_lons, site_lats), _array_hash(lons, lats)
+    )
+    filename = PLAN_DIR / f"{key}.npz"
+    if persist and filename.is_file():
+        try:
+            plan = InterpolationPlan.load(filename)
+            logger.debug(f"Loaded {plan} from {filename}")
+            return plan
+        except (OSError, ValueError, KeyError) as err:
+            logger.debug(f"Cannot load interpolation plan {filename}: {err}")
+    plan = getattr(InterpolationPlan, method)(
+        site_lons, site_lats, lons, lats, **kwargs
+    )
+    if persist:
+        try:
+            plan.save(filename)
+        except OSError as err:
+            logger.debug(f"Cannot save interpolation plan {filename}: {err}")
+    return plan
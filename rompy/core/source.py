@@ -1,28 +1,330 @@
 """Rompy source objects."""
 
+import hashlib
+import json
 import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict, namedtuple
 from functools import cached_property
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Literal, Optional
+from typing import TYPE_CHECKING, Literal, Optional
 
 import fsspec
-import intake
+import numpy as np
 import pandas as pd
 import xarray as xr
-import wavespectra
-from intake.catalog import Catalog
-from intake.catalog.local import YAMLFileCatalog
-from oceanum.datamesh import Connector
-from pydantic import ConfigDict, Field, model_validator, field_validator
+from pydantic import ConfigDict, Field, PrivateAttr, model_validator, field_validator
 
+from rompy import CACHE_DIR
 from rompy.core.filters import Filter
 from rompy.core.types import DatasetCoords, RompyBaseModel
 
+if TYPE_CHECKING:
+    # Imported on first use, these packages are slow to import
+    from intake.catalog import Catalog
+    from oceanum.datamesh import Connector
+
 
 logger = logging.getLogger(__name__)
 
 
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+def _hash(obj) -> str:
+    """Canonical sha1 hash of a json-serialisable object."""
+    text = json.dumps(obj, sort_keys=True, default=str)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def filter_hash(filters: Filter | dict) -> str:
+    """Canonical hash of a filter specification.
+
+    Parameters
+    ----------
+    filters : Filter | dict
+        The filter object, or a dictionary with the filter definition.
+
+    Returns
+    -------
+    hash : str
+        Hash that only changes when the filter definition changes.
+
+    """
+    if not filters:
+        return ""
+    if isinstance(filters, Filter):
+        filters = filters.model_dump()
+    return _hash(filters)
+
+
+class DatasetCache:
+    """Least-recently-used cache of opened and filtered source datasets.
+
+    Datasets are keyed on the source fingerprint, the requested variables and the
+    canonical hash of the filter so repeated calls to `SourceBase.open` with the same
+    arguments within a model run do not reopen and refilter the source. Shallow copies
+    are returned so callers can reassign variables without affecting the cache.
+
+    Parameters
+    ----------
+    maxsize : int
+        Maximum number of datasets to keep in the cache, 0 disables caching.
+
+    """
+
+    def __init__(self, maxsize: int = 8):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: tuple) -> bool:
+        return key in self._data
+
+    def get(self, key: tuple) -> Optional[xr.Dataset]:
+        """Return the cached dataset for key or None if not cached."""
+        with self._lock:
+            if key not in self._data:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._data.move_to_end(key)
+            return self._data[key].copy(deep=False)
+
+    def put(self, key: tuple, ds: xr.Dataset):
+        """Cache dataset under key, evicting the least recently used if full."""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = ds.copy(deep=False)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                evicted, _ = self._data.popitem(last=False)
+                logger.debug(f"Evicting {evicted} from the dataset cache")
+
+    def invalidate(self, source: Optional["SourceBase"] = None):
+        """Remove cached datasets.
+
+        Parameters
+        ----------
+        source : SourceBase, optional
+            Only remove the entries opened from this source, by default all entries
+            are removed.
+
+        """
+        with self._lock:
+            if source is None:
+                self._data.clear()
+                return
+            fingerprint = source.fingerprint
+            for key in [key for key in self._data if key[0] == fingerprint]:
+                del self._data[key]
+
+    def clear(self):
+        """Remove all cached datasets and reset the counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> CacheInfo:
+        """Return the cache statistics."""
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
+
+# Process-wide cache of opened datasets, set ROMPY_SOURCE_CACHE_SIZE=0 to disable
+DATASET_CACHE = DatasetCache(maxsize=int(os.environ.get("ROMPY_SOURCE_CACHE_SIZE", 8)))
+
+# Keyword arguments of xarray.open_mfdataset not accepted by xarray.open_dataset
+MFDATASET_KWARGS = {
+    "attrs_file",
+    "combine",
+    "combine_attrs",
+    "compat",
+    "concat_dim",
+    "coords",
+    "data_vars",
+    "join",
+    "parallel",
+    "preprocess",
+}
+
+# Sidecar cache of source metadata, entries older than the ttl (seconds) are refreshed
+METADATA_DIR = CACHE_DIR / "metadata"
+METADATA_TTL = float(os.environ.get("ROMPY_METADATA_TTL", 3600))
+
+
+class CatalogPool:
+    """Least-recently-used pool of opened intake catalogs.
+
+    Catalogs are keyed on their URI, or the hash of the YAML string defining them, so
+    sources sharing a catalog do not parse it, or fetch it from a remote location,
+    every time it is accessed. Catalogs opened more than `ttl` seconds ago are
+    reopened so changes to the catalog files are eventually picked up.
+
+    Parameters
+    ----------
+    maxsize : int
+        Maximum number of catalogs to keep in the pool, 0 disables pooling.
+    ttl : float
+        Time in seconds after which pooled catalogs are reopened.
+
+    """
+
+    def __init__(self, maxsize: int = 16, ttl: float = 3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._data
+
+    def get(self, key: str, factory) -> "Catalog":
+        """Return the pooled catalog for key, opening it with factory if needed.
+
+        Parameters
+        ----------
+        key : str
+            The catalog key.
+        factory : Callable[[], Catalog]
+            Function opening the catalog when it is not pooled or it has expired.
+
+        """
+        with self._lock:
+            if key in self._data:
+                catalog, opened = self._data[key]
+                if time.time() - opened < self.ttl:
+                    self.hits += 1
+                    self._data.move_to_end(key)
+                    return catalog
+                del self._data[key]
+            self.misses += 1
+            catalog = factory()
+            if self.maxsize > 0:
+                self._data[key] = (catalog, time.time())
+                while len(self._data) > self.maxsize:
+                    evicted, _ = self._data.popitem(last=False)
+                    logger.debug(f"Evicting {evicted} from the catalog pool")
+            return catalog
+
+    def invalidate(self, key: Optional[str] = None):
+        """Remove the catalog under key from the pool, or all catalogs if None."""
+        with self._lock:
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+    def clear(self):
+        """Remove all pooled catalogs and reset the counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> CacheInfo:
+        """Return the pool statistics."""
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
+
+# Process-wide pool of intake catalogs, set ROMPY_CATALOG_POOL_SIZE=0 to disable
+CATALOG_POOL = CatalogPool(
+    maxsize=int(os.environ.get("ROMPY_CATALOG_POOL_SIZE", 16)),
+    ttl=float(os.environ.get("ROMPY_CATALOG_TTL", 3600)),
+)
+
+# Resolved intake catalog entries persisted by sources with `persist_entry=True`
+CATALOG_DIR = CACHE_DIR / "catalogs"
+
+# Parquet sidecars of csv timeseries, invalidated when the csv file changes
+TIMESERIES_DIR = CACHE_DIR / "timeseries"
+
+
+def _encoding(encoding: dict) -> dict:
+    """Json-serialisable subset of a variable encoding."""
+    simple = (str, int, float, bool, type(None))
+    out = {}
+    for key, value in encoding.items():
+        if isinstance(value, np.generic):
+            value = value.item()
+        if isinstance(value, (list, tuple)):
+            value = [v.item() if isinstance(v, np.generic) else v for v in value]
+            if all(isinstance(v, simple) for v in value):
+                out[key] = value
+        elif isinstance(value, simple):
+            out[key] = value
+    return out
+
+
+class SourceMetadata(RompyBaseModel):
+    """Dimensions, coordinates and encoding of a source dataset.
+
+    This is what is required to plan the selection from a source, i.e., defining the
+    time buffer or the crop slices, without reading any of its data variables.
+
+    """
+
+    dims: dict[str, int] = Field(description="Dimension sizes")
+    coords: xr.Dataset = Field(description="Dataset with the coordinate variables")
+    variables: dict[str, dict] = Field(
+        default={},
+        description="Dimensions, dtype, chunking and encoding of the data variables",
+    )
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    @classmethod
+    def from_dataset(cls, ds: xr.Dataset) -> "SourceMetadata":
+        """Metadata from a lazily opened dataset, data variables are not loaded."""
+        variables = {}
+        for name, var in ds.data_vars.items():
+            chunks = var.encoding.get("chunksizes") or var.encoding.get("chunks")
+            if chunks is None and var.chunks is not None:
+                chunks = [max(c) for c in var.chunks]
+            variables[name] = dict(
+                dims=list(var.dims),
+                dtype=str(var.dtype),
+                chunks=list(chunks) if chunks is not None else None,
+                encoding=_encoding(var.encoding),
+            )
+        coords = ds.coords.to_dataset().compute()
+        return cls(dims=dict(ds.sizes), coords=coords, variables=variables)
+
+    def to_netcdf(self, filename: str | Path):
+        """Write the metadata sidecar file."""
+        coords = self.coords.copy()
+        for var in coords.variables.values():
+            var.encoding = {}
+        coords.attrs["rompy_dims"] = json.dumps(self.dims)
+        coords.attrs["rompy_variables"] = json.dumps(self.variables)
+        Path(filename).parent.mkdir(parents=True, exist_ok=True)
+        coords.to_netcdf(filename)
+
+    @classmethod
+    def from_netcdf(cls, filename: str | Path) -> "SourceMetadata":
+        """Read the metadata sidecar file."""
+        with xr.open_dataset(filename) as dset:
+            coords = dset.load()
+        dims = json.loads(coords.attrs.pop("rompy_dims"))
+        variables = json.loads(coords.attrs.pop("rompy_variables"))
+        return cls(dims=dims, coords=coords, variables=variables)
+
+
 class SourceBase(RompyBaseModel, ABC):
     """Abstract base class for a source dataset."""
 
@@ -35,10 +337,71 @@ class SourceBase(RompyBaseModel, ABC):
         """This abstract private method should return a xarray dataset object."""
         pass
 
+    # Whether metadata can be persisted in the sidecar cache across processes
+    _persist_metadata: bool = True
+
     @cached_property
     def coordinates(self) -> xr.Dataset:
         """Return the coordinates of the datasource."""
-        return self.open().coords
+        return self.metadata().coords.coords
+
+    def _metadata(self) -> SourceMetadata:
+        """Probe the source metadata.
+
+        The default implementation lazily opens the unfiltered source, subclasses
+        should override it when the source can be probed more cheaply.
+
+        """
+        return SourceMetadata.from_dataset(self._open())
+
+    def metadata(self, refresh: bool = False) -> SourceMetadata:
+        """Return the dimensions, coordinates and encoding of the source.
+
+        Parameters
+        ----------
+        refresh : bool, optional
+            Probe the source again even if the metadata sidecar cache is valid.
+
+        Returns
+        -------
+        metadata : SourceMetadata
+            The source metadata.
+
+        Notes
+        -----
+        Metadata are persisted in a sidecar file under `METADATA_DIR` and reused until
+        they are older than `METADATA_TTL` seconds.
+
+        """
+        if not self._persist_metadata:
+            return self._metadata()
+        filename = METADATA_DIR / f"{self.fingerprint}.nc"
+        if not refresh and filename.is_file():
+            age = time.time() - filename.stat().st_mtime
+            if age < METADATA_TTL:
+                try:
+                    return SourceMetadata.from_netcdf(filename)
+                except Exception as err:
+                    logger.debug(f"Cannot read metadata sidecar {filename}: {err}")
+        meta = self._metadata()
+        try:
+            meta.to_netcdf(filename)
+        except Exception as err:
+            logger.debug(f"Cannot write metadata sidecar {filename}: {err}")
+        return meta
+
+    @property
+    def fingerprint(self) -> str:
+        """Hash identifying this source, used to key the dataset cache."""
+        return _hash(self.model_dump())
+
+    def _cache_key(self, variables: list, filters: Filter | dict, **kwargs) -> tuple:
+        """Key identifying a dataset opened from this source in the dataset cache."""
+        return (self.fingerprint, tuple(variables or []), filter_hash(filters))
+
+    def invalidate_cache(self):
+        """Remove the datasets opened from this source from the dataset cache."""
+        DATASET_CACHE.invalidate(self)
 
     def open(self, variables: list = [], filters: Filter = {}, **kwargs) -> xr.Dataset:
         """Return the filtered dataset object.
@@ -55,7 +418,14 @@ class SourceBase(RompyBaseModel, ABC):
         The kwargs are only a placeholder in case a subclass needs to pass additional
         arguments to the open method.
 
+        Datasets are cached in `DATASET_CACHE` so opening the same source with the same
+        variables and filters again does not reopen the underlying data.
+
         """
+        key = self._cache_key(variables, filters)
+        ds = DATASET_CACHE.get(key)
+        if ds is not None:
+            return ds
         ds = self._open()
         if variables:
             try:
@@ -75,6 +445,7 @@ class SourceBase(RompyBaseModel, ABC):
                 ) from e
         if filters:
             ds = filters(ds)
+        DATASET_CACHE.put(key, ds)
         return ds
 
 
@@ -93,28 +464,363 @@ class SourceDataset(SourceBase):
     def __str__(self) -> str:
         return f"SourceDataset(obj={self.obj})"
 
+    _persist_metadata: bool = False
+
+    @property
+    def fingerprint(self) -> str:
+        """Hash of the values, coordinates and attributes of the in-memory dataset."""
+        from dask.base import tokenize
+
+        return f"dataset-{tokenize(self.obj)}"
+
     def _open(self) -> xr.Dataset:
         return self.obj
 
 
 class SourceFile(SourceBase):
-    """Source dataset from file to open with xarray.open_dataset."""
+    """Source dataset from file to open with xarray.open_dataset.
+
+    Note
+    ----
+    Multi-file datasets can be defined with a glob pattern or with a template uri
+    with `{time:<strftime format>}` fields, e.g., `/data/era5/era5-{time:%Y%m%d}.nc`.
+    Templated uris only open the files that overlap the time crop filter, where the
+    `frequency` field defines the time step between consecutive files. When
+    `reference` is set, a kerchunk virtual reference index of all the files in the
+    archive is built the first time the source is opened and reused afterwards, it
+    is rebuilt if the list of files in the archive changes.
+
+    With `pushdown`, the crop filter slices are converted into index windows from
+    the coordinate variables and only these windows are read from the file.
+
+    """
 
     model_type: Literal["file"] = Field(
         default="file",
         description="Model type discriminator",
     )
-    uri: str | Path = Field(description="Path to the dataset")
+    uri: str | Path = Field(
+        description=(
+            "Path to the dataset, multi-file datasets can be defined from a glob "
+            "pattern or from a template with `{time:<strftime format>}` fields"
+        )
+    )
     kwargs: dict = Field(
         default={},
-        description="Keyword arguments to pass to xarray.open_dataset",
+        description=(
+            "Keyword arguments to pass to xarray.open_dataset, or to "
+            "xarray.open_mfdataset for multi-file datasets"
+        ),
     )
+    frequency: Optional[str] = Field(
+        default=None,
+        description="Time frequency of the files in a templated uri, e.g., '1D'",
+    )
+    reference: Optional[str | Path] = Field(
+        default=None,
+        description=(
+            "Path of the kerchunk virtual reference index of a multi-file dataset, "
+            "either a json file or a parquet directory ending with .parq or .parquet"
+        ),
+    )
+    concat_dim: str = Field(
+        default="time",
+        description="Dimension to concatenate multi-file datasets along",
+    )
+    pushdown: bool = Field(
+        default=True,
+        description=(
+            "Only read the index windows of the dimension coordinates covered by the "
+            "crop filter, computed from the coordinate variables before reading data"
+        ),
+    )
+    chunk_size: Optional[str | int] = Field(
+        default=None,
+        description=(
+            "Chunk the windows read from the file into dask chunks of at most this "
+            "size, e.g., '128MiB', so they are loaded in bounded memory"
+        ),
+    )
+    _period: Optional[tuple] = PrivateAttr(default=None)
+    _filters: Optional[Filter] = PrivateAttr(default=None)
+
+    @model_validator(mode="after")
+    def check_template(self) -> "SourceFile":
+        if self.is_template and self.frequency is None and self.reference is None:
+            raise ValueError("Either frequency or reference required for template uri")
+        return self
 
     def __str__(self) -> str:
         return f"SourceFile(uri={self.uri})"
 
+    @property
+    def is_template(self) -> bool:
+        """Whether the uri is a template with time fields."""
+        return "{" in str(self.uri)
+
+    @property
+    def multifile(self) -> bool:
+        """Whether the uri defines a multi-file dataset."""
+        return self.is_template or any(char in str(self.uri) for char in "*?[")
+
+    @property
+    def pattern(self) -> str:
+        """Glob pattern matching all the files of a multi-file dataset."""
+        return re.sub(r"\{[^}]*\}", "*", str(self.uri))
+
+    @property
+    def fingerprint(self) -> str:
+        """Hash identifying this source, local files also hash their size and mtime."""
+        stats = {}
+        if os.path.exists(self.uri):
+            stat = os.stat(self.uri)
+            stats = dict(size=stat.st_size, mtime=stat.st_mtime)
+        return _hash(dict(model=self.model_dump(), stats=stats))
+
+    def files(self, start=None, end=None) -> list[str]:
+        """List the files of a multi-file dataset.
+
+        Parameters
+        ----------
+        start : datetime, optional
+            Start of the period to list files for, only used with template uris.
+        end : datetime, optional
+            End of the period to list files for, only used with template uris.
+
+        Returns
+        -------
+        files : list[str]
+            Sorted list of files overlapping the period, all files matching the uri
+            are returned if the period is not defined.
+
+        """
+        fs, _ = fsspec.core.url_to_fs(self.pattern)
+        if not self.is_template or None in (start, end, self.frequency):
+            files = fs.glob(self.pattern)
+        else:
+            offset = pd.tseries.frequencies.to_offset(self.frequency)
+            start = pd.Timestamp(start)
+            if isinstance(offset, pd.tseries.offsets.Tick):
+                start = start.floor(offset)
+            else:
+                start = offset.rollback(start.normalize())
+            times = pd.date_range(start, pd.Timestamp(end), freq=offset)
+            files = [str(self.uri).format(time=t) for t in times]
+            files = [f for f in dict.fromkeys(files) if fs.exists(f)]
+        protocol = fsspec.utils.get_protocol(self.pattern)
+        if protocol != "file":
+            files = [fs.unstrip_protocol(f) for f in files]
+        return sorted(files)
+
+    def _time_slice(self, filters: Filter | dict, coords: DatasetCoords = None):
+        """The start and end times from the crop filter."""
+        t = coords.t if coords is not None else self.concat_dim
+        tslice = filters.crop.get(t) if isinstance(filters, Filter) else None
+        if tslice is None:
+            return None
+        return tslice.start, tslice.stop
+
+    def _manifest(self) -> str:
+        return f"{self.reference}.files.json"
+
+    def _reference_is_current(self, files: list[str]) -> bool:
+        """Whether the reference index exists and was built from files."""
+        fs, _ = fsspec.core.url_to_fs(str(self.reference))
+        if not fs.exists(str(self.reference)) or not fs.exists(self._manifest()):
+            return False
+        with fsspec.open(self._manifest(), "r") as stream:
+            return json.load(stream) == files
+
+    def build_reference(self, files: Optional[list[str]] = None):
+        """Build the kerchunk virtual reference index of a multi-file dataset.
+
+        Parameters
+        ----------
+        files : list[str], optional
+            Files to index, by default all the files matching the uri.
+
+        """
+        from kerchunk.combine import MultiZarrToZarr
+        from kerchunk.hdf import SingleHdf5ToZarr
+
+        files = files or self.files()
+        if not files:
+            raise ValueError(f"No files found matching {self.pattern}")
+        logger.info(f"Building reference index {self.reference} for {len(files)} files")
+        refs = []
+        for filename in files:
+            with fsspec.open(filename, "rb") as stream:
+                refs.append(SingleHdf5ToZarr(stream, filename).translate())
+        with xr.open_dataset(files[0], decode_times=False) as dset:
+            identical_dims = [
+                name for name in dset.coords if self.concat_dim not in dset[name].dims
+            ]
+            if self.concat_dim in dset.variables:
+                units = dset[self.concat_dim].attrs.get("units", "")
+            else:
+                units = ""
+        # Each file can encode times relative to its own reference date, so CF times
+        # are decoded before they are concatenated
+        coo_map = {self.concat_dim: "cf:time"} if " since " in units else {}
+        combined = MultiZarrToZarr(
+            refs,
+            concat_dims=[self.concat_dim],
+            identical_dims=identical_dims,
+            coo_map=coo_map,
+        ).translate()
+        reference = str(self.reference)
+        if reference.endswith((".parq", ".parquet")):
+            from kerchunk.df import refs_to_dataframe
+
+            refs_to_dataframe(combined, reference)
+        else:
+            with fsspec.open(reference, "w") as stream:
+                json.dump(combined, stream)
+        with fsspec.open(self._manifest(), "w") as stream:
+            json.dump(files, stream)
+
+    def _open_reference(self, files: Optional[list[str]] = None) -> xr.Dataset:
+        """Open the multi-file dataset from the reference index."""
+        files = files or self.files()
+        if not self._reference_is_current(files):
+            self.build_reference(files)
+        fs = fsspec.filesystem(
+            "reference",
+            fo=str(self.reference),
+            remote_protocol=fsspec.utils.get_protocol(self.pattern),
+        )
+        kwargs = {k: v for k, v in self.kwargs.items() if k != "engine"}
+        kwargs = {"chunks": {}, **kwargs}
+        return xr.open_dataset(
+            fs.get_mapper(""), engine="zarr", consolidated=False, **kwargs
+        )
+
+    def _open_mfdataset(self) -> xr.Dataset:
+        """Open the files of a multi-file dataset overlapping the period."""
+        files = self.files(*(self._period or (None, None)))
+        if not files:
+            raise ValueError(f"No files found for {self.uri} in period {self._period}")
+        logger.debug(f"Opening {len(files)} files from {self.uri}")
+        kwargs = dict(
+            combine="nested",
+            concat_dim=self.concat_dim,
+            data_vars="minimal",
+            coords="minimal",
+            compat="override",
+        )
+        return xr.open_mfdataset(files, **{**kwargs, **self.kwargs})
+
+    def _open_header(self, filename: str | Path) -> xr.Dataset:
+        """Open a single file lazily, data variables are not loaded."""
+        kwargs = {k: v for k, v in self.kwargs.items() if k not in MFDATASET_KWARGS}
+        kwargs = {**kwargs, "chunks": self.kwargs.get("chunks", {})}
+        dset = xr.open_dataset(filename, **kwargs)
+        if self.kwargs.get("preprocess") is not None:
+            dset = self.kwargs["preprocess"](dset)
+        return dset
+
+    def _probe_files(self, files: list[str]) -> Optional[SourceMetadata]:
+        """Metadata of a regular multi-file dataset from the first and last files.
+
+        The concat axis is extrapolated over the list of files from the step in the
+        first file, or from the first two files when they have a single step each.
+        None is returned when the files are not regular so the caller can fall back
+        to opening all of them.
+
+        """
+        dim = self.concat_dim
+        with self._open_header(files[0]) as first:
+            coords = [c for c in first.coords if c != dim and dim in first[c].dims]
+            if dim not in first.dims or coords:
+                return None
+            meta = SourceMetadata.from_dataset(first)
+        if len(files) == 1:
+            return meta
+        head = meta.coords[dim].values
+        if head.size > 1:
+            steps = np.diff(head)
+            if not (steps == steps[0]).all():
+                return None
+            step = steps[0]
+        else:
+            with self._open_header(files[1]) as second:
+                step = second[dim].values[0] - head[0]
+        with self._open_header(files[-1]) as last:
+            tail = last[dim].values
+        axis = head[0] + step * np.arange(head.size * (len(files) - 1) + tail.size)
+        if not np.array_equal(axis[-tail.size :], tail):
+            return None
+        coords = {dim: (dim, axis, meta.coords[dim].attrs)}
+        meta.coords = meta.coords.drop_vars(dim).assign_coords(coords)
+        meta.dims[dim] = axis.size
+        return meta
+
+    def _metadata(self) -> SourceMetadata:
+        """Header-only read, data variables are not loaded by open_dataset.
+
+        Multi-file datasets are probed from the reference index when it is current,
+        otherwise from the first and last files with the concat axis built over the
+        list of files, all files are only opened if the archive is not regular.
+
+        """
+        if not self.multifile:
+            with self._open_header(self.uri) as dset:
+                return SourceMetadata.from_dataset(dset)
+        files = self.files()
+        if not files:
+            raise ValueError(f"No files found matching {self.pattern}")
+        if self.reference is not None and self._reference_is_current(files):
+            with self._open_reference(files) as dset:
+                return SourceMetadata.from_dataset(dset)
+        meta = self._probe_files(files)
+        if meta is None:
+            logger.debug(f"Irregular files in {self.uri}, probing all of them")
+            self._period = None
+            meta = SourceMetadata.from_dataset(self._open())
+        return meta
+
+    def open(
+        self,
+        variables: list = [],
+        filters: Filter = {},
+        coords: DatasetCoords = None,
+        **kwargs,
+    ) -> xr.Dataset:
+        """Return the filtered dataset object.
+
+        This method is overriden from the base class so the time crop filter can
+        define the files to open in multi-file datasets.
+
+        """
+        self._period = self._time_slice(filters, coords) if self.multifile else None
+        self._filters = filters if isinstance(filters, Filter) else None
+        try:
+            return super().open(variables=variables, filters=filters, **kwargs)
+        finally:
+            self._filters = None
+
+    def _hyperslab(self, ds: xr.Dataset) -> xr.Dataset:
+        """Select the index windows covered by the crop filter."""
+        if self.pushdown and self._filters is not None:
+            indexers = self._filters.crop_windows(ds)
+            if indexers:
+                logger.debug(f"Reading hyperslab {indexers} from {self}")
+                ds = ds.isel(indexers)
+        if self.chunk_size is not None:
+            import dask
+
+            with dask.config.set({"array.chunk-size": self.chunk_size}):
+                ds = ds.chunk("auto")
+        return ds
+
     def _open(self) -> xr.Dataset:
-        return xr.open_dataset(self.uri, **self.kwargs)
+        if not self.multifile:
+            ds = xr.open_dataset(self.uri, **self.kwargs)
+        elif self.reference is not None:
+            ds = self._open_reference()
+        else:
+            ds = self._open_mfdataset()
+        return self._hyperslab(ds)
 
 
 class SourceIntake(SourceBase):
@@ -145,6 +851,13 @@ class SourceIntake(SourceBase):
         default={},
         description="Keyword arguments to define intake dataset parameters",
     )
+    persist_entry: bool = Field(
+        default=False,
+        description=(
+            "Persist the resolved catalog entry with its driver arguments under "
+            "`CATALOG_DIR` so it is reopened without resolving the catalog"
+        ),
+    )
 
     @model_validator(mode="after")
     def check_catalog(self) -> "SourceIntake":
@@ -158,8 +871,16 @@ class SourceIntake(SourceBase):
         return f"SourceIntake(catalog_uri={self.catalog_uri}, dataset_id={self.dataset_id})"
 
     @property
-    def catalog(self) -> Catalog:
-        """The intake catalog instance."""
+    def catalog_key(self) -> str:
+        """Key of the catalog in the catalog pool."""
+        if self.catalog_uri:
+            return str(self.catalog_uri)
+        return f"yaml-{_hash(self.catalog_yaml)}"
+
+    def _open_catalog(self) -> "Catalog":
+        import intake
+        from intake.catalog.local import YAMLFileCatalog
+
         if self.catalog_uri:
             return intake.open_catalog(self.catalog_uri)
         else:
@@ -168,8 +889,208 @@ class SourceIntake(SourceBase):
             fs_map[f"/temp.yaml"] = self.catalog_yaml.encode("utf-8")
             return YAMLFileCatalog("temp.yaml", fs=fs)
 
+    @property
+    def catalog(self) -> "Catalog":
+        """The intake catalog instance, shared across sources through the pool."""
+        return CATALOG_POOL.get(self.catalog_key, self._open_catalog)
+
+    def entry(self):
+        """The intake data source for the dataset with the kwargs parameters.
+
+        When `persist_entry` is set, the resolved entry is written to a single-entry
+        catalog under `CATALOG_DIR` and reopened from there until it is older than
+        the catalog pool ttl. Entries from drivers that cannot be serialised to yaml,
+        e.g., the intake 2 compatibility sources, are not persisted.
+
+        """
+        if not self.persist_entry:
+            return self.catalog[self.dataset_id](**self.kwargs)
+        key = _hash([self.catalog_key, self.dataset_id, self.kwargs])
+        filename = CATALOG_DIR / f"{key}.yaml"
+        if filename.is_file():
+            age = time.time() - filename.stat().st_mtime
+            if age < CATALOG_POOL.ttl:
+                import intake
+
+                catalog = intake.open_catalog(str(filename))
+                return catalog[list(catalog)[0]]()
+        entry = self.catalog[self.dataset_id](**self.kwargs)
+        if not hasattr(entry, "yaml"):
+            logger.debug(f"Cannot persist {self.dataset_id}, entry has no yaml method")
+            return entry
+        try:
+            filename.parent.mkdir(parents=True, exist_ok=True)
+            tmp = filename.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(entry.yaml())
+            tmp.replace(filename)
+        except OSError as err:
+            logger.debug(f"Cannot persist catalog entry to {filename}: {err}")
+        return entry
+
+    def _metadata(self) -> SourceMetadata:
+        """Probe the catalog entry with intake's discover.
+
+        The coordinates are taken from the lazy dask representation of the entry
+        which intake-xarray drivers have already opened when discovering the schema.
+
+        """
+        entry = self.entry()
+        schema = entry.discover()
+        logger.debug(f"Discovered schema for {self.dataset_id}: {schema}")
+        return SourceMetadata.from_dataset(entry.to_dask())
+
     def _open(self) -> xr.Dataset:
-        return self.catalog[self.dataset_id](**self.kwargs).to_dask()
+        return self.entry().to_dask()
+
+
+def _is_descending(dsets: list[xr.Dataset], dim: str) -> bool:
+    """Whether the index of dim is descending in the datasets."""
+    for ds in dsets:
+        if dim in ds.dims and ds.sizes[dim] > 1:
+            return ds.get_index(dim).is_monotonic_decreasing
+    return False
+
+
+class DatameshTiling(RompyBaseModel):
+    """Split Datamesh queries into tiles fetched concurrently.
+
+    The time range of the query is split into windows of length `time_chunk` and
+    the bbox is optionally split into `xsplit` by `ysplit` boxes. The tile queries
+    are issued concurrently and the results are concatenated lazily.
+
+    Note
+    ----
+    Splitting the bbox is only supported for gridded datasources where the x and y
+    coordinates are dimensions of the returned dataset.
+
+    """
+
+    model_type: Literal["tiling"] = Field(
+        default="tiling",
+        description="Model type discriminator",
+    )
+    time_chunk: Optional[str] = Field(
+        default="7D",
+        description=(
+            "Length of the time windows to split the timefilter into as a pandas "
+            "frequency string, the time range is not split if None"
+        ),
+    )
+    xsplit: int = Field(
+        default=1,
+        description="Number of tiles to split the bbox into along the x axis",
+        ge=1,
+    )
+    ysplit: int = Field(
+        default=1,
+        description="Number of tiles to split the bbox into along the y axis",
+        ge=1,
+    )
+    max_workers: int = Field(
+        default=4,
+        description="Maximum number of concurrent tile requests",
+        ge=1,
+    )
+    retries: int = Field(
+        default=3,
+        description="Number of times a failed tile request is retried",
+        ge=0,
+    )
+    backoff: float = Field(
+        default=1.0,
+        description="Delay in seconds before the first retry, doubled after each",
+        ge=0,
+    )
+
+    def time_windows(self, timefilter: Optional[dict]) -> list[Optional[dict]]:
+        """Split a range timefilter into non-overlapping timefilters."""
+        if timefilter is None or self.time_chunk is None:
+            return [timefilter]
+        t0, t1 = [pd.Timestamp(t) for t in timefilter["times"]]
+        edges = list(pd.date_range(t0, t1, freq=self.time_chunk))
+        if edges[-1] < t1:
+            edges.append(t1)
+        if len(edges) < 3:
+            return [timefilter]
+        # Query ranges are inclusive so each window stops just before the next one
+        eps = pd.Timedelta(1, "us")
+        windows = [[start, end - eps] for start, end in zip(edges[:-2], edges[1:-1])]
+        windows.append([edges[-2], edges[-1]])
+        return [dict(timefilter, times=times) for times in windows]
+
+    def bbox_tiles(self, geofilter: Optional[dict]) -> list[list[Optional[dict]]]:
+        """Split a bbox geofilter into a ysplit by xsplit nested list of bboxes."""
+        if geofilter is None or (self.xsplit == 1 and self.ysplit == 1):
+            return [[geofilter]]
+        if geofilter.get("type") != "bbox":
+            raise ValueError(f"Only bbox geofilters can be split, got {geofilter}")
+        x0, y0, x1, y1 = geofilter["geom"]
+        xedges = np.linspace(x0, x1, self.xsplit + 1)
+        yedges = np.linspace(y0, y1, self.ysplit + 1)
+        return [
+            [
+                dict(geofilter, geom=[xa, ya, xb, yb])
+                for xa, xb in zip(xedges[:-1], xedges[1:])
+            ]
+            for ya, yb in zip(yedges[:-1], yedges[1:])
+        ]
+
+
+class LocalConnector:
+    """Stand-in for the Datamesh connector serving queries from a local dataset.
+
+    Range timefilters and bbox geofilters are applied with inclusive label-based
+    selections, mimicking Datamesh, so queries can be run offline.
+
+    Parameters
+    ----------
+    uri : str | Path
+        Path to the dataset to serve.
+    x : str
+        Name of the x coordinate.
+    y : str
+        Name of the y coordinate.
+    t : str
+        Name of the time coordinate.
+
+    """
+
+    def __init__(
+        self,
+        uri: str | Path,
+        x: str = "longitude",
+        y: str = "latitude",
+        t: str = "time",
+    ):
+        self.uri = uri
+        self.x = x
+        self.y = y
+        self.t = t
+
+    def load_datasource(self, datasource_id: str, **kwargs) -> xr.Dataset:
+        return xr.open_dataset(self.uri, chunks={})
+
+    def _sel(self, ds: xr.Dataset, dim: str, start, stop) -> xr.Dataset:
+        if dim not in ds.dims:
+            return ds
+        index = ds.indexes[dim]
+        if index.is_monotonic_decreasing:
+            start, stop = stop, start
+        return ds.sel({dim: slice(start, stop)})
+
+    def query(self, query: dict) -> xr.Dataset:
+        ds = xr.open_dataset(self.uri)
+        if query.get("variables"):
+            ds = ds[query["variables"]]
+        timefilter = query.get("timefilter")
+        if timefilter is not None:
+            ds = self._sel(ds, self.t, *timefilter["times"])
+        geofilter = query.get("geofilter")
+        if geofilter is not None:
+            x0, y0, x1, y1 = geofilter["geom"]
+            ds = self._sel(ds, self.x, x0, x1)
+            ds = self._sel(ds, self.y, y0, y1)
+        return ds.load()
 
 
 class SourceDatamesh(SourceBase):
@@ -191,21 +1112,60 @@ class SourceDatamesh(SourceBase):
     )
     kwargs: dict = Field(
         default={},
-        description="Keyword arguments to pass to `oceanum.datamesh.Connector`",
+        description=(
+            "Keyword arguments to pass to `oceanum.datamesh.Connector`, or to "
+            "`LocalConnector` if `local` is provided"
+        ),
+    )
+    tiling: Optional[DatameshTiling] = Field(
+        default=None,
+        description=(
+            "Split the query into tiles fetched concurrently, a single query is "
+            "issued if None"
+        ),
+    )
+    local: Optional[str | Path] = Field(
+        default=None,
+        description=(
+            "Path to a local dataset to serve queries from instead of Datamesh, "
+            "intended for testing offline"
+        ),
     )
 
     def __str__(self) -> str:
         return f"SourceDatamesh(datasource={self.datasource})"
 
     @cached_property
-    def connector(self) -> Connector:
+    def connector(self) -> "Connector | LocalConnector":
         """The Datamesh connector instance."""
+        if self.local is not None:
+            return LocalConnector(self.local, **self.kwargs)
+        from oceanum.datamesh import Connector
+
         return Connector(token=self.token, **self.kwargs)
 
-    @cached_property
-    def coordinates(self) -> xr.Dataset:
-        """Return the coordinates of the datasource."""
-        return self._open(variables=[], geofilter=None, timefilter=None).coords
+    def _metadata(self) -> SourceMetadata:
+        """Probe the datasource from its lazily loaded zarr representation.
+
+        Only the datasource metadata and the coordinates are transferred, unlike an
+        unfiltered query which would download the entire datasource.
+
+        """
+        dset = self.connector.load_datasource(self.datasource, use_dask=True)
+        return SourceMetadata.from_dataset(dset)
+
+    @property
+    def fingerprint(self) -> str:
+        """Hash identifying this source, the token is not part of the identity."""
+        return _hash(self.model_dump(exclude={"token"}))
+
+    def _cache_key(
+        self, variables: list, filters: Filter | dict, coords: DatasetCoords = None
+    ) -> tuple:
+        """Include the coordinates names since they define the datamesh query."""
+        coords = coords.model_dump() if coords is not None else {}
+        key = super()._cache_key(variables, filters)
+        return key + (_hash(coords),)
 
     def _geofilter(self, filters: Filter, coords: DatasetCoords) -> dict:
         """The Datamesh geofilter."""
@@ -235,14 +1195,97 @@ class SourceDatamesh(SourceBase):
             return None
         return dict(type="range", times=[tslice.start, tslice.stop])
 
-    def _open(self, variables: list, geofilter: dict, timefilter: dict) -> xr.Dataset:
+    def _query(self, query: dict) -> xr.Dataset:
+        """Issue a query, retrying failed requests with exponential backoff."""
+        retries = self.tiling.retries if self.tiling is not None else 0
+        delay = self.tiling.backoff if self.tiling is not None else 0
+        for attempt in range(retries + 1):
+            try:
+                return self.connector.query(query)
+            except Exception as err:
+                if attempt == retries:
+                    raise
+                logger.warning(
+                    f"Datamesh query {query} failed ({err}), retrying in {delay}s"
+                )
+                time.sleep(delay)
+                delay *= 2
+
+    def _open_tiles(
+        self, variables: list, geofilter: dict, timefilter: dict, coords: DatasetCoords
+    ) -> xr.Dataset:
+        """Fetch the query tiles concurrently and concatenate them lazily."""
+        windows = self.tiling.time_windows(timefilter)
+        boxes = self.tiling.bbox_tiles(geofilter)
+        queries = [
+            [
+                [
+                    dict(
+                        datasource=self.datasource,
+                        variables=variables,
+                        geofilter=box,
+                        timefilter=window,
+                    )
+                    for box in row
+                ]
+                for row in boxes
+            ]
+            for window in windows
+        ]
+        flat = [query for rows in queries for row in rows for query in row]
+        logger.info(f"Fetching {self} in {len(flat)} tiles")
+        with ThreadPoolExecutor(max_workers=self.tiling.max_workers) as executor:
+            results = iter(executor.map(self._query, flat))
+            tiles = [[[next(results) for _ in row] for row in rows] for rows in queries]
+
+        # Bbox tiles share their edges, drop the labels fetched by the previous tile
+        for rows in tiles:
+            for j, row in enumerate(rows):
+                for i, ds in enumerate(row):
+                    xa, ya = boxes[j][i]["geom"][:2] if geofilter else (None, None)
+                    if i > 0 and coords.x in ds.dims:
+                        ds = ds.isel({coords.x: ds[coords.x].values > xa})
+                    if j > 0 and coords.y in ds.dims:
+                        ds = ds.isel({coords.y: ds[coords.y].values > ya})
+                    row[i] = ds.chunk()
+        # Tiles are built in ascending bbox order, reverse them along descending axes
+        dsets = [ds for rows in tiles for row in rows for ds in row]
+        if _is_descending(dsets, coords.y):
+            tiles = [rows[::-1] for rows in tiles]
+        if _is_descending(dsets, coords.x):
+            tiles = [[row[::-1] for row in rows] for rows in tiles]
+        concat_dim = [coords.t, coords.y, coords.x]
+        if len(boxes) == 1 and len(boxes[0]) == 1:
+            tiles = [rows[0][0] for rows in tiles]
+            concat_dim = coords.t
+        ds = xr.combine_nested(
+            tiles,
+            concat_dim=concat_dim,
+            data_vars="minimal",
+            coords="minimal",
+            compat="override",
+            combine_attrs="override",
+        )
+        if coords.t in ds.dims:
+            ds = ds.isel({coords.t: ~ds.get_index(coords.t).duplicated()})
+        return ds
+
+    def _open(
+        self,
+        variables: list,
+        geofilter: dict,
+        timefilter: dict,
+        coords: DatasetCoords = None,
+    ) -> xr.Dataset:
+        if self.tiling is not None:
+            return self._open_tiles(variables, geofilter, timefilter, coords)
         query = dict(
             datasource=self.datasource,
             variables=variables,
             geofilter=geofilter,
             timefilter=timefilter,
         )
-        return self.connector.query(query)
+        return self._query(query)
 
     def open(
         self, filters: Filter, coords: DatasetCoords, variables: list = []
@@ -253,11 +1296,17 @@ class SourceDatamesh(SourceBase):
         be converted to a geofilter and timefilter for querying Datamesh.
 
         """
+        key = self._cache_key(variables, filters, coords)
+        ds = DATASET_CACHE.get(key)
+        if ds is not None:
+            return ds
         ds = self._open(
             variables=variables,
             geofilter=self._geofilter(filters, coords),
             timefilter=self._timefilter(filters, coords),
+            coords=coords,
         )
+        DATASET_CACHE.put(key, ds)
         return ds
 
 
@@ -281,6 +1330,8 @@ class SourceWavespectra(SourceBase):
         return f"SourceWavespectra(uri={self.uri}, reader={self.reader})"
 
     def _open(self):
+        import wavespectra
+
         return getattr(wavespectra, self.reader)(self.uri, **self.kwargs)
 
 
@@ -307,6 +1358,20 @@ class SourceTimeseriesCSV(SourceBase):
         default={},
         description="Keyword arguments to pass to pandas.read_csv",
     )
+    arrow: bool = Field(
+        default=True,
+        description=(
+            "Parse the csv with the pyarrow engine, the default pandas engine is used "
+            "if pyarrow is not installed or does not support the read_csv_kwargs"
+        ),
+    )
+    sidecar: bool = Field(
+        default=True,
+        description=(
+            "Cache the parsed timeseries of local csv files in a parquet sidecar "
+            "under `TIMESERIES_DIR`, refreshed when the csv size or mtime change"
+        ),
+    )
 
     @model_validator(mode="after")
     def validate_kwargs(self) -> "SourceTimeseriesCSV":
@@ -317,9 +1382,81 @@ class SourceTimeseriesCSV(SourceBase):
             self.read_csv_kwargs["index_col"] = self.tcol
         return self
 
+    @property
+    def fingerprint(self) -> str:
+        """Hash identifying this source, local files also hash their size and mtime."""
+        stats = {}
+        if os.path.exists(self.filename):
+            stat = os.stat(self.filename)
+            stats = dict(size=stat.st_size, mtime=stat.st_mtime)
+        return _hash(dict(model=self.model_dump(), stats=stats))
+
+    @property
+    def sidecar_path(self) -> Optional[Path]:
+        """Path of the parquet sidecar, None if the sidecar is not used."""
+        if not self.sidecar or not os.path.exists(self.filename):
+            return None
+        prefix = _hash(str(Path(self.filename).resolve()))
+        return TIMESERIES_DIR / f"{prefix}-{self.fingerprint}.parquet"
+
+    def _read_csv(self, **kwargs) -> pd.DataFrame:
+        """Read the csv file, with the pyarrow engine if possible."""
+        kwargs = {**self.read_csv_kwargs, **kwargs}
+        if self.arrow and "engine" not in kwargs:
+            try:
+                return pd.read_csv(self.filename, engine="pyarrow", **kwargs)
+            except (ImportError, ValueError) as err:
+                logger.debug(f"Cannot read {self.filename} with pyarrow: {err}")
+        return pd.read_csv(self.filename, **kwargs)
+
+    def _write_sidecar(self, df: pd.DataFrame, sidecar: Path):
+        """Write the parquet sidecar and remove the ones from older csv versions."""
+        prefix = sidecar.name.split("-")[0]
+        try:
+            sidecar.parent.mkdir(parents=True, exist_ok=True)
+            tmp = sidecar.with_suffix(f".{os.getpid()}.tmp")
+            df.to_parquet(tmp)
+            tmp.replace(sidecar)
+        except Exception as err:
+            logger.debug(f"Cannot write parquet sidecar {sidecar}: {err}")
+            return
+        for stale in sidecar.parent.glob(f"{prefix}-*.parquet"):
+            if stale != sidecar:
+                stale.unlink(missing_ok=True)
+
+    def _metadata(self) -> SourceMetadata:
+        """Only parse the time column, data columns are read from the header."""
+        sidecar = self.sidecar_path
+        if sidecar is not None and sidecar.is_file():
+            index = pd.read_parquet(sidecar, columns=[]).index
+            columns = _parquet_columns(sidecar, index.name)
+        else:
+            columns = pd.read_csv(
+                self.filename, nrows=0, **self.read_csv_kwargs
+            ).columns
+            index = self._read_csv(usecols=[self.tcol]).index
+        index = index.rename("time")
+        coords = xr.Dataset(coords={"time": index})
+        variables = {
+            name: dict(dims=["time"], dtype=None, chunks=None, encoding={})
+            for name in columns
+        }
+        return SourceMetadata(
+            dims={"time": index.size}, coords=coords, variables=variables
+        )
+
     def _open_dataframe(self) -> pd.DataFrame:
-        """Read the data from the csv file."""
-        return pd.read_csv(self.filename, **self.read_csv_kwargs)
+        """Read the data from the parquet sidecar or the csv file."""
+        sidecar = self.sidecar_path
+        if sidecar is not None and sidecar.is_file():
+            try:
+                return pd.read_parquet(sidecar)
+            except Exception as err:
+                logger.debug(f"Cannot read parquet sidecar {sidecar}: {err}")
+        df = self._read_csv()
+        if sidecar is not None:
+            self._write_sidecar(df, sidecar)
+        return df
 
     def _open(self) -> xr.Dataset:
         """Interpolate the xyz data onto a regular grid."""
@@ -328,6 +1465,108 @@ class SourceTimeseriesCSV(SourceBase):
         return ds
 
 
+def _parquet_columns(filename: str | Path, index: Optional[str] = None) -> list[str]:
+    """Names of the data columns in a parquet file, excluding the index."""
+    import pyarrow.parquet as pq
+
+    names = pq.read_schema(filename).names
+    return [name for name in names if name != index and not name.startswith("__")]
+
+
+class SourceTimeseriesParquet(SourceBase):
+    """Timeseries source class from Parquet file.
+
+    The dataset variables are defined from the columns and the time index from the
+    column, or the pandas index, identified by the tcol field. The requested
+    variables and the time crop filter are pushed down to the parquet reader so only
+    the required columns and row groups are read.
+
+    """
+
+    model_type: Literal["parquet"] = Field(
+        default="parquet",
+        description="Model type discriminator",
+    )
+    filename: str | Path = Field(description="Path to the parquet file")
+    tcol: str = Field(
+        default="time",
+        description="Name of the column containing the time data",
+    )
+    kwargs: dict = Field(
+        default={},
+        description="Keyword arguments to pass to pyarrow.parquet.read_table",
+    )
+    _columns: Optional[list] = PrivateAttr(default=None)
+    _period: Optional[tuple] = PrivateAttr(default=None)
+
+    def __str__(self) -> str:
+        return f"SourceTimeseriesParquet(filename={self.filename})"
+
+    @property
+    def fingerprint(self) -> str:
+        """Hash identifying this source, local files also hash their size and mtime."""
+        stats = {}
+        if os.path.exists(self.filename):
+            stat = os.stat(self.filename)
+            stats = dict(size=stat.st_size, mtime=stat.st_mtime)
+        return _hash(dict(model=self.model_dump(), stats=stats))
+
+    def _metadata(self) -> SourceMetadata:
+        """Only read the time column, data columns are read from the schema."""
+        self._columns, self._period = [], None
+        index = self._read().index.rename("time")
+        coords = xr.Dataset(coords={"time": index})
+        variables = {
+            name: dict(dims=["time"], dtype=None, chunks=None, encoding={})
+            for name in _parquet_columns(self.filename, self.tcol)
+        }
+        return SourceMetadata(
+            dims={"time": index.size}, coords=coords, variables=variables
+        )
+
+    def _read(self) -> pd.DataFrame:
+        """Read the timeseries with the column and time projections pushed down."""
+        import pyarrow.parquet as pq
+
+        columns = None
+        if self._columns is not None:
+            columns = [self.tcol] + [c for c in self._columns if c != self.tcol]
+        filters = None
+        if self._period is not None:
+            start, stop = [pd.Timestamp(t) for t in self._period]
+            filters = [(self.tcol, ">=", start), (self.tcol, "<=", stop)]
+        table = pq.read_table(
+            self.filename, columns=columns, filters=filters, **self.kwargs
+        )
+        df = table.to_pandas()
+        if self.tcol in df.columns:
+            df = df.set_index(self.tcol)
+        return df
+
+    def open(
+        self,
+        variables: list = [],
+        filters: Filter = {},
+        coords: DatasetCoords = None,
+        **kwargs,
+    ) -> xr.Dataset:
+        """Return the filtered dataset object.
+
+        This method is overriden from the base class so the requested variables and
+        the time crop filter are pushed down to the parquet reader.
+
+        """
+        t = coords.t if coords is not None else "time"
+        tslice = filters.crop.get(t) if isinstance(filters, Filter) else None
+        self._columns = list(variables) or None
+        self._period = (tslice.start, tslice.stop) if tslice is not None else None
+        return super().open(variables=variables, filters=filters, **kwargs)
+
+    def _open(self) -> xr.Dataset:
+        df = self._read()
+        return xr.Dataset.from_dataframe(df).rename({df.index.name: "time"})
+
+
 class SourceTimeseriesDataFrame(SourceBase):
     """Source dataset from an existing pandas DataFrame timeseries object."""
 
@@ -353,5 +1592,14 @@ class SourceTimeseriesDataFrame(SourceBase):
     def __str__(self) -> str:
         return f"SourceTimeseriesDataFrame(obj={self.obj})"
 
+    _persist_metadata: bool = False
+
+    @property
+    def fingerprint(self) -> str:
+        """Hash of the index and values of the in-memory dataframe."""
+        from dask.base import tokenize
+
+        return f"dataframe-{tokenize(self.obj)}"
+
     def _open(self) -> xr.Dataset:
         return xr.Dataset.from_dataframe(self.obj).rename({self.obj.index.name: "time"})
@@ -0,0 +1,320 @@
+"""Rompy data writers."""
+
+import logging
+from pathlib import Path
+from typing import Literal, Optional
+
+import xarray as xr
+from pydantic import Field, model_validator
+
+from rompy.core.types import RompyBaseModel
+
+
+logger = logging.getLogger(__name__)
+
+
+class DataWriter(RompyBaseModel):
+    """Writer configuration for the datasets staged by data objects.
+
+    The default writer reproduces `xarray.Dataset.to_netcdf` without any encoding.
+    When `time_chunk` is set, the dataset is written in windows along the time
+    dimension which is appended to the output file, so only one window is held in
+    memory at a time when the source is not dask-backed.
+
+    Note
+    ----
+    Quantization in netcdf uses the netCDF4 `significant_digits` and `quantize_mode`
+    encoding options and requires netCDF4>=1.6. In zarr the `numcodecs.BitRound`
+    filter is used for `BitRound` and `numcodecs.Quantize` otherwise, through their
+    `numcodecs.zarr3` wrappers with zarr>=3.
+
+    """
+
+    model_type: Literal["writer"] = Field(
+        default="writer",
+        description="Model type discriminator",
+    )
+    format: Literal["netcdf", "zarr"] = Field(
+        default="netcdf",
+        description="Output file format",
+    )
+    chunks: dict[str, int] = Field(
+        default={},
+        description="Chunk sizes along each dimension applied to all variables",
+    )
+    variable_chunks: dict[str, dict[str, int]] = Field(
+        default={},
+        description="Chunk sizes along each dimension for specific variables",
+    )
+    compression: Optional[Literal["zlib", "zstd"]] = Field(
+        default=None,
+        description="Compression codec, data are not compressed if None",
+    )
+    complevel: int = Field(
+        default=4,
+        description="Compression level",
+        ge=1,
+        le=9,
+    )
+    shuffle: bool = Field(
+        default=True,
+        description="Apply the byte shuffle filter before compressing",
+    )
+    quantize_mode: Optional[Literal["BitGroom", "GranularBitRound", "BitRound"]] = (
+        Field(
+            default=None,
+            description="Quantization algorithm for floating point variables",
+        )
+    )
+    significant_digits: Optional[int] = Field(
+        default=None,
+        description=(
+            "Number of significant digits (decimal) or bits (BitRound) to retain "
+            "when quantizing floating point variables"
+        ),
+        ge=1,
+    )
+    parallel: bool = Field(
+        default=False,
+        description=(
+            "Write with `compute=False` and compute the delayed write with dask so "
+            "chunks are written in parallel without loading the full dataset"
+        ),
+    )
+    scheduler: Optional[str] = Field(
+        default=None,
+        description="Dask scheduler to use when `parallel` is True",
+    )
+    time_chunk: Optional[int] = Field(
+        default=None,
+        description=(
+            "Stream the dataset to the output file in windows of this number of time "
+            "steps along an unlimited time dimension, loading one window at a time"
+        ),
+        ge=1,
+    )
+    time_dim: str = Field(
+        default="time",
+        description="Name of the time dimension to stream along",
+    )
+
+    @model_validator(mode="after")
+    def check_quantize(self) -> "DataWriter":
+        if self.quantize_mode is not None and self.significant_digits is None:
+            raise ValueError("significant_digits must be provided to quantize")
+        return self
+
+    @property
+    def is_default(self) -> bool:
+        """Whether the writer does not change the default xarray netcdf writer."""
+        return (
+            self.format == "netcdf"
+            and not self.chunks
+            and not self.variable_chunks
+            and self.compression is None
+            and self.quantize_mode is None
+            and not self.parallel
+            and self.time_chunk is None
+        )
+
+    @property
+    def suffix(self) -> str:
+        """Extension of the output file."""
+        return ".zarr" if self.format == "zarr" else ".nc"
+
+    def _chunksizes(self, var: xr.DataArray, name: str) -> Optional[tuple]:
+        """Chunk sizes for variable, None if chunking is not prescribed."""
+        chunks = {**self.chunks, **self.variable_chunks.get(name, {})}
+        if not chunks or not set(var.dims) & set(chunks):
+            return None
+        return tuple(
+            min(chunks.get(dim, size), size) or 1
+            for dim, size in zip(var.dims, var.shape)
+        )
+
+    def _quantize(self, var: xr.DataArray) -> bool:
+        return self.quantize_mode is not None and var.dtype.kind == "f"
+
+    def _netcdf_encoding(self, var: xr.DataArray, name: str) -> dict:
+        encoding = {}
+        if self.compression == "zlib":
+            encoding.update(zlib=True, complevel=self.complevel, shuffle=self.shuffle)
+        elif self.compression == "zstd":
+            encoding.update(
+                compression="zstd", complevel=self.complevel, shuffle=self.shuffle
+            )
+        chunksizes = self._chunksizes(var, name)
+        if chunksizes is not None:
+            encoding["chunksizes"] = chunksizes
+        if self._quantize(var):
+            encoding.update(
+                significant_digits=self.significant_digits,
+                quantize_mode=self.quantize_mode,
+            )
+        return encoding
+
+    def _zarr_encoding(self, var: xr.DataArray, name: str) -> dict:
+        import numcodecs
+        import zarr
+
+        # zarr>=3 takes v3 codecs in the compressors and filters encoding
+        zarr3 = int(zarr.__version__.split(".")[0]) >= 3
+        encoding = {}
+        if self.compression is not None and zarr3:
+            from zarr.codecs import BloscCodec
+
+            encoding["compressors"] = BloscCodec(
+                cname=self.compression,
+                clevel=self.complevel,
+                shuffle="shuffle" if self.shuffle else "noshuffle",
+            )
+        elif self.compression is not None:
+            encoding["compressor"] = numcodecs.Blosc(
+                cname=self.compression,
+                clevel=self.complevel,
+                shuffle=numcodecs.Blosc.SHUFFLE if self.shuffle else 0,
+            )
+        chunksizes = self._chunksizes(var, name)
+        if chunksizes is not None:
+            encoding["chunks"] = chunksizes
+        if self._quantize(var):
+            if zarr3:
+                import numcodecs.zarr3 as codecs
+            else:
+                codecs = numcodecs
+            if self.quantize_mode == "BitRound":
+                codec = codecs.BitRound(keepbits=self.significant_digits)
+            else:
+                codec = codecs.Quantize(
+                    digits=self.significant_digits, dtype=var.dtype.str
+                )
+            encoding["filters"] = [codec]
+        return encoding
+
+    def encoding(self, ds: xr.Dataset) -> dict:
+        """Encoding for each variable in the dataset.
+
+        Parameters
+        ----------
+        ds : xr.Dataset
+            The dataset to write.
+
+        Returns
+        -------
+        encoding : dict
+            Mapping of variable name to encoding to pass to the xarray writer.
+
+        """
+        get_encoding = (
+            self._zarr_encoding if self.format == "zarr" else self._netcdf_encoding
+        )
+        encoding = {}
+        for name, var in ds.data_vars.items():
+            var_encoding = get_encoding(var, name)
+            if var_encoding:
+                encoding[name] = var_encoding
+        return encoding
+
+    def _prepare(self, ds: xr.Dataset) -> xr.Dataset:
+        """Chunk the dataset along the prescribed chunks so it is written lazily."""
+        ds = ds.copy(deep=False)
+        if self.chunks and (self.parallel or ds.chunks):
+            chunks = {dim: size for dim, size in self.chunks.items() if dim in ds.dims}
+            ds = ds.chunk(chunks)
+        # Avoid conflicts between the source and the prescribed encoding
+        drop = (
+            "chunksizes",
+            "chunks",
+            "compressor",
+            "compressors",
+            "filters",
+            "preferred_chunks",
+            "serializer",
+        )
+        for var in ds.variables.values():
+            var.encoding = {k: v for k, v in var.encoding.items() if k not in drop}
+        return ds
+
+    def write(self, ds: xr.Dataset, filename: str | Path) -> Path:
+        """Write the dataset.
+
+        Parameters
+        ----------
+        ds : xr.Dataset
+            The dataset to write.
+        filename : str | Path
+            The output file name.
+
+        Returns
+        -------
+        filename : Path
+            The path to the written file.
+
+        """
+        filename = Path(filename)
+        if self.is_default:
+            ds.to_netcdf(filename)
+            return filename
+        if self.time_chunk is not None and self.time_dim in ds.dims:
+            return self._stream(ds, filename)
+        ds = self._prepare(ds)
+        kwargs = dict(encoding=self.encoding(ds), compute=not self.parallel)
+        logger.debug(f"Writing {filename} with encoding {kwargs['encoding']}")
+        if self.format == "zarr":
+            delayed = ds.to_zarr(filename, mode="w", **kwargs)
+        else:
+            delayed = ds.to_netcdf(filename, **kwargs)
+        if self.parallel:
+            import dask
+
+            dask.compute(delayed, scheduler=self.scheduler)
+        return filename
+
+    def _append_netcdf(self, ds: xr.Dataset, filename: Path, start: int):
+        """Write dataset to the netcdf file from index start of the time dimension.
+
+        Variables are encoded with the encoding of the variables in the file so the
+        time units, fill values and packing are consistent across windows.
+
+        """
+        import netCDF4
+
+        with xr.open_dataset(filename) as dset:
+            encoding = {name: var.encoding for name, var in dset.variables.items()}
+        with netCDF4.Dataset(filename, "a") as nc:
+            nc.set_auto_maskandscale(False)
+            for name, var in ds.variables.items():
+                if self.time_dim not in var.dims:
+                    continue
+                var = var.copy(deep=False)
+                var.encoding = encoding.get(name, {})
+                encoded = xr.conventions.encode_cf_variable(var, name=name)
+                index = [slice(None)] * var.ndim
+                axis = var.dims.index(self.time_dim)
+                index[axis] = slice(start, start + var.shape[axis])
+                nc[name][tuple(index)] = encoded.values
+
+    def _stream(self, ds: xr.Dataset, filename: Path) -> Path:
+        """Write the dataset in windows along the time dimension."""
+        t = self.time_dim
+        time_encoding = {}
+        if t in ds.coords and ds[t].dtype.kind == "M" and "units" not in ds[t].encoding:
+            # Units inferred from the full time axis like a single write would do
+            units = xr.coding.times.infer_datetime_units(ds[t].values)
+            time_encoding = {t: dict(units=units)}
+        for start in range(0, ds.sizes[t], self.time_chunk):
+            window = ds.isel({t: slice(start, start + self.time_chunk)})
+            window = self._prepare(window).load()
+            logger.debug(f"Writing {t} window {start} to {filename}")
+            if start == 0:
+                encoding = {**self.encoding(window), **time_encoding}
+                if self.format == "zarr":
+                    window.to_zarr(filename, mode="w", encoding=encoding)
+                else:
+                    window.to_netcdf(filename, unlimited_dims=[t], encoding=encoding)
+            elif self.format == "zarr":
+                window.to_zarr(filename, append_dim=t)
+            else:
+                self._append_netcdf(window, filename, start)
+            del window
+        return filename
@@ -14,6 +14,7 @@ from rompy.core.boundary import BoundaryWaveStation, DataBoundary
 from rompy.core.data import DataBlob
 from rompy.core.time import TimeRange
 from rompy.schism.grid import SCHISMGrid
+
 # from pyschism.forcing.bctides import Bctides
 from rompy.schism.pyschism.forcing.bctides import Bctides
 from rompy.utils import total_seconds
@@ -357,6 +358,8 @@ class SCHISMDataWave(BoundaryWaveStation):
             Path to the netcdf file.
 
         """
+        import wavespectra  # noqa: F401 - registers the spec accessor
+
         logger.info(f"Fetching {self.id}")
         if self.crop_data and time is not None:
             self._filter_time(time)
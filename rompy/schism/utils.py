@@ -3,20 +3,13 @@ import re
 import sys
 from pathlib import Path
 
-import cartopy.crs as ccrs
-import cartopy.feature as cfeature
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 import xarray as xr
-from cartopy.mpl.ticker import LatitudeFormatter, LongitudeFormatter
-from matplotlib.tri import Triangulation
 from pyproj import Proj
 from scipy.interpolate import griddata
 
 logger = logging.getLogger(__name__)
-lon_formatter = LongitudeFormatter()
-lat_formatter = LatitudeFormatter()
 
 logging.basicConfig(level=logging.INFO)
 
@@ -27,6 +20,8 @@ def schism_load(schfile):
 
     Returns xarray dataset and trimesh object
     """
+    from matplotlib.tri import Triangulation
+
     schout = xr.open_dataset(schfile)
     elems = np.int32(schout.SCHISM_hgrid_face_nodes[:, :-1] - 1)
     # Ron: get lat/lon coordinates of nodes - weird it appears x,y are switched
@@ -50,7 +45,7 @@ def schism_plot(
     project=False,
     contours=[10, 30, 50],
     pscale=20,
-    cmap=plt.cm.jet,
+    cmap="jet",
 ):
     """
     plot output variable in xarray dataset (schout) using mesh information meshtri.
@@ -68,6 +63,10 @@ def schism_plot(
     Returns xarray dataset and
     We should modify this to load multiple files ... probably need assistance from DASK
     """
+    import cartopy.crs as ccrs
+    import cartopy.feature as cfeature
+    import matplotlib.pyplot as plt
+
     if "time" in list(schout.dims):
         if type(time) == int:  # input ts is index
             schout = schout.isel(time=time)
@@ -254,6 +253,8 @@ def schism_calculate_vectors(ax, schout, vtype="waves", dX="auto", mask=True):
 
 
 if __name__ == "__main__":
+    import matplotlib.pyplot as plt
+
     # load schism files
     # schfile = "../../notebooks/schism/schism_procedural/test_schism/outputs/schout_1.nc"
     # take schfile off the command line
@@ -1,4 +1,21 @@
-from .boundary import Boundnest1
-from .config import SwanConfig
-from .data import SwanDataGrid
-from .grid import SwanGrid
+import importlib
+
+
+# The exports are imported on first access so that light submodules such as the
+# xarray backend in rompy.swan.output do not load the whole SWAN component tree
+_EXPORTS = {
+    "Boundnest1": ".boundary",
+    "SwanConfig": ".config",
+    "SwanDataGrid": ".data",
+    "SwanGrid": ".grid",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,405 @@
+"""SWAN ASCII and unformatted input grid writers."""
+
+import logging
+import math
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of values formatted at once when the dataset is not chunked in time
+BLOCK_SIZE = 2**22
+
+# Number of digits of the largest scaled integer in the lookup table of fields
+TABLE_DIGITS = 6
+
+FIXED_FORMAT = re.compile(r"^%(?P<width>\d*)\.(?P<precision>\d+)f$")
+
+
+def _format_fallback(values: np.ndarray, fmt: str) -> list[bytes]:
+    """Format values one by one with python string formatting."""
+    memo = {}
+    out = []
+    for value in values.tolist():
+        # The sign distinguishes the negative zero which compares equal to zero
+        key = (value, math.copysign(1, value))
+        if key not in memo:
+            memo[key] = (fmt % value).encode("ascii")
+        out.append(memo[key])
+    return out
+
+
+def _format_digits(
+    number: np.ndarray, negative: np.ndarray, precision: int, width: int
+) -> np.ndarray:
+    """Format scaled integers as right aligned fixed point ascii fields.
+
+    Parameters
+    ----------
+    number: np.ndarray
+        Absolute values multiplied by `10**precision` and rounded to integers.
+    negative: np.ndarray
+        Whether each value has a minus sign.
+    precision: int
+        Number of decimal places.
+    width: int
+        Minimum width of the fields, padded with spaces.
+
+    Returns
+    -------
+    fields: np.ndarray
+        Ascii codes of the fields with shape (nvalues, nchar), left padded with zeros.
+
+    """
+    integer, decimal = np.divmod(number, 10**precision)
+    powers = 10 ** np.arange(1, 19, dtype="int64")
+    ndigits = np.searchsorted(powers, integer, side="right") + 1
+    nint = int(ndigits.max(initial=1))
+    nfrac = precision + 1 if precision > 0 else 0
+
+    nchar = max(1 + nint + nfrac, width)
+    fields = np.zeros((number.size, nchar), dtype="uint8")
+    fields[:, nchar - width :] = ord(" ")
+    offset = nchar - nfrac
+    for ind in range(nint):
+        digit = (integer // 10 ** (nint - ind - 1)) % 10 + ord("0")
+        column = fields[:, offset - nint + ind]
+        fields[:, offset - nint + ind] = np.where(ind >= nint - ndigits, digit, column)
+    fields[negative, offset - ndigits[negative] - 1] = ord("-")
+    if precision > 0:
+        fields[:, offset] = ord(".")
+        for ind in range(precision):
+            digit = (decimal // 10 ** (precision - ind - 1)) % 10 + ord("0")
+            fields[:, offset + 1 + ind] = digit
+    return fields
+
+
+@lru_cache(maxsize=8)
+def _fixed_table(precision: int, width: int, ndigits: int) -> np.ndarray:
+    """Fields of the scaled integers with up to ndigits, positive then negative."""
+    number = np.tile(np.arange(10**ndigits, dtype="int64"), 2)
+    negative = np.repeat([False, True], 10**ndigits)
+    return _format_digits(number, negative, precision, width)
+
+
+def _place(fields: np.ndarray, index: np.ndarray, other: np.ndarray) -> np.ndarray:
+    """Place right aligned fields of some values, widening the fields if needed."""
+    nchar = max(fields.shape[1], other.shape[1])
+    if nchar > fields.shape[1]:
+        widened = np.zeros((fields.shape[0], nchar), dtype="uint8")
+        widened[:, nchar - fields.shape[1] :] = fields
+        fields = widened
+    fields[index] = 0
+    fields[index, nchar - other.shape[1] :] = other
+    return fields
+
+
+def _format_fixed(values: np.ndarray, fmt: str) -> np.ndarray:
+    """Format values as right aligned fixed point ascii fields.
+
+    Values are rounded from their scaled representation in float64 which gives the
+    same result as C formatting unless the scaled value is within rounding error of
+    half an integer. Those values, infinite and very large values are formatted with
+    python string formatting instead. The fields of the scaled integers with up to
+    `TABLE_DIGITS` digits are looked up from a table.
+
+    Parameters
+    ----------
+    values: np.ndarray
+        One dimensional array of values to format.
+    fmt: str
+        Fixed point format string such as `%4.2f`.
+
+    Returns
+    -------
+    fields: np.ndarray
+        Ascii codes of the fields with shape (nvalues, nchar), left padded with zeros.
+
+    """
+    match = FIXED_FORMAT.match(fmt)
+    width, precision = int(match["width"] or 0), int(match["precision"])
+    with np.errstate(invalid="ignore", over="ignore"):
+        scaled = values.astype("float64") * 10.0**precision
+        number = np.rint(scaled)
+        exact = np.abs(number) < 2**52
+        # Only values close to half an integer need checking for rounding errors
+        near = np.flatnonzero(np.abs(scaled - number) > 0.49)
+        error = np.abs(np.abs(scaled[near] - number[near]) - 0.5)
+        exact[near[error <= np.abs(np.spacing(scaled[near]))]] = False
+    negative = np.signbit(scaled)
+    number = np.abs(number, out=number)
+    number[~exact] = 0
+    number = number.astype("int64")
+
+    # Look up the fields of the integers that fit in the table
+    ndigits = min(len(str(number.max(initial=0))), TABLE_DIGITS)
+    table = _fixed_table(precision, width, ndigits)
+    index = number + (negative & exact) * 10**ndigits
+    large = np.flatnonzero(number >= 10**ndigits)
+    index[large] = 0
+    nchar = table.shape[1]
+    fields = table.view(f"V{nchar}")[index, 0].view("uint8").reshape(-1, nchar)
+    if large.size > 0:
+        other = _format_digits(number[large], negative[large], precision, width)
+        fields = _place(fields, large, other)
+
+    # Values that cannot be formatted exactly from the scaled integers
+    isnan = np.isnan(scaled)
+    missing = np.flatnonzero(isnan)
+    if missing.size > 0:
+        nan = np.frombuffer((fmt % np.nan).encode("ascii"), dtype="uint8")
+        fields = _place(fields, missing, nan[None, :])
+    fallback = np.flatnonzero(~exact & ~isnan)
+    for ind, other in zip(fallback, _format_fallback(values[fallback], fmt)):
+        other = np.frombuffer(other, dtype="uint8")
+        fields = _place(fields, [ind], other[None, :])
+    return fields
+
+
+def format_blocks(arr: np.ndarray, fmt: str, delimiter: str = " ") -> list[bytes]:
+    """Format blocks of an array in the same way as `numpy.savetxt`.
+
+    Parameters
+    ----------
+    arr: np.ndarray
+        Array to format with the blocks along the first dimension. The last dimension
+        defines the columns of each row, blocks with one dimension are written as a
+        single column as in `numpy.savetxt`.
+    fmt: str
+        String float formatter.
+    delimiter: str
+        String separating columns.
+
+    Returns
+    -------
+    blocks: list[bytes]
+        The formatted text of each block.
+
+    """
+    arr = np.asarray(arr)
+    if arr.ndim == 2:
+        arr = arr[..., None]
+    nblock, ncol = arr.shape[0], arr.shape[-1]
+    if arr.size == 0:
+        return [b""] * nblock
+    values = arr.reshape(-1)
+    if FIXED_FORMAT.match(fmt) is None:
+        fields = _format_fallback(values, fmt)
+        lines = [
+            delimiter.encode("ascii").join(fields[ind : ind + ncol]) + b"\n"
+            for ind in range(0, len(fields), ncol)
+        ]
+        nline = len(lines) // nblock
+        return [
+            b"".join(lines[ind : ind + nline]) for ind in range(0, len(lines), nline)
+        ]
+
+    # Fields followed by the delimiter or by a newline for the last column, the zero
+    # padding is dropped when joining the fields
+    fields = _format_fixed(values, fmt)
+    nchar = fields.shape[1]
+    sep = np.frombuffer(delimiter.encode("ascii"), dtype="uint8")
+    buffer = np.zeros((values.size // ncol, ncol, nchar + max(sep.size, 1)), "uint8")
+    buffer[..., :nchar] = fields.reshape(-1, ncol, nchar)
+    buffer[:, :-1, nchar : nchar + sep.size] = sep
+    buffer[:, -1, nchar] = ord("\n")
+    buffer = buffer.reshape(nblock, -1)
+    keep = buffer != 0
+    offsets = np.concatenate([[0], np.cumsum(keep.sum(axis=1))])
+    text = buffer[keep].tobytes()
+    return [text[i0:i1] for i0, i1 in zip(offsets[:-1], offsets[1:])]
+
+
+def _mask(arr: np.ndarray, fill_value: Optional[float], vmin: Optional[float]):
+    """Mask values not above vmin and replace missing values by the fill value."""
+    if vmin is not None:
+        with np.errstate(invalid="ignore"):
+            arr = np.where(arr > vmin, arr, np.nan)
+    if fill_value is not None:
+        arr = np.where(np.isnan(arr), fill_value, arr)
+    return arr
+
+
+def _format_block(
+    arrays: list[np.ndarray],
+    headers: list[Optional[str]],
+    fmt: str,
+    delimiter: str,
+    fill_value: Optional[float],
+    vmin: Optional[float],
+) -> bytes:
+    """Format one block of times of all variables.
+
+    Parameters
+    ----------
+    arrays: list[np.ndarray]
+        Data of each variable with time as the first dimension.
+    headers: list[Optional[str]]
+        Header line to write before each time, None to skip.
+
+    """
+    blocks = []
+    for arr in arrays:
+        arr = _mask(arr, fill_value, vmin)
+        blocks.append(format_blocks(arr, fmt=fmt, delimiter=delimiter))
+    parts = []
+    for ind, header in enumerate(headers):
+        if header is not None:
+            parts.append(f"{header}\n".encode("ascii"))
+        parts.extend(block[ind] for block in blocks)
+    return b"".join(parts)
+
+
+def _unformatted_block(
+    arrays: list[np.ndarray],
+    headers: list[Optional[str]],
+    fill_value: Optional[float],
+    vmin: Optional[float],
+) -> bytes:
+    """Fortran unformatted sequential records of one block of times of all variables.
+
+    Each row of the variables is written as one record of 4-byte reals preceded and
+    followed by the record length in bytes, the order SWAN reads with `idla=3`. The
+    headers are not written.
+
+    """
+    data = [_mask(arr, fill_value, vmin) for arr in arrays]
+    data = np.stack([arr.reshape(arr.shape[0], -1, arr.shape[-1]) for arr in data], 1)
+    nrecord = data.shape[-1] * 4
+    dtype = np.dtype([("head", "i4"), ("data", "f4", data.shape[-1]), ("tail", "i4")])
+    records = np.empty(data.shape[:-1], dtype=dtype)
+    records["head"] = nrecord
+    records["data"] = data
+    records["tail"] = nrecord
+    return records.tobytes()
+
+
+def write_swan_grid(
+    dset: xr.Dataset,
+    output_file: str | Path,
+    variables: list[str],
+    fmt: str = "%4.2f",
+    delimiter: str = "\t",
+    fill_value: Optional[float] = None,
+    vmin: Optional[float] = None,
+    time_dim: str = "time",
+    time_header: bool = False,
+    squeeze: bool = False,
+    ntime: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    unformatted: bool = False,
+) -> list[str]:
+    """Write variables of a dataset as a SWAN input grid.
+
+    The ASCII output is identical to writing each time and variable in turn with
+    `numpy.savetxt` but whole blocks of times are formatted at once. The blocks can
+    be formatted in parallel worker processes, they are written in order.
+
+    Unformatted files are written as Fortran unformatted sequential records of 4-byte
+    reals with one record for each row, to be read by SWAN with `idla=3` and no
+    header lines.
+
+    Parameters
+    ----------
+    dset: xr.Dataset
+        Dataset to write in SWAN ASCII format.
+    output_file: str | Path
+        Local file name for the ascii output file.
+    variables: list[str]
+        Variables to write, all variables of each time are written in turn.
+    fmt: str
+        String float formatter.
+    delimiter: str
+        String separating columns.
+    fill_value: float, optional
+        Value to write in place of missing values, by default nan is written.
+    vmin: float, optional
+        Minimum value, values not above vmin are treated as missing.
+    time_dim: str
+        Name of the time dimension if available in the dataset.
+    time_header: bool
+        Write a line with the time in the SWAN `%Y%m%d.%H%M%S` format before the data
+        of each time.
+    squeeze: bool
+        Remove dimensions of length one from the data of each time.
+    ntime: int, optional
+        Number of times in each block, by default the time chunks of dask datasets
+        or as many times as fit in `BLOCK_SIZE` values.
+    max_workers: int, optional
+        Number of worker processes to format blocks, by default blocks are formatted
+        in the current process.
+    unformatted: bool
+        Write a Fortran unformatted binary file instead of ASCII, `fmt`, `delimiter`,
+        `time_header` and `squeeze` are ignored.
+
+    Returns
+    -------
+    times: list[str]
+        The times written in the SWAN format, empty if there is no time coordinate.
+
+    """
+    if time_dim not in dset.dims:
+        dset = dset.expand_dims(time_dim, 0)
+    data = [dset[var].transpose(time_dim, ...) for var in variables]
+    if squeeze and not unformatted:
+        data = [
+            darr.squeeze([d for d in darr.dims[1:] if darr[d].size == 1])
+            for darr in data
+        ]
+
+    if time_dim in dset.coords:
+        times = pd.to_datetime(dset[time_dim].values).strftime("%Y%m%d.%H%M%S")
+        times = times.tolist()
+    else:
+        times = []
+    if time_header and times and not unformatted:
+        headers = times
+    else:
+        headers = [None] * dset[time_dim].size
+
+    size = dset[time_dim].size
+    if ntime is None and data[0].chunks is not None:
+        ntime = max(data[0].chunks[0])
+    if ntime is None:
+        ntime = BLOCK_SIZE // max(sum(darr[0].size for darr in data), 1)
+    ntime = min(max(ntime, 1), max(size, 1))
+
+    def blocks():
+        for i0 in range(0, size, ntime):
+            arrays = [darr[i0 : i0 + ntime].values for darr in data]
+            yield arrays, headers[i0 : i0 + ntime]
+
+    if unformatted:
+        logger.debug(f"Writing SWAN unformatted file: {output_file}")
+        formatter = partial(_unformatted_block, fill_value=fill_value, vmin=vmin)
+    else:
+        logger.debug(f"Writing SWAN ASCII file: {output_file}")
+        formatter = partial(
+            _format_block,
+            fmt=fmt,
+            delimiter=delimiter,
+            fill_value=fill_value,
+            vmin=vmin,
+        )
+    with open(output_file, "wb") as stream:
+        if max_workers is None:
+            for arrays, heads in blocks():
+                stream.write(formatter(arrays, heads))
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                pending = []
+                for arrays, heads in blocks():
+                    pending.append(executor.submit(formatter, arrays, heads))
+                    if len(pending) > 2 * max_workers:
+                        stream.write(pending.pop(0).result())
+                for future in pending:
+                    stream.write(future.result())
+    return times
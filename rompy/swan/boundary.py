@@ -1,17 +1,20 @@
 """SWAN boundary classes."""
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from io import StringIO
 from pathlib import Path
 from typing import Literal, Optional, Union, Annotated
 import xarray as xr
 import pandas as pd
 import numpy as np
-from shapely.geometry import LineString
 from abc import ABC
 from pydantic import Field, field_validator
 
 from rompy.core.time import TimeRange
 from rompy.core.boundary import BoundaryWaveStation
+from rompy.core.grid import interpolate_line
 from rompy.swan.grid import SwanGrid
 from rompy.swan.components.boundary import BOUNDSPEC
 from rompy.swan.subcomponents.base import BaseSubComponent, XY, IJ
@@ -52,6 +55,150 @@ def write_tpar(df: pd.DataFrame, filename: str | Path):
         )
 
 
+@lru_cache(maxsize=1)
+def _swan_integers() -> np.ndarray:
+    """Ascii codes of the integers -9999 to 9999 formatted as `%5.0f`.
+
+    The last row holds the negative zero which `%5.0f` formats as `   -0`.
+
+    """
+    values = [f"{value:5.0f}" for value in range(-9999, 10000)] + [f"{-0.0:5.0f}"]
+    return np.frombuffer("".join(values).encode("ascii"), dtype="uint8").reshape(-1, 5)
+
+
+def _format_swan_spectra(arr: np.ndarray) -> list[str]:
+    """Format spectra as the blocks of a SWAN ASCII spectral file.
+
+    The spectra are scaled and rounded for all sites at once and formatted by looking
+    up the ascii codes of the integers, reproducing the `%5.0f` formatting used by
+    wavespectra. Any spectrum with values outside the range of the lookup table falls
+    back to `numpy.savetxt`.
+
+    Parameters
+    ----------
+    arr: np.ndarray
+        Spectra to format with shape (site, freq, dir).
+
+    Returns
+    -------
+    blocks: list[str]
+        The formatted block of each site.
+
+    """
+    fac = arr.max(axis=(1, 2)) / 9998.0
+    valid = fac > 0
+    with np.errstate(invalid="ignore", divide="ignore"):
+        scaled = np.rint(arr / np.where(valid, fac, 1)[:, None, None])
+    inrange = valid & (np.abs(np.where(valid[:, None, None], scaled, 0)) <= 9999).all(
+        axis=(1, 2)
+    )
+
+    # Index of each integer in the lookup table, negative zeros go in the last row
+    index = scaled[inrange] + 9999
+    index[(scaled[inrange] == 0) & np.signbit(scaled[inrange])] = 19999
+    codes = _swan_integers()[index.astype("int32")]
+    nspec, nfreq, ndir = index.shape
+    lines = np.full((nspec, nfreq, ndir * 5 + 1), ord("\n"), dtype="uint8")
+    lines[..., :-1] = codes.reshape(nspec, nfreq, ndir * 5)
+    tables = iter(lines)
+
+    blocks = []
+    for isite, spec in enumerate(arr):
+        if np.isnan(fac[isite]):
+            blocks.append("NODATA\n")
+        elif fac[isite] <= 0:
+            blocks.append("ZERO\n")
+        elif inrange[isite]:
+            table = next(tables).tobytes().decode("ascii")
+            blocks.append(f"FACTOR\n{'':4}{fac[isite]:0.8E}\n{table}")
+        else:
+            buffer = StringIO()
+            np.savetxt(buffer, spec / fac[isite], fmt="%5.0f", delimiter="")
+            blocks.append(f"FACTOR\n{'':4}{fac[isite]:0.8E}\n{buffer.getvalue()}")
+    return blocks
+
+
+def write_swan_spectra(
+    dset: xr.Dataset,
+    filename: str | Path,
+    ntime: Optional[int] = None,
+    id: str = "Created by wavespectra",
+    compresslevel: int = 6,
+):
+    """Write spectra in SWAN ASCII format.
+
+    The output is identical to the `to_swan` method of wavespectra but the spectra are
+    only loaded one block of times at a time so lazy datasets larger than memory can be
+    written, and the spectra of each block are formatted all at once.
+
+    Parameters
+    ----------
+    dset : xr.Dataset
+        Wavespectra dataset with the spectra to write.
+    filename : str | Path
+        Filename to write to, the file is gzipped if it ends with `.gz`.
+    ntime : int, optional
+        Number of times to load and write at once, by default the size of the time
+        chunks of lazy datasets or all times otherwise.
+    id : str
+        Used for header in output file.
+    compresslevel : int
+        Compression level for gzipped files (1-9).
+
+    """
+    from wavespectra.core.swan import SwanSpecFile
+
+    unsupported = set(dset.efth.dims) - {"time", "site", "lon", "lat", "freq", "dir"}
+    if unsupported:
+        raise NotImplementedError(f"Dimensions {unsupported} are not supported")
+
+    # Ensure there is a site dimension with lon/lat variables to iterate over
+    if {"lon", "lat"}.issubset(dset.dims):
+        dset = dset.stack(site=("lat", "lon"), create_index=False)
+    elif "site" not in dset.dims:
+        dset = dset.expand_dims("site")
+    for name in ["lon", "lat"]:
+        if name in dset.coords:
+            dset = dset.reset_coords(name)
+        if name not in dset.data_vars:
+            dset[name] = (("site",), np.zeros(dset.site.size))
+        elif "site" not in dset[name].dims:
+            dset[name] = dset[name].expand_dims("site")
+
+    is_time = "time" in dset.efth.dims
+    if is_time:
+        efth = dset.efth.transpose("time", "site", "freq", "dir")
+        times = [f"{t:%Y%m%d.%H%M%S}" for t in efth.time.to_index().to_pydatetime()]
+    else:
+        efth = dset.efth.transpose("site", "freq", "dir").expand_dims("time")
+        times = [None]
+    if ntime is None and efth.chunks is not None:
+        ntime = max(efth.chunks[0])
+    ntime = min(ntime or len(times), len(times))
+
+    sfile = SwanSpecFile(
+        filename,
+        freqs=dset.freq,
+        dirs=dset.dir,
+        time=is_time,
+        x=dset.lon.values,
+        y=dset.lat.values,
+        id=id,
+        compresslevel=compresslevel,
+    )
+    try:
+        for i0 in range(0, len(times), ntime):
+            arr = efth.isel(time=slice(i0, i0 + ntime)).values
+            blocks = []
+            for time, spectra in zip(times[i0 : i0 + ntime], arr):
+                if time is not None:
+                    blocks.append(f"{time:40}date and time\n")
+                blocks.extend(_format_swan_spectra(spectra))
+            sfile.fid.write("".join(blocks))
+    finally:
+        sfile.close()
+
+
 class Boundnest1(BoundaryWaveStation):
     """SWAN BOUNDNEST1 NEST data class."""
 
@@ -101,7 +248,7 @@ class Boundnest1(BoundaryWaveStation):
             ds["lat"].values = ybnd
 
         filename = Path(destdir) / f"{self.id}.bnd"
-        ds.spec.to_swan(filename)
+        write_swan_spectra(ds, filename, ntime=self.time_chunk)
         cmd = f"BOUNDNEST1 NEST '{filename.name}' {self.rectangle.upper()}"
         return filename, cmd
 
@@ -122,7 +269,11 @@ class BoundspecBase(BoundaryWaveStation, ABC):
     file_type: Literal["tpar", "spec2d"] = Field(
         default="tpar", description="The type of file to write"
     )
-    _ds: None
+    max_workers: int = Field(
+        default=4,
+        description="Maximum number of threads to write the boundary files",
+        ge=1,
+    )
 
     @field_validator("sel_method_kwargs")
     @classmethod
@@ -156,10 +307,39 @@ class BoundspecBase(BoundaryWaveStation, ABC):
         elif self.shapespec.dspr_type == "power":
             raise NotImplementedError("Power of cos not supported yet")
 
-    @property
-    def tpar(self) -> pd.DataFrame:
-        """TPAR dataframe for the _ds attr."""
-        return self._ds.spec.stats(["hs", self.per, "dpm", self.dspr]).to_pandas()
+    def _write_files(self, ds: xr.Dataset, filenames: list[Path]):
+        """Write the boundary file of each site in the dataset.
+
+        The integrated parameters for the tpar files are calculated for all sites at
+        once and the files are written concurrently. The spectra of lazy datasets are
+        passed on per site so the spec2d files are written one block of times at a
+        time.
+
+        Parameters
+        ----------
+        ds: xr.Dataset
+            The spectra dataset with one site for each filename.
+        filenames: list[Path]
+            The boundary files to write.
+
+        """
+        import wavespectra  # noqa: F401 - registers the spec accessor
+
+        if self.file_type == "tpar":
+            stats = ds.spec.stats(["hs", self.per, "dpm", self.dspr]).load()
+
+            def write(ind):
+                df = stats.isel(site=ind, drop=True).to_pandas()
+                write_tpar(df, filenames[ind])
+
+        elif self.file_type == "spec2d":
+
+            def write(ind):
+                dsite = ds.isel(site=ind, drop=True)
+                write_swan_spectra(dsite, filenames[ind], ntime=self.time_chunk)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            list(executor.map(write, range(len(filenames))))
 
     def _interpolate_side(self, xbnd, ybnd, spacing) -> tuple:
         """Interpolate points along side at user-defined spacing.
@@ -186,13 +366,11 @@ class BoundspecBase(BoundaryWaveStation, ABC):
         exceeded.
 
         """
-        line = LineString(zip(xbnd, ybnd))
-        if line.length < spacing:
-            raise ValueError(f"Spacing = {spacing} > side length = {line.length}")
-        npts = int(np.ceil(line.length / spacing))
-        points = [line.interpolate(i * spacing) for i in range(npts + 1)]
-        xi = np.array([point.x for point in points])
-        yi = np.array([point.y for point in points])
+        length = np.hypot(np.diff(xbnd), np.diff(ybnd)).sum()
+        if length < spacing:
+            raise ValueError(f"Spacing = {spacing} > side length = {length}")
+        npts = int(np.ceil(length / spacing))
+        xi, yi = interpolate_line(xbnd, ybnd, np.arange(npts + 1) * spacing)
         # Ensure last point does not go beyond the line length
         xi[-1] = xbnd[-1]
         yi[-1] = ybnd[-1]
@@ -288,18 +466,14 @@ class BoundspecSide(BoundspecBase):
         filenames = []
         # Code below allows for multiple sides but only one side is currently supported
         for ind in range(ds.lon.size):
-            self._ds = ds.isel(site=ind, drop=True)
             filename = (
                 Path(destdir)
                 / f"{self.id}_{self.file_type}_{self.location.side}_{ind:03d}.bnd"
             )
-            if self.file_type == "tpar":
-                write_tpar(self.tpar, filename)
-            elif self.file_type == "spec2d":
-                self._ds.spec.to_swan(filename)
             comp = CONSTANTFILE(fname=filename.name, seq=1)
             cmds.append(f"BOUNDSPEC {self.location.render()}{comp.render()}")
             filenames.append(filename)
+        self._write_files(ds, filenames)
         return filename, "\n".join(cmds)
 
 
@@ -385,20 +559,24 @@ class BoundspecSegmentXY(BoundspecBase):
             ds["lon"].values = xbnd
             ds["lat"].values = ybnd
 
+        # Spectra at the segment midpoints averaged from the adjacent sites
+        # TODO: Ensure points in segment are different
+        site = np.arange(ds.site.size - 1)
+        pairs = [
+            ds.isel(site=slice(None, -1)).assign_coords(site=site),
+            ds.isel(site=slice(1, None)).assign_coords(site=site),
+        ]
+        dsmid = xr.concat(pairs, dim="pair").mean("pair")
+
         cmds = []
         filenames = []
-        for ind in range(ds.lon.size - 1):
-            ds_seg = ds.isel(site=slice(ind, ind + 2))
-            # TODO: Ensure points in segment are different
-            self._ds = ds_seg.mean("site")
+        lon, lat = ds.lon.values, ds.lat.values
+        for ind in site:
             filename = Path(destdir) / f"{self.id}_{self.file_type}_{ind:03d}.bnd"
-            if self.file_type == "tpar":
-                write_tpar(self.tpar, filename)
-            elif self.file_type == "spec2d":
-                self._ds.spec.to_swan(filename)
             file = CONSTANTFILE(fname=filename.name, seq=1)
-            location = SEGMENT(points=XY(x=ds_seg.lon.values, y=ds_seg.lat.values))
+            location = SEGMENT(points=XY(x=lon[ind : ind + 2], y=lat[ind : ind + 2]))
             location = location.render().replace("\n", " ").replace("  ", " ")
             cmds.append(f"BOUNDSPEC {location}{file.render()}")
             filenames.append(filename)
+        self._write_files(dsmid, filenames)
         return filenames, "\n".join(cmds)
@@ -2,9 +2,11 @@ import logging
 from pathlib import Path
 from typing import Annotated, Literal, Optional, Union
 
+import numpy as np
 from pydantic import Field, model_validator
 
 from rompy.core import BaseConfig
+from rompy.core.grid import RegularGrid
 
 from rompy.swan.interface import (
     DataInterface,
@@ -15,7 +17,7 @@ from rompy.swan.interface import (
 
 from rompy.swan.legacy import ForcingData, SwanSpectrum, SwanPhysics, Outputs
 
-from rompy.swan.components import boundary, cgrid, numerics
+from rompy.swan.components import boundary, cgrid, inpgrid, numerics, output
 from rompy.swan.components.group import STARTUP, INPGRIDS, PHYSICS, OUTPUT, LOCKUP
 
 from rompy.swan.grid import SwanGrid
@@ -157,7 +159,38 @@ class SwanConfigComponents(BaseConfig):
 
     @model_validator(mode="after")
     def cgrid_contain_inpgrids(self) -> "SwanConfigComponents":
-        """Ensure all inpgrids are inside the cgrid area."""
+        """Ensure the regular inpgrids overlap the cgrid area.
+
+        An error is raised if an input grid does not overlap the computational grid
+        and a warning is issued if it does not cover the entire computational grid.
+
+        """
+        if not isinstance(self.cgrid, cgrid.REGULAR):
+            return self
+        if not isinstance(self.inpgrid, INPGRIDS):
+            return self
+        grid = self.grid
+        for component in self.inpgrid.inpgrids:
+            if not isinstance(component, inpgrid.REGULAR):
+                continue
+            input_grid = RegularGrid(
+                x0=component.xpinp,
+                y0=component.ypinp,
+                rot=component.alpinp or 0.0,
+                dx=component.dxinp,
+                dy=component.dyinp,
+                nx=component.mxinp + 1,
+                ny=component.myinp + 1,
+            )
+            name = getattr(component.grid_type, "value", component.grid_type)
+            if not grid.boundary().intersects(input_grid.boundary()):
+                raise ValueError(
+                    f"Input grid {name} does not overlap the computational grid"
+                )
+            if not input_grid.covers(grid.boundary()):
+                logger.warning(
+                    f"Input grid {name} does not cover the entire computational grid"
+                )
         return self
 
     @model_validator(mode="after")
@@ -182,6 +215,51 @@ class SwanConfigComponents(BaseConfig):
     @model_validator(mode="after")
     def group_within_cgrid(self) -> "SwanConfigComponents":
         """Ensure group indices are contained in computational grid."""
+        if self.output is None or self.output.group is None:
+            return self
+        group = self.output.group
+        if isinstance(self.cgrid, cgrid.REGULAR):
+            mxc, myc = self.cgrid.grid.mx, self.cgrid.grid.my
+        elif isinstance(self.cgrid, cgrid.CURVILINEAR):
+            mxc, myc = self.cgrid.mxc, self.cgrid.myc
+        else:
+            raise ValueError("GROUP locations not supported in unstructured grids")
+        if group.ix1 > group.ix2 or group.iy1 > group.iy2:
+            raise ValueError(
+                f"GROUP indices must satisfy ix1 <= ix2 and iy1 <= iy2, got {group}"
+            )
+        if group.ix2 > mxc or group.iy2 > myc:
+            raise ValueError(
+                f"GROUP indices ix2={group.ix2}, iy2={group.iy2} outside the "
+                f"computational grid with mxc={mxc}, myc={myc}"
+            )
+        return self
+
+    @model_validator(mode="after")
+    def locations_within_cgrid(self) -> "SwanConfigComponents":
+        """Warn if output points or curves are outside the computational grid."""
+        if self.output is None or not isinstance(self.cgrid, cgrid.REGULAR):
+            return self
+        locations = []
+        points = self.output.points
+        if isinstance(points, output.POINTS):
+            locations.append((points.sname, points.xp, points.yp))
+        elif isinstance(points, output.POINTS_FILE) and Path(points.fname).is_file():
+            xy = np.loadtxt(points.fname, usecols=(0, 1), ndmin=2)
+            locations.append((points.sname, xy[:, 0], xy[:, 1]))
+        if self.output.curve is not None:
+            for curve in self.output.curve.curves:
+                x = [curve.xp1] + curve.xp
+                y = [curve.yp1] + curve.yp
+                locations.append((curve.sname, x, y))
+        grid = self.grid
+        for sname, x, y in locations:
+            outside = np.flatnonzero(~grid.contains_points(x, y))
+            if outside.size:
+                logger.warning(
+                    f"{outside.size} of {len(x)} output locations in '{sname}' are "
+                    f"outside the computational grid, indices: {outside[:10]}"
+                )
         return self
 
     @model_validator(mode="after")
@@ -1,7 +1,8 @@
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Union
+from typing import Literal, Optional, Union
 
 import numpy as np
 import pandas as pd
@@ -11,7 +12,9 @@ from pydantic import field_validator, Field, model_validator
 from rompy.core import DataGrid
 from rompy.core.time import TimeRange
 
+from rompy.swan.ascii import write_swan_grid
 from rompy.swan.grid import SwanGrid
+from rompy.swan.subcomponents.readgrid import READINP
 from rompy.swan.types import GridOptions
 
 
@@ -46,6 +49,14 @@ class SwanDataGrid(DataGrid):
         ),
         default=1.0,
     )
+    format: Literal["free", "unformatted"] = Field(
+        default="free",
+        description=(
+            "Format of the input grid file, 'free' writes an ASCII file read with the "
+            "FREE format and 'unformatted' writes a Fortran unformatted binary file "
+            "which is smaller and faster to write and read"
+        ),
+    )
 
     @model_validator(mode="after")
     def ensure_z1_in_data_vars(self) -> "SwanDataGrid":
@@ -93,7 +104,12 @@ class SwanDataGrid(DataGrid):
             if time is not None:
                 self._filter_time(time)
 
-        output_file = os.path.join(destdir, f"{self.var.value}.grd")
+        meta = self._restore(destdir, grid)
+        if meta is not None:
+            return meta["cmd"]
+
+        suffix = "bin" if self.format == "unformatted" else "grd"
+        output_file = os.path.join(destdir, f"{self.var.value}.{suffix}")
         logger.info(f"\tWriting {self.var.value} to {output_file}")
         if self.var.value == "bottom":
             inpgrid, readgrid = self.ds.swan.to_bottom_grid(
@@ -105,6 +121,7 @@ class SwanDataGrid(DataGrid):
                 fac=self.fac,
                 rot=0.0,
                 vmin=float("-inf"),
+                format=self.format,
             )
         else:
             inpgrid, readgrid = self.ds.swan.to_inpgrid(
@@ -116,8 +133,11 @@ class SwanDataGrid(DataGrid):
                 fac=self.fac,
                 rot=0.0,
                 var=self.var.name,
+                format=self.format,
             )
-        return f"{inpgrid}\n{readgrid}\n"
+        cmd = f"{inpgrid}\n{readgrid}\n"
+        self._store([output_file], grid, cmd=cmd)
+        return cmd
 
     def __str__(self):
         return f"SWANDataGrid {self.var.name}"
@@ -130,6 +150,9 @@ def dset_to_swan(
     fmt: str = "%4.2f",
     fill_value: float = FILL_VALUE,
     time_dim="time",
+    vmin: Optional[float] = None,
+    max_workers: Optional[int] = None,
+    unformatted: bool = False,
 ):
     """Convert xarray Dataset into SWAN ASCII file.
 
@@ -147,6 +170,13 @@ def dset_to_swan(
         Fill value.
     time_dim: str
         Name of the time dimension if available in the dataset.
+    vmin: float, optional
+        Minimum value, values not above vmin are replaced by the fill value.
+    max_workers: int, optional
+        Number of worker processes to format blocks of times, by default blocks are
+        formatted in the current process.
+    unformatted: bool
+        Write a Fortran unformatted binary file instead of ASCII.
 
     """
     # Input checking
@@ -159,25 +189,34 @@ def dset_to_swan(
                 f"dset.{data_var} has {dset[data_var].ndim} dims"
             )
 
-    # Ensure time is a dimension so iteration will work
-    if time_dim not in dset.dims:
-        dset = dset.expand_dims(time_dim, 0)
-
     # Write to ascii
-    logger.debug(f"Writing SWAN ASCII file: {output_file}")
-    with open(output_file, "w") as stream:
-        for time in dset[time_dim]:
-            logger.debug(
-                f"Appending Time {pd.to_datetime(time.values)} to {output_file}"
-            )
-            for data_var in variables:
-                logger.debug(f"Appending Variable {data_var} to {output_file}")
-                data = dset[data_var].sel(time=time).fillna(fill_value).values
-                np.savetxt(fname=stream, X=data, fmt=fmt, delimiter="\t")
-
+    write_swan_grid(
+        dset=dset,
+        output_file=output_file,
+        variables=variables,
+        fmt=fmt,
+        delimiter="\t",
+        fill_value=fill_value,
+        vmin=vmin,
+        time_dim=time_dim,
+        max_workers=max_workers,
+        unformatted=unformatted,
+    )
     return output_file
 
 
+def _readinp_unformatted(var: str, fac: float, output_file: str | Path) -> str:
+    """READINP command for an unformatted input grid written by `write_swan_grid`."""
+    readinp = READINP(
+        grid_type=var.lower(),
+        fac=fac,
+        fname1=Path(output_file).name,
+        idla=3,
+        format="unformatted",
+    )
+    return readinp.render()
+
+
 @xr.register_dataset_accessor("swan")
 class Swan_accessor(object):
     def __init__(self, xarray_obj):
@@ -232,6 +271,8 @@ class Swan_accessor(object):
         rot=0.0,
         vmin=float("-inf"),
         fill_value=FILL_VALUE,
+        max_workers=None,
+        format="free",
     ):
         """Write SWAN inpgrid BOTTOM file.
 
@@ -255,6 +296,10 @@ class Swan_accessor(object):
             Fill value.
         fac: float
             Multiplying factor in case data are not in m or should be reversed.
+        max_workers: int, optional
+            Number of worker processes to format blocks of times.
+        format: str
+            File format, 'free' for ASCII or 'unformatted' for Fortran binary.
 
         Returns
         -------
@@ -267,15 +312,21 @@ class Swan_accessor(object):
 
         """
         dset_to_swan(
-            dset=self._obj.where(self._obj > vmin).transpose(..., y, x),
+            dset=self._obj[[z]].transpose(..., y, x),
             output_file=output_file,
             fmt=fmt,
             variables=[z],
             fill_value=fill_value,
+            vmin=vmin,
+            max_workers=max_workers,
+            unformatted=format == "unformatted",
         )
         grid = self.grid(x=x, y=y, rot=rot)
         inpgrid = f"INPGRID BOTTOM {grid.inpgrid}"
-        readinp = f"READINP BOTTOM {fac} '{Path(output_file).name}' 3 FREE"
+        if format == "unformatted":
+            readinp = _readinp_unformatted("bottom", fac, output_file)
+        else:
+            readinp = f"READINP BOTTOM {fac} '{Path(output_file).name}' 3 FREE"
         return inpgrid, readinp
 
     def to_inpgrid(
@@ -290,6 +341,8 @@ class Swan_accessor(object):
         fac: float = 1.0,
         rot: float = 0.0,
         time: str = "time",
+        max_workers: Optional[int] = None,
+        format: Literal["free", "unformatted"] = "free",
     ):
         """This function writes to a SWAN inpgrid format file (i.e. WIND)
 
@@ -315,6 +368,10 @@ class Swan_accessor(object):
             Rotation angle, required if the grid has been previously rotated.
         time: str
             Name of the time variable in the dataset
+        max_workers: int, optional
+            Number of worker processes to format blocks of times.
+        format: str
+            File format, 'free' for ASCII or 'unformatted' for Fortran binary.
 
         Returns
         -------
@@ -329,37 +386,31 @@ class Swan_accessor(object):
         # ds = ds.transpose((time,) + ds[x].dims)
         dt = np.diff(ds[time].values).mean() / pd.to_timedelta(1, "h")
 
-        inptimes = []
-        with open(output_file, "wt") as f:
-            # iterate through time
-            for ti, windtime in enumerate(ds[time].values):
-                time_str = pd.to_datetime(windtime).strftime("%Y%m%d.%H%M%S")
-                logger.debug(time_str)
-
-                # write SWAN time header to file:
-                f.write(f"{time_str}\n")
-
-                # Write first component to file
-                z1t = np.squeeze(ds[z1].isel(dict(time=ti)).values)
-                np.savetxt(f, z1t, fmt=fmt)
-
-                if z2 is not None:
-                    z2t = np.squeeze(ds[z2].isel(dict(time=ti)).values)
-                    np.savetxt(f, z2t, fmt=fmt)
-
-                inptimes.append(time_str)
-
-        if len(inptimes) < 1:
-            os.remove(output_file)
+        if ds[time].size < 1:
             raise ValueError(
                 f"***Error! No times written to {output_file}\n. Check the input data!"
             )
+        inptimes = write_swan_grid(
+            dset=ds,
+            output_file=output_file,
+            variables=[z1] if z2 is None else [z1, z2],
+            fmt=fmt,
+            delimiter=" ",
+            time_dim=time,
+            time_header=True,
+            squeeze=True,
+            max_workers=max_workers,
+            unformatted=format == "unformatted",
+        )
 
         # Create grid object from this dataset
         grid = self.grid(x=x, y=y, rot=rot)
 
         inpgrid = f"INPGRID {var} {grid.inpgrid} NONSTATION {inptimes[0]} {dt} HR"
-        readinp = f"READINP {var} {fac} '{Path(output_file).name}' 3 0 1 0 FREE"
+        if format == "unformatted":
+            readinp = _readinp_unformatted(var, fac, output_file)
+        else:
+            readinp = f"READINP {var} {fac} '{Path(output_file).name}' 3 0 1 0 FREE"
 
         return inpgrid, readinp
 
@@ -374,16 +425,19 @@ class Swan_accessor(object):
         per_var="pk_wav_per",
         dir_var="pk_wav_dir",
         dir_spread=20.0,
+        max_workers=4,
     ):
         """This function writes parametric boundary forcing to a set of
         TPAR files at a given distance based on gridded wave output. It returns the string to be included in the Swan INPUT file.
 
-        At present simple nearest neighbour point lookup is used.
+        At present simple nearest neighbour point lookup is used. All boundary points
+        are selected from the dataset at once and the TPAR files are written
+        concurrently from `max_workers` threads.
 
         Args:
         TBD
         """
-        from shapely.ops import substring
+        import shapely
 
         bound_string = "BOUNDSPEC SEGM XY "
         point_string = "&\n {xp:0.8f} {yp:0.8f} "
@@ -396,41 +450,64 @@ class Swan_accessor(object):
 
         n_pts = int((boundary.length) / interval)
         splits = np.linspace(0, 1.0, n_pts)
-        boundary_points = []
-        j = 0
-        for i in range(len(splits) - 1):
-            segment = substring(
-                boundary.exterior, splits[i], splits[i + 1], normalized=True
+
+        # Second vertex of the substring of the boundary between adjacent splits,
+        # i.e., the first boundary vertex within the substring or its end point
+        exterior = boundary.exterior
+        coords = np.asarray(exterior.coords)
+        starts = splits[:-1] * exterior.length
+        ends = splits[1:] * exterior.length
+        seglen = (
+            (coords[1:, 0] - coords[:-1, 0]) ** 2
+            + (coords[1:, 1] - coords[:-1, 1]) ** 2
+        ) ** 0.5
+        distance = np.concatenate([[0.0], np.cumsum(seglen)[:-1]])
+        ind = np.minimum(
+            np.searchsorted(distance, starts, side="right"), distance.size - 1
+        )
+        vertex = (distance[ind] > starts) & (distance[ind] < ends)
+        endpoints = shapely.get_coordinates(
+            shapely.line_interpolate_point(exterior, ends)
+        )
+        points = np.where(vertex[:, None], coords[ind, :2], endpoints)
+        if points.size == 0:
+            return bound_string
+
+        logger.debug(f"Extracting {len(points)} points from the dataset")
+        ds_points = self._obj[[hs_var, per_var, dir_var]].sel(
+            indexers={
+                x_var: xr.DataArray(points[:, 0], dims="point"),
+                y_var: xr.DataArray(points[:, 1], dims="point"),
+            },
+            method="nearest",
+            tolerance=interval,
+        )
+        ds_points = ds_points.transpose("point", ...).load()
+        hs = ds_points[hs_var].values.reshape(len(points), -1)
+        valid = ~np.isnan(hs).any(axis=1)
+        times = pd.to_datetime(ds_points.time.values).strftime("%Y%m%d.%H%M%S")
+        lf = "{tt} {hs:0.2f} {per:0.2f} {dirn:0.1f} {spr:0.2f}\n"
+
+        def write(j, i):
+            rows = zip(
+                times,
+                ds_points[hs_var].values[i].astype(float).tolist(),
+                ds_points[per_var].values[i].astype(float).tolist(),
+                ds_points[dir_var].values[i].astype(float).tolist(),
             )
-            xp = segment.coords[1][0]
-            yp = segment.coords[1][1]
-            logger.debug(f"Extracting point: {xp},{yp}")
-            ds_point = self._obj.sel(
-                indexers={x_var: xp, y_var: yp}, method="nearest", tolerance=interval
+            lines = [
+                lf.format(tt=tt, hs=hs, per=per, dirn=dirn, spr=dir_spread)
+                for tt, hs, per, dirn in rows
+            ]
+            with open(f"{dest_path}/{j}.TPAR", "wt") as f:
+                f.write("TPAR\n" + "".join(lines))
+
+        indices = np.flatnonzero(valid)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(write, range(indices.size), indices))
+        for j, i in enumerate(indices):
+            bound_string += file_string.format(
+                len=splits[i + 1] * boundary.length, fname=f"{j}.TPAR"
             )
-            if len(ds_point.time) == len(self._obj.time):
-                if not np.any(np.isnan(ds_point[hs_var])):
-                    with open(f"{dest_path}/{j}.TPAR", "wt") as f:
-                        f.write("TPAR\n")
-                        for t in range(len(ds_point.time)):
-                            ds_row = ds_point.isel(time=t)
-                            lf = "{tt} {hs:0.2f} {per:0.2f} {dirn:0.1f} {spr:0.2f}\n"
-                            f.write(
-                                lf.format(
-                                    tt=str(
-                                        ds_row["time"]
-                                        .dt.strftime("%Y%m%d.%H%M%S")
-                                        .values
-                                    ),
-                                    hs=float(ds_row[hs_var]),
-                                    per=float(ds_row[per_var]),
-                                    dirn=float(ds_row[dir_var]),
-                                    spr=dir_spread,
-                                )
-                            )
-                    bound_string += file_string.format(
-                        len=splits[i + 1] * boundary.length, fname=f"{j}.TPAR"
-                    )
-                    j += 1
 
         return bound_string
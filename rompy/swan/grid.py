@@ -128,15 +128,19 @@ class SwanGrid(RegularGrid):
         """Returns the grid boundary polygon.
 
         Override the parent method to use the actual points from the regular grid
-        boundary instead of the convex hull which is not always the boundary.
+        boundary instead of the convex hull which is not always the boundary. The
+        edge points are generated from the grid axes without the full grid mesh.
 
         """
-        x = np.concatenate(
-            [self.x[0, :], self.x[1:, -1], self.x[-1, -2::-1], self.x[-2::-1, 0]]
+        i = np.arange(0.0, self.dx * self.nx, self.dx)
+        j = np.arange(0.0, self.dy * self.ny, self.dy)
+        ii = np.concatenate(
+            [i, np.full(j.size - 1, i[-1]), i[-2::-1], np.zeros(j.size - 1)]
         )
-        y = np.concatenate(
-            [self.y[0, :], self.y[1:, -1], self.y[-1, -2::-1], self.y[-2::-1, 0]]
+        jj = np.concatenate(
+            [np.zeros(i.size), j[1:], np.full(i.size - 1, j[-1]), j[-2::-1]]
         )
+        x, y = self._rotate(ii, jj)
         return Polygon(zip(x, y))
 
     def nearby_spectra(self, ds_spec, dist_thres=0.05, plot=True):
@@ -1,8 +1,11 @@
 """SWAN interface objects."""
 
 import logging
+import time
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from functools import partial
 from pathlib import Path
-from typing import Any, Literal, Optional, Union
+from typing import Any, Callable, Literal, Optional, Union
 
 from pydantic import Field, ValidationInfo, field_validator, model_validator
 
@@ -15,6 +18,53 @@ from rompy.swan.subcomponents.time import NONSTATIONARY, STATIONARY, TimeRangeOp
 logger = logging.getLogger(__name__)
 
 
+def generate_inputs(tasks: list[tuple[str, Callable]], max_workers: int = 1) -> list:
+    """Generate forcing inputs, concurrently in threads if max_workers > 1.
+
+    Parameters
+    ----------
+    tasks: list[tuple[str, Callable]]
+        Name and function without arguments generating each input.
+    max_workers: int
+        Maximum number of inputs generated at the same time.
+
+    Returns
+    -------
+    results: list
+        The result of each task in the same order as the tasks so the rendered
+        commands do not depend on which input finishes first.
+
+    Note
+    ----
+    The time taken by each input is logged. If any input fails, the inputs not yet
+    started are cancelled and the error of the first failed input is raised.
+
+    """
+
+    def run(name: str, func: Callable):
+        start = time.perf_counter()
+        try:
+            result = func()
+        except Exception:
+            logger.error(f"Failed generating {name}")
+            raise
+        logger.info(f"Generated {name} in {time.perf_counter() - start:0.2f}s")
+        return result
+
+    if max_workers == 1 or len(tasks) < 2:
+        return [run(name, func) for name, func in tasks]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(run, name, func) for name, func in tasks]
+        done, pending = wait(futures, return_when=FIRST_EXCEPTION)
+        for future in pending:
+            future.cancel()
+        for future in futures:
+            if future in done and future.exception() is not None:
+                raise future.exception()
+        return [future.result() for future in futures]
+
+
 class DataInterface(RompyBaseModel):
     """SWAN forcing data interface.
 
@@ -33,6 +83,14 @@ class DataInterface(RompyBaseModel):
     )
     bottom: Optional[SwanDataGrid] = Field(default=None, description="Bathymetry data")
     input: list[SwanDataGrid] = Field(default=[], description="Input grid data")
+    max_workers: int = Field(
+        default=1,
+        description=(
+            "Maximum number of inputs generated concurrently in threads, by default "
+            "inputs are generated in turn"
+        ),
+        ge=1,
+    )
 
     @field_validator("input")
     @classmethod
@@ -53,9 +111,14 @@ class DataInterface(RompyBaseModel):
         if self.bottom is not None:
             inputs.append(self.bottom)
         inputs.extend(self.input)
-        cmds = []
-        for input in inputs:
-            cmds.append(input.get(destdir=staging_dir, grid=grid, time=period))
+        tasks = [
+            (
+                str(input),
+                partial(input.get, destdir=staging_dir, grid=grid, time=period),
+            )
+            for input in inputs
+        ]
+        cmds = generate_inputs(tasks, max_workers=self.max_workers)
         return "\n".join(cmds)
 
     def render(self, *args, **kwargs):
@@ -1,6 +1,7 @@
 """Legacy objects in SwanConfig."""
 
 import logging
+from functools import partial
 from typing import Union, Annotated, Optional, Literal
 from pathlib import Path
 from pydantic import Field, field_validator
@@ -9,6 +10,7 @@ from rompy.core import RompyBaseModel, TimeRange, Coordinate, Spectrum
 from rompy.swan.grid import SwanGrid
 from rompy.swan.data import SwanDataGrid
 from rompy.swan.boundary import Boundnest1
+from rompy.swan.interface import generate_inputs
 
 
 logger = logging.getLogger(__name__)
@@ -35,26 +37,39 @@ class ForcingData(RompyBaseModel):
     boundary: Optional[Boundnest1] = Field(
         default=None, description="Boundary input data"
     )
+    max_workers: int = Field(
+        default=1,
+        description=(
+            "Maximum number of forcing inputs generated concurrently in threads, by "
+            "default inputs are generated in turn"
+        ),
+        ge=1,
+    )
+
+    @property
+    def _sources(self) -> dict:
+        """The forcing data objects that are defined."""
+        names = ["bottom", "wind", "current", "boundary"]
+        return {name: getattr(self, name) for name in names if getattr(self, name)}
 
     def get(self, grid: SwanGrid, period: TimeRange, staging_dir: Path):
-        forcing = []
-        boundary = []
-        for source in self:
-            if source[1]:
-                logger.info(f"\t Processing {source[0]} forcing")
-                source[1]._filter_grid(grid)
-                source[1]._filter_time(period)
-                if source[0] == "boundary":
-                    boundary.append(source[1].get(staging_dir, grid))
-                else:
-                    forcing.append(source[1].get(staging_dir, grid))
+        def generate(name, source):
+            logger.info(f"\t Processing {name} forcing")
+            source._filter_grid(grid)
+            source._filter_time(period)
+            return source.get(staging_dir, grid)
+
+        sources = self._sources
+        tasks = [(name, partial(generate, name, src)) for name, src in sources.items()]
+        results = dict(zip(sources, generate_inputs(tasks, self.max_workers)))
+        forcing = [cmd for name, cmd in results.items() if name != "boundary"]
+        boundary = [cmd for name, cmd in results.items() if name == "boundary"]
         return dict(forcing="\n".join(forcing), boundary="\n".join(boundary))
 
     def __str__(self):
         ret = ""
-        for forcing in self:
-            if forcing[1]:
-                ret += f"\t{forcing[0]}: {forcing[1].source}\n"
+        for name, source in self._sources.items():
+            ret += f"\t{name}: {source.source}\n"
         return ret
 
 
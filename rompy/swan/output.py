@@ -0,0 +1,912 @@
+"""Readers for SWAN output files.
+
+The write components in :mod:`rompy.swan.components.output` define the layout of the
+files produced by SWAN. The readers in this module use those definitions to open
+BLOCK, TABLE and SPECOUT outputs as lazily chunked xarray datasets. Files are indexed
+through memory maps and the values are only parsed for the chunks being computed.
+
+"""
+
+import logging
+import re
+import warnings
+import zlib
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional, Sequence, Union
+
+import dask
+import dask.array as da
+import numpy as np
+import pandas as pd
+import xarray as xr
+from xarray.backends import BackendEntrypoint
+
+# The SWAN components are imported on first use, xarray imports this module whenever
+# it resolves the backend engines
+if TYPE_CHECKING:
+    from rompy.swan.components.output import BLOCK, NESTOUT, SPECOUT, TABLE
+
+
+logger = logging.getLogger(__name__)
+
+# Number of values per chunk when the number of times per chunk is not prescribed
+CHUNK_SIZE = 2**22
+
+# Number of bytes scanned at once when indexing the lines of a file
+SCAN_SIZE = 2**26
+
+# Output quantities written as x- and y-components
+VECTORS = ("vel", "wind", "transp", "force")
+
+WHITESPACE = np.frombuffer(b" \t\r\n", dtype="u1")
+
+# Keywords opening the spectrum of each location in SWAN spectral files
+SPECTRA_KEYWORDS = np.frombuffer(b"FNZ", dtype="u1")
+
+# Variable names in SWAN MATLAB files, suffixed by the time in nonstationary runs
+MAT_NAME = re.compile(r"^(?P<name>.+?)(?:_(?P<time>\d{8}_\d{6}))?$")
+
+# Numpy types of the numeric MATLAB array classes and data types
+MAT_CLASSES = {
+    6: "f8",
+    7: "f4",
+    8: "i1",
+    9: "u1",
+    10: "i2",
+    11: "u2",
+    12: "i4",
+    13: "u4",
+    14: "i8",
+    15: "u8",
+}
+MAT_TYPES = {
+    1: "i1",
+    2: "u1",
+    3: "i2",
+    4: "u2",
+    5: "i4",
+    6: "u4",
+    7: "f4",
+    9: "f8",
+    12: "i8",
+    13: "u8",
+}
+MI_MATRIX = 14
+MI_COMPRESSED = 15
+MAT_COMPLEX = 0x800
+
+
+# =====================================================================================
+# ASCII files
+# =====================================================================================
+def _line_index(filename: Union[str, Path]) -> tuple[np.ndarray, ...]:
+    """Memory map a file and index the start and end offsets of its lines."""
+    if Path(filename).stat().st_size == 0:
+        raise ValueError(f"Output file {filename} is empty")
+    buffer = np.memmap(filename, dtype="u1", mode="r")
+    newlines = np.concatenate(
+        [
+            np.flatnonzero(buffer[ind : ind + SCAN_SIZE] == 10) + ind
+            for ind in range(0, buffer.size, SCAN_SIZE)
+        ]
+    )
+    if newlines.size and newlines[-1] == buffer.size - 1:
+        ends = newlines
+    else:
+        ends = np.append(newlines, buffer.size)
+    starts = np.concatenate([[0], ends[:-1] + 1])
+    return buffer, starts, ends
+
+
+def _to_float(token: bytes) -> float:
+    """Convert a token to float, fields too wide for the format are `NaN`."""
+    try:
+        return float(token)
+    except ValueError:
+        return np.nan
+
+
+def _parse(text: bytes) -> np.ndarray:
+    """Parse whitespace separated values."""
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", DeprecationWarning)
+            return np.fromstring(text, sep=" ")
+    except (ValueError, DeprecationWarning):
+        # Values too large for fixed formats are written as asterisks
+        return np.array([_to_float(token) for token in text.split()])
+
+
+def _read_values(filename: str, start: int, stop: int, shape: tuple) -> np.ndarray:
+    """Parse the values between two byte offsets of an ASCII file.
+
+    Parameters
+    ----------
+    filename: str
+        Name of the ASCII file.
+    start: int
+        Offset of the first byte to parse.
+    stop: int
+        Offset of the byte after the last line to parse.
+    shape: tuple
+        Shape of the parsed values.
+
+    Returns
+    -------
+    values: np.ndarray
+        Values with the prescribed shape.
+
+    """
+    text = np.memmap(
+        filename, dtype="u1", mode="r", offset=start, shape=(stop - start,)
+    )
+    text = text.tobytes()
+    if b"%" in text:
+        lines = text.splitlines()
+        text = b"\n".join(line for line in lines if not line.startswith(b"%"))
+    values = _parse(text)
+    if values.size != np.prod(shape):
+        raise ValueError(
+            f"Expected {np.prod(shape)} values between bytes {start} and {stop} of "
+            f"{filename}, got {values.size}"
+        )
+    return values.reshape(shape)
+
+
+def _value_blocks(
+    filename: Union[str, Path], count: int, comments: bytes = b""
+) -> np.ndarray:
+    """Byte spans of the consecutive blocks of values in an ASCII file.
+
+    The number of lines of each block is taken from the lines of the first one, the
+    other blocks are assumed to have the same layout which holds for the fixed
+    formats SWAN writes outputs with.
+
+    Parameters
+    ----------
+    filename: str | Path
+        Name of the ASCII file.
+    count: int
+        Number of values in each block.
+    comments: bytes
+        Characters starting the lines to skip.
+
+    Returns
+    -------
+    spans: np.ndarray
+        Start and stop byte offsets of each block with shape (nblock, 2).
+
+    """
+    buffer, starts, ends = _line_index(filename)
+    first = buffer[np.minimum(starts, buffer.size - 1)]
+    skip = np.frombuffer(b"\r" + comments, dtype="u1")
+    keep = (ends > starts) & ~np.isin(first, skip)
+    starts, ends = starts[keep], ends[keep]
+    if starts.size == 0:
+        raise ValueError(f"Output file {filename} has no values")
+
+    # Count the values in growing sets of lines until the first block is covered
+    nline = 1024
+    while True:
+        nline = min(nline, starts.size)
+        region = np.asarray(buffer[starts[0] : ends[nline - 1]])
+        space = np.isin(region, WHITESPACE)
+        token = ~space
+        token[1:] &= space[:-1]
+        total = np.concatenate([[0], np.cumsum(token)])
+        cumulative = np.cumsum(
+            total[ends[:nline] - starts[0]] - total[starts[:nline] - starts[0]]
+        )
+        if cumulative[-1] >= count:
+            break
+        elif nline == starts.size:
+            raise ValueError(f"Output file {filename} has less than {count} values")
+        nline *= 2
+    nper = int(np.searchsorted(cumulative, count)) + 1
+    if cumulative[nper - 1] != count:
+        raise ValueError(
+            f"The lines of {filename} do not align with blocks of {count} values"
+        )
+
+    nblock, remainder = divmod(starts.size, nper)
+    if remainder:
+        logger.warning(f"Ignoring incomplete output at the end of {filename}")
+    return np.stack(
+        [starts[: nblock * nper : nper], ends[nper - 1 : nblock * nper : nper]], axis=1
+    )
+
+
+def _lazy_values(
+    filename: Union[str, Path], spans: np.ndarray, shape: tuple, ntime: int
+) -> da.Array:
+    """Dask array of the blocks of values in an ASCII file chunked in time."""
+    chunks = []
+    for ind in range(0, len(spans), ntime):
+        block = spans[ind : ind + ntime]
+        values = dask.delayed(_read_values, pure=True)(
+            str(filename), int(block[0, 0]), int(block[-1, 1]), (len(block), *shape)
+        )
+        chunks.append(da.from_delayed(values, shape=(len(block), *shape), dtype="f8"))
+    return da.concatenate(chunks)
+
+
+# =====================================================================================
+# MATLAB files
+# =====================================================================================
+def _mat_tag(buffer: np.ndarray, pos: int, order: str) -> tuple[int, ...]:
+    """Read the tag of a MATLAB 5 data element.
+
+    Returns
+    -------
+    mdtype: int
+        Data type of the element.
+    nbytes: int
+        Number of bytes of data in the element.
+    start: int
+        Offset of the data of the element.
+    stop: int
+        Offset of the next element.
+
+    """
+    mdtype, nbytes = np.frombuffer(buffer[pos : pos + 8], dtype=f"{order}u4").tolist()
+    if mdtype >> 16:
+        # Small data element format packing up to 4 bytes of data into the tag
+        return mdtype & 0xFFFF, mdtype >> 16, pos + 4, pos + 8
+    return mdtype, nbytes, pos + 8, pos + 8 + -(-nbytes // 8) * 8
+
+
+def _mat_matrix(buffer: np.ndarray, pos: int, order: str) -> tuple:
+    """Read the header of a MATLAB 5 array starting from its array flags."""
+    _, _, start, pos = _mat_tag(buffer, pos, order)
+    flags = int(np.frombuffer(buffer[start : start + 4], dtype=f"{order}u4")[0])
+    _, nbytes, start, pos = _mat_tag(buffer, pos, order)
+    dims = np.frombuffer(buffer[start : start + nbytes], dtype=f"{order}i4")
+    _, nbytes, start, pos = _mat_tag(buffer, pos, order)
+    name = bytes(buffer[start : start + nbytes]).decode("ascii")
+    mdtype, nbytes, start, _ = _mat_tag(buffer, pos, order)
+    return name, flags, tuple(dims.tolist()), mdtype, nbytes, start
+
+
+def _mat_index(filename: Union[str, Path]) -> dict[str, tuple]:
+    """Index the numeric 2D arrays in a MATLAB 5 file.
+
+    Returns
+    -------
+    index: dict
+        Offset, stored type, class type and shape of each array. Compressed arrays
+        cannot be memory-mapped and are indexed with no offset.
+
+    """
+    buffer = np.memmap(filename, dtype="u1", mode="r")
+    order = "<" if bytes(buffer[126:128]) == b"IM" else ">"
+    index = {}
+    pos = 128
+    while pos + 8 <= buffer.size:
+        mdtype, nbytes, start, _ = _mat_tag(buffer, pos, order)
+        # Top level elements are not padded
+        pos = start + nbytes
+        if mdtype == MI_COMPRESSED:
+            # Decompress just enough data to read the array header
+            header = zlib.decompressobj().decompress(bytes(buffer[start:pos]), 1024)
+            header = np.frombuffer(header, dtype="u1")
+            mdtype, _, start, _ = _mat_tag(header, 0, order)
+            if mdtype != MI_MATRIX:
+                continue
+            name, flags, dims, mdtype, nbytes, start = _mat_matrix(header, start, order)
+            offset = None
+        elif mdtype == MI_MATRIX:
+            name, flags, dims, mdtype, nbytes, offset = _mat_matrix(
+                buffer, start, order
+            )
+        else:
+            continue
+        dtype = MAT_CLASSES.get(flags & 0xFF)
+        if dtype is None or flags & MAT_COMPLEX or len(dims) != 2:
+            logger.debug(f"Skipping array {name} from {filename}")
+            continue
+        stored = MAT_TYPES.get(mdtype)
+        if stored is None or nbytes != np.prod(dims) * np.dtype(stored).itemsize:
+            offset = None
+        index[name] = (offset, f"{order}{stored}", dtype, dims)
+    return index
+
+
+def _read_mat(filename: str, arrays: list[tuple]) -> np.ndarray:
+    """Stack arrays of a MATLAB 5 file, memory-mapped unless compressed."""
+    buffer = np.memmap(filename, dtype="u1", mode="r")
+    out = []
+    for name, (offset, stored, dtype, dims) in arrays:
+        if offset is None:
+            from scipy.io import loadmat
+
+            array = loadmat(filename, variable_names=[name])[name]
+        else:
+            array = np.frombuffer(
+                buffer, dtype=stored, count=int(np.prod(dims)), offset=offset
+            )
+            # MATLAB stores arrays in column-major order
+            array = array.reshape(dims[::-1]).T
+        out.append(array.astype(dtype))
+    return np.stack(out)
+
+
+def read_block_mat(
+    filename: Union[str, Path], ntime: Optional[int] = None
+) -> xr.Dataset:
+    """Read a SWAN BLOCK output file in MATLAB format.
+
+    Variables keep the names SWAN gives them in the file, the output times are taken
+    from the time suffix of the names in nonstationary runs. The `Xp` and `Yp`
+    arrays are set as coordinates if they are output.
+
+    Parameters
+    ----------
+    filename: str | Path
+        Name of the MATLAB output file.
+    ntime: int, optional
+        Number of times in each chunk, by default chunks have about 4M values.
+
+    Returns
+    -------
+    dset: xr.Dataset
+        Lazy dataset with (time, y, x) variables.
+
+    """
+    variables = {}
+    for matname, array in _mat_index(filename).items():
+        match = MAT_NAME.match(matname)
+        variables.setdefault(match["name"], {})[match["time"]] = (matname, array)
+
+    data_vars = {}
+    for name, arrays in variables.items():
+        keys = sorted(key for key in arrays if key is not None)
+        if not keys:
+            _, (_, _, dtype, dims) = arrays[None]
+            values = dask.delayed(_read_mat, pure=True)(str(filename), [arrays[None]])
+            data = da.from_delayed(values, shape=(1, *dims), dtype=dtype)[0]
+            data_vars[name] = xr.DataArray(data, dims=("y", "x"))
+            continue
+        _, (_, _, dtype, dims) = arrays[keys[0]]
+        nper = ntime or max(1, CHUNK_SIZE // int(np.prod(dims)))
+        chunks = []
+        for ind in range(0, len(keys), nper):
+            chunk = [arrays[key] for key in keys[ind : ind + nper]]
+            values = dask.delayed(_read_mat, pure=True)(str(filename), chunk)
+            chunks.append(
+                da.from_delayed(values, shape=(len(chunk), *dims), dtype=dtype)
+            )
+        times = pd.to_datetime(keys, format="%Y%m%d_%H%M%S")
+        data_vars[name] = xr.DataArray(
+            da.concatenate(chunks), coords={"time": times}, dims=("time", "y", "x")
+        )
+    dset = xr.Dataset(data_vars)
+    return dset.set_coords([name for name in ("Xp", "Yp") if name in dset])
+
+
+# =====================================================================================
+# Output definitions
+# =====================================================================================
+def _location(component, location):
+    """Output locations of a write component.
+
+    The locations can be given as a location component or as the OUTPUT group
+    component in which case they are looked up from the `sname` of the component.
+
+    """
+    from rompy.swan.components.group import OUTPUT
+    from rompy.swan.components.output import CURVE, FRAME, GROUP, POINTS
+
+    if isinstance(location, dict):
+        components = {"frame": FRAME, "group": GROUP, "points": POINTS, "curve": CURVE}
+        location = components[location["model_type"].lower()](**location)
+    if isinstance(location, OUTPUT):
+        candidates = []
+        for field in location._location_fields:
+            value = getattr(location, field)
+            if value is not None:
+                candidates.extend(getattr(value, "curves", [value]))
+        for candidate in candidates:
+            if getattr(candidate, "sname", None) == component.sname:
+                return candidate
+        return None
+    if location is not None and location.sname != component.sname:
+        raise ValueError(
+            f"Location {location.sname} does not match the {component.model_type} "
+            f"sname {component.sname}"
+        )
+    return location
+
+
+def _grid(location, shape: Optional[Sequence[int]]) -> tuple[tuple, dict]:
+    """Shape and coordinates of gridded output locations."""
+    from rompy.swan.components.output import FRAME, GROUP
+
+    if shape is not None:
+        return tuple(shape), {}
+    if isinstance(location, FRAME):
+        grid = location.grid
+        ny, nx = grid.my + 1, grid.mx + 1
+        if grid.alp:
+            # Rotated frames have no 1D coordinates
+            return (ny, nx), {}
+        coords = {
+            "x": grid.xp + np.linspace(0, grid.xlen, nx),
+            "y": grid.yp + np.linspace(0, grid.ylen, ny),
+        }
+        return (ny, nx), coords
+    if isinstance(location, GROUP):
+        ix = np.arange(location.ix1, location.ix2 + 1)
+        iy = np.arange(location.iy1, location.iy2 + 1)
+        return (iy.size, ix.size), {"ix": ("x", ix), "iy": ("y", iy)}
+    raise ValueError(
+        "The shape of the output grid requires a FRAME or GROUP location or an "
+        "explicit shape"
+    )
+
+
+def _sites(location, size: Optional[int]) -> tuple[int, dict]:
+    """Number and coordinates of the output locations in a table."""
+    from rompy.swan.components.output import CURVE, FRAME, GROUP, POINTS
+
+    if size is not None:
+        return size, {}
+    if isinstance(location, POINTS):
+        coords = {"x": ("site", location.xp), "y": ("site", location.yp)}
+        return len(location.xp), coords
+    if isinstance(location, CURVE):
+        return 1 + sum(location.npts), {}
+    if isinstance(location, (FRAME, GROUP)):
+        shape, _ = _grid(location, None)
+        return int(np.prod(shape)), {}
+    raise ValueError(
+        "The number of output locations requires a POINTS, CURVE, FRAME or GROUP "
+        "location or an explicit size"
+    )
+
+
+def _variables(output: list) -> list[str]:
+    """Names of the columns or blocks written for the output quantities."""
+    names = []
+    for quantity in output:
+        name = getattr(quantity, "value", quantity).lower()
+        if name in VECTORS:
+            names.extend([f"{name}_x", f"{name}_y"])
+        else:
+            names.append(name)
+    return names
+
+
+def _set_times(dset: xr.Dataset, component, times: Optional[Sequence]) -> xr.Dataset:
+    """Set the output times from the write component unless prescribed."""
+    ntimes = dset.time.size
+    if times is not None:
+        times = pd.DatetimeIndex(times)
+        if times.size != ntimes:
+            raise ValueError(f"Got {times.size} times for {ntimes} output times")
+    elif component.times is not None:
+        times = pd.date_range(
+            component.times.tbeg, periods=ntimes, freq=component.times.delt
+        )
+    elif ntimes == 1:
+        # Written at the last time step only
+        return dset.isel(time=0)
+    else:
+        return dset
+    return dset.assign_coords(time=times)
+
+
+# =====================================================================================
+# Readers
+# =====================================================================================
+def read_block(
+    filename: Union[str, Path],
+    block: Optional["BLOCK"] = None,
+    location=None,
+    shape: Optional[Sequence[int]] = None,
+    times: Optional[Sequence] = None,
+    ntime: Optional[int] = None,
+    fill_value: Optional[float] = None,
+) -> xr.Dataset:
+    """Read a SWAN BLOCK output file.
+
+    ASCII files must be written with NOHEADER, the values of each output time are
+    parsed on demand from the memory-mapped file. Files with the `.mat` extension are
+    read with :func:`read_block_mat`.
+
+    Parameters
+    ----------
+    filename: str | Path
+        Name of the output file.
+    block: BLOCK, optional
+        The BLOCK component that wrote the file, required for ASCII files.
+    location: FRAME | GROUP | OUTPUT, optional
+        The output locations of the block, or the OUTPUT group component defining
+        them, providing the shape and coordinates of the grid.
+    shape: Sequence[int], optional
+        Shape (ny, nx) of the grid, required if the locations are not given such as
+        for the COMPGRID and BOTTGRID special frames.
+    times: Sequence, optional
+        Output times, by default defined from the `times` of the component.
+    ntime: int, optional
+        Number of times in each chunk, by default chunks have about 4M values.
+    fill_value: float, optional
+        Exception value to mask as missing.
+
+    Returns
+    -------
+    dset: xr.Dataset
+        Lazy dataset with one (time, y, x) variable per output block, vector
+        quantities are split into `_x` and `_y` components.
+
+    """
+    if Path(filename).suffix == ".mat":
+        dset = read_block_mat(filename, ntime=ntime)
+        if block is not None:
+            location = _location(block, location)
+        if location is not None:
+            dset = dset.assign_coords(_grid(location, None)[1])
+        return dset
+    if block is None:
+        raise ValueError("The BLOCK component is required to read ASCII output")
+    if block.header is not False:
+        raise ValueError(
+            "Only NOHEADER BLOCK output can be read from ASCII files, set "
+            "header=False or use a .mat file"
+        )
+    location = _location(block, location)
+    (ny, nx), coords = _grid(location, shape)
+    names = _variables(block.output)
+    count = len(names) * ny * nx
+    spans = _value_blocks(filename, count)
+    ntime = ntime or max(1, CHUNK_SIZE // count)
+    data = _lazy_values(filename, spans, (len(names), ny, nx), ntime)
+    if block.idla in (None, 1):
+        # Rows are written from the top of the grid
+        data = data[..., ::-1, :]
+    if block.unit is not None:
+        data = data * block.unit
+    if fill_value is not None:
+        data = da.where(data == fill_value, np.nan, data)
+    data_vars = {
+        name: (("time", "y", "x"), data[:, ind]) for ind, name in enumerate(names)
+    }
+    return _set_times(xr.Dataset(data_vars, coords=coords), block, times)
+
+
+def read_table(
+    filename: Union[str, Path],
+    table: "TABLE",
+    location=None,
+    size: Optional[int] = None,
+    times: Optional[Sequence] = None,
+    ntime: Optional[int] = None,
+    fill_value: Optional[float] = None,
+) -> xr.Dataset:
+    """Read a SWAN TABLE output file.
+
+    HEADER and NOHEADER tables are supported, the header lines starting with `%` are
+    skipped and fields written as asterisks are set as missing.
+
+    Parameters
+    ----------
+    filename: str | Path
+        Name of the output file.
+    table: TABLE
+        The TABLE component that wrote the file.
+    location: POINTS | CURVE | FRAME | GROUP | OUTPUT, optional
+        The output locations of the table, or the OUTPUT group component defining
+        them, providing the number and coordinates of the sites.
+    size: int, optional
+        Number of output locations, required if the locations are not given.
+    times: Sequence, optional
+        Output times, by default defined from the `times` of the component.
+    ntime: int, optional
+        Number of times in each chunk, by default chunks have about 4M values.
+    fill_value: float, optional
+        Exception value to mask as missing.
+
+    Returns
+    -------
+    dset: xr.Dataset
+        Lazy dataset with one (time, site) variable per column, vector quantities
+        are split into `_x` and `_y` components.
+
+    """
+    if table.format == "indexed":
+        raise ValueError("INDEXED tables are not supported, use HEADER or NOHEADER")
+    location = _location(table, location)
+    nsite, coords = _sites(location, size)
+    names = _variables(table.output)
+    count = nsite * len(names)
+    spans = _value_blocks(filename, count, comments=b"%")
+    ntime = ntime or max(1, CHUNK_SIZE // count)
+    data = _lazy_values(filename, spans, (nsite, len(names)), ntime)
+    if fill_value is not None:
+        data = da.where(data == fill_value, np.nan, data)
+    data_vars = {
+        name: (("time", "site"), data[..., ind]) for ind, name in enumerate(names)
+    }
+    return _set_times(xr.Dataset(data_vars, coords=coords), table, times)
+
+
+def _read_spectra(filename: str, start: int, stop: int, shape: tuple) -> np.ndarray:
+    """Parse the spectra between two byte offsets of a SWAN spectral file.
+
+    Parameters
+    ----------
+    filename: str
+        Name of the spectral file.
+    start: int
+        Offset of the first time line to parse.
+    stop: int
+        Offset of the end of the last line to parse.
+    shape: tuple
+        Shape (time, site, freq, dir) of the spectra.
+
+    Returns
+    -------
+    spectra: np.ndarray
+        Spectra with exception locations (NODATA) set as missing.
+
+    """
+    ntime, nsite, nfreq, ndir = shape
+    buffer = np.memmap(
+        filename, dtype="u1", mode="r", offset=start, shape=(stop - start,)
+    )
+    buffer = np.asarray(buffer)
+    newlines = np.flatnonzero(buffer == 10)
+    starts = np.concatenate([[0], newlines + 1])
+    ends = np.append(newlines, buffer.size)
+    keep = ends > starts
+    starts, ends = starts[keep], ends[keep]
+    first = buffer[starts]
+
+    keywords = np.flatnonzero(np.isin(first, SPECTRA_KEYWORDS))
+    if keywords.size != ntime * nsite:
+        raise ValueError(
+            f"Expected {ntime * nsite} spectra between bytes {start} and {stop} of "
+            f"{filename}, got {keywords.size}"
+        )
+    kind = first[keywords]
+    factor = keywords[kind == ord("F")]
+    rows = (factor[:, None] + np.arange(2, nfreq + 2)).ravel()
+
+    # Select the bytes of the factor and spectra lines including their newlines
+    selected = []
+    for lines in (factor + 1, rows):
+        delta = np.zeros(buffer.size + 1, dtype="i1")
+        delta[starts[lines]] = 1
+        delta[np.minimum(ends[lines] + 1, buffer.size)] -= 1
+        selected.append(_parse(buffer[np.cumsum(delta[:-1]) > 0].tobytes()))
+    factors, values = selected
+    if values.size != factor.size * nfreq * ndir:
+        raise ValueError(f"Unexpected number of spectral values in {filename}")
+
+    spectra = np.full((ntime * nsite, nfreq, ndir), np.nan)
+    spectra[kind == ord("Z")] = 0.0
+    spectra[kind == ord("F")] = values.reshape(-1, nfreq, ndir) * factors[:, None, None]
+    return spectra.reshape(shape)
+
+
+def read_specout(
+    filename: Union[str, Path],
+    specout: Optional[Union["SPECOUT", "NESTOUT"]] = None,
+    ntime: Optional[int] = None,
+    dirorder: bool = True,
+) -> xr.Dataset:
+    """Read a SWAN spectral output file.
+
+    The spectra are parsed on demand from the memory-mapped file into a dataset
+    compatible with wavespectra. Gzipped files cannot be memory-mapped and are read
+    in full with :func:`wavespectra.read_swan`.
+
+    Parameters
+    ----------
+    filename: str | Path
+        Name of the output file.
+    specout: SPECOUT | NESTOUT, optional
+        The component that wrote the file, only 2D spectra are supported.
+    ntime: int, optional
+        Number of times in each chunk, by default chunks have about 4M values.
+    dirorder: bool
+        Sort the directions.
+
+    Returns
+    -------
+    dset: xr.Dataset
+        Lazy dataset of (time, site, freq, dir) spectra.
+
+    """
+    from wavespectra.core.attributes import attrs, set_spec_attributes
+    from wavespectra.core.swan import SwanSpecFile
+
+    from rompy.swan.subcomponents.output import SPEC1D
+
+    if isinstance(getattr(specout, "dim", None), SPEC1D):
+        raise ValueError("Only SPEC2D spectra can be read, got SPEC1D")
+    if Path(filename).suffix == ".gz":
+        from wavespectra import read_swan
+
+        return read_swan(filename, dirorder=dirorder, as_site=True)
+
+    specfile = SwanSpecFile(filename, dirorder=dirorder)
+    specfile.close()
+    nsite, nfreq, ndir = specfile.x.size, specfile.freqs.size, specfile.dirs.size
+
+    # The data start after the exception values of the quantities
+    buffer, starts, ends = _line_index(filename)
+    keep = ends > starts
+    starts, ends = starts[keep], ends[keep]
+    first = buffer[starts]
+    for quant in np.flatnonzero(first == ord("Q")):
+        if bytes(buffer[starts[quant] : starts[quant] + 5]) == b"QUANT":
+            break
+    nquant = int(bytes(buffer[starts[quant + 1] : ends[quant + 1]]).split()[0])
+    data = quant + 2 + 3 * nquant
+    starts, ends, first = starts[data:], ends[data:], first[data:]
+
+    # Validate the number of lines of each time from its keywords
+    is_time = (first >= ord("0")) & (first <= ord("9"))
+    if isinstance(specfile.times, list):
+        lines = np.flatnonzero(is_time)
+        times = [bytes(buffer[starts[ind] : starts[ind] + 15]) for ind in lines]
+        times = pd.to_datetime(
+            [time.decode() for time in times], format="%Y%m%d.%H%M%S"
+        )
+    else:
+        lines = np.array([0])
+        times = None
+    if starts.size == 0 or lines.size == 0:
+        raise ValueError(f"Output file {filename} has no spectra")
+    bounds = np.append(lines, starts.size)
+    keyword = np.isin(first, SPECTRA_KEYWORDS)
+    nlines = is_time + keyword + (first == ord("F")) * (1 + nfreq)
+    expected = np.add.reduceat(nlines, lines)
+    valid = (expected == np.diff(bounds)) & (np.add.reduceat(keyword, lines) == nsite)
+    nvalid = int(np.argmin(valid)) if not valid.all() else valid.size
+    if nvalid < valid.size - 1:
+        raise ValueError(f"Unexpected layout of spectra in {filename}")
+    elif nvalid < valid.size:
+        logger.warning(f"Ignoring incomplete output at the end of {filename}")
+        lines, bounds = lines[:nvalid], bounds[: nvalid + 1]
+        times = times[:nvalid] if times is not None else times
+
+    ntime = ntime or max(1, CHUNK_SIZE // (nsite * nfreq * ndir))
+    chunks = []
+    for ind in range(0, lines.size, ntime):
+        count = min(ntime, lines.size - ind)
+        shape = (count, nsite, nfreq, ndir)
+        values = dask.delayed(_read_spectra, pure=True)(
+            str(filename),
+            int(starts[lines[ind]]),
+            int(ends[bounds[ind + count] - 1]),
+            shape,
+        )
+        chunks.append(da.from_delayed(values, shape=shape, dtype="f8"))
+    efth = da.concatenate(chunks) / specfile.units_factor
+    if specfile.dirmap:
+        efth = efth[..., specfile.dirmap]
+
+    dims = (attrs.TIMENAME, attrs.SITENAME, attrs.FREQNAME, attrs.DIRNAME)
+    dset = xr.Dataset(
+        {
+            attrs.SPECNAME: (dims, efth),
+            attrs.LONNAME: (attrs.SITENAME, specfile.x),
+            attrs.LATNAME: (attrs.SITENAME, specfile.y),
+        },
+        coords={
+            attrs.SITENAME: np.arange(nsite) + 1,
+            attrs.FREQNAME: specfile.freqs,
+            attrs.DIRNAME: specfile.dirs,
+        },
+    )
+    if times is not None:
+        dset = dset.assign_coords({attrs.TIMENAME: times})
+    else:
+        dset = dset.isel({attrs.TIMENAME: 0})
+    set_spec_attributes(dset)
+    dset[attrs.SPECNAME].attrs.update(
+        {"_units": "m^{2}.s.degree^{-1}", "_variable_name": "VaDens"}
+    )
+    return dset
+
+
+def read_output(
+    filename: Union[str, Path], component, location=None, **kwargs
+) -> xr.Dataset:
+    """Read a SWAN output file written by a write component.
+
+    Parameters
+    ----------
+    filename: str | Path
+        Name of the output file.
+    component: BLOCK | TABLE | SPECOUT | NESTOUT | dict
+        The write component that produced the file.
+    location: optional
+        The output locations of the BLOCK and TABLE components, or the OUTPUT group
+        component defining them.
+    kwargs:
+        Keyword arguments passed to the reader of the component.
+
+    Returns
+    -------
+    dset: xr.Dataset
+        Lazy dataset of the output.
+
+    """
+    from rompy.swan.components.output import BLOCK, NESTOUT, SPECOUT, TABLE
+
+    if isinstance(component, dict):
+        components = {
+            "block": BLOCK,
+            "table": TABLE,
+            "specout": SPECOUT,
+            "nestout": NESTOUT,
+        }
+        component = components[component["model_type"].lower()](**component)
+    if isinstance(component, BLOCK):
+        return read_block(filename, component, location=location, **kwargs)
+    elif isinstance(component, TABLE):
+        return read_table(filename, component, location=location, **kwargs)
+    elif isinstance(component, (SPECOUT, NESTOUT)):
+        return read_specout(filename, component, **kwargs)
+    raise TypeError(f"Cannot read output from {type(component).__name__} components")
+
+
+class SwanOutputBackendEntrypoint(BackendEntrypoint):
+    """Xarray backend engine for SWAN output files.
+
+    The engine is registered as `swan_output`, the write component that produced
+    the file and its locations are passed as backend keyword arguments:
+
+    .. code-block:: python
+
+        dset = xr.open_dataset(
+            "hsig.txt", engine="swan_output", component=block, location=frame
+        )
+
+    MATLAB BLOCK and spectral files can be opened without the component.
+
+    """
+
+    description = "Open SWAN BLOCK, TABLE and SPECOUT output files lazily"
+    open_dataset_parameters = (
+        "filename_or_obj",
+        "drop_variables",
+        "component",
+        "location",
+        "shape",
+        "size",
+        "times",
+        "ntime",
+        "fill_value",
+        "dirorder",
+    )
+
+    def open_dataset(
+        self,
+        filename_or_obj,
+        *,
+        drop_variables=None,
+        component=None,
+        location=None,
+        **kwargs,
+    ) -> xr.Dataset:
+        if component is not None:
+            dset = read_output(filename_or_obj, component, location=location, **kwargs)
+        elif Path(filename_or_obj).suffix == ".mat":
+            dset = read_block(filename_or_obj, location=location, **kwargs)
+        else:
+            with open(filename_or_obj, "rb") as stream:
+                if not stream.read(4) == b"SWAN":
+                    raise ValueError(
+                        "The write component is required to open BLOCK and TABLE "
+                        "ASCII output files"
+                    )
+            dset = read_specout(filename_or_obj, **kwargs)
+        if drop_variables is not None:
+            dset = dset.drop_vars(drop_variables, errors="ignore")
+        return dset
+
+    def guess_can_open(self, filename_or_obj) -> bool:
+        return False
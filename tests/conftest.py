@@ -1,3 +1,8 @@
+import pytest
+
+from rompy.core import interpolate, source
+
+
 def pytest_addoption(parser):
     parser.addoption(
         "--run-slow",
@@ -5,3 +10,14 @@ def pytest_addoption(parser):
         default=False,
         help="Run slow tests",
     )
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Keep the sidecars written by the tests out of the user cache directory."""
+    cache_dir = tmp_path / "rompy-cache"
+    monkeypatch.setattr(source, "METADATA_DIR", cache_dir / "metadata")
+    monkeypatch.setattr(source, "CATALOG_DIR", cache_dir / "catalogs")
+    monkeypatch.setattr(source, "TIMESERIES_DIR", cache_dir / "timeseries")
+    monkeypatch.setattr(interpolate, "PLAN_DIR", cache_dir / "interp")
+    return cache_dir
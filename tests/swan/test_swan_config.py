@@ -1,5 +1,16 @@
 """Test swan_config class."""
 
+import logging
+
+import numpy as np
+import pytest
+
+from rompy.swan.components.cgrid import REGULAR
+from rompy.swan.components.group import INPGRIDS, OUTPUT
+from rompy.swan.components.inpgrid import REGULAR as INPGRID_REGULAR
+from rompy.swan.components.output import GROUP, POINTS
+from rompy.swan.config import SwanConfigComponents
+
 # import pytest
 # import logging
 # from rompy.swan.config import SwanConfigComponents as SwanConfig
@@ -95,3 +106,56 @@
 #         inpgrid=[inpgrid_wind_dict],
 #     )
 #     sc._write_cmd()
+
+
+@pytest.fixture
+def cgrid():
+    return REGULAR(
+        spectrum=dict(mdc=36, flow=0.04, fhigh=0.4),
+        grid=dict(xp=110, yp=-35, alp=0, xlen=5, ylen=5, mx=10, my=10),
+    )
+
+
+def _inpgrid(**kwargs):
+    params = dict(
+        grid_type="bottom",
+        xpinp=109,
+        ypinp=-36,
+        mxinp=70,
+        myinp=70,
+        dxinp=0.1,
+        dyinp=0.1,
+        readinp=dict(fname1="bottom.txt"),
+    )
+    return INPGRIDS(inpgrids=[INPGRID_REGULAR(**{**params, **kwargs})])
+
+
+def test_inpgrid_covers_cgrid(cgrid, caplog):
+    with caplog.at_level(logging.WARNING):
+        SwanConfigComponents(cgrid=cgrid, inpgrid=_inpgrid())
+    assert "does not cover" not in caplog.text
+    with caplog.at_level(logging.WARNING):
+        SwanConfigComponents(cgrid=cgrid, inpgrid=_inpgrid(xpinp=112))
+    assert "does not cover" in caplog.text
+
+
+def test_inpgrid_outside_cgrid(cgrid):
+    with pytest.raises(ValueError, match="does not overlap"):
+        SwanConfigComponents(cgrid=cgrid, inpgrid=_inpgrid(xpinp=150))
+
+
+def test_group_within_cgrid(cgrid):
+    group = GROUP(sname="subgrid", ix1=0, iy1=0, ix2=10, iy2=5)
+    SwanConfigComponents(cgrid=cgrid, output=OUTPUT(group=group))
+    group = GROUP(sname="subgrid", ix1=0, iy1=0, ix2=11, iy2=5)
+    with pytest.raises(ValueError, match="outside the computational grid"):
+        SwanConfigComponents(cgrid=cgrid, output=OUTPUT(group=group))
+
+
+def test_points_within_cgrid(cgrid, caplog):
+    xp = np.random.uniform(110, 115, 10000).tolist() + [120.0]
+    yp = np.random.uniform(-35, -30, 10000).tolist() + [-32.0]
+    points = POINTS(sname="pts", xp=xp, yp=yp)
+    with caplog.at_level(logging.WARNING):
+        SwanConfigComponents(cgrid=cgrid, output=OUTPUT(points=points))
+    assert "1 of 10001 output locations in 'pts'" in caplog.text
@@ -0,0 +1,84 @@
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+
+from rompy.core.source import SourceFile
+from rompy.core.time import TimeRange
+from rompy.core.types import DatasetCoords
+from rompy.swan.data import SwanDataGrid
+from rompy.swan.grid import SwanGrid
+from rompy.swan.interface import DataInterface, generate_inputs
+
+
+@pytest.fixture
+def data_interface(tmp_path):
+    times = pd.date_range("2000-01-01", periods=5, freq="h")
+    coords = {"time": times, "lat": np.arange(10.0), "lon": np.arange(10.0)}
+    dset = xr.Dataset(
+        {
+            "depth": (("lat", "lon"), np.random.rand(10, 10)),
+            "u10": (("time", "lat", "lon"), np.random.rand(5, 10, 10)),
+            "v10": (("time", "lat", "lon"), np.random.rand(5, 10, 10)),
+            "elev": (("time", "lat", "lon"), np.random.rand(5, 10, 10)),
+        },
+        coords=coords,
+    )
+    dset.to_netcdf(tmp_path / "forcing.nc")
+    source = SourceFile(uri=tmp_path / "forcing.nc")
+    kwargs = dict(source=source, coords=DatasetCoords(x="lon", y="lat"))
+    return DataInterface(
+        bottom=SwanDataGrid(var="bottom", z1="depth", **kwargs),
+        input=[
+            SwanDataGrid(var="wind", z1="u10", z2="v10", **kwargs),
+            SwanDataGrid(var="wlevel", z1="elev", **kwargs),
+        ],
+    )
+
+
+def task(result, delay=0.0, error=None):
+    def func():
+        time.sleep(delay)
+        if error is not None:
+            raise error
+        return result
+
+    return func
+
+
+def test_generate_inputs_ordered():
+    tasks = [("a", task("a", 0.3)), ("b", task("b", 0.1)), ("c", task("c", 0.2))]
+    start = time.perf_counter()
+    assert generate_inputs(tasks, max_workers=3) == ["a", "b", "c"]
+    assert time.perf_counter() - start < 0.5
+    assert generate_inputs(tasks) == ["a", "b", "c"]
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_generate_inputs_error(max_workers):
+    done = []
+    tasks = [
+        ("slow", task("slow", 0.2)),
+        ("fail", task("fail", error=ValueError("broken input"))),
+        ("last", lambda: done.append("last")),
+    ]
+    with pytest.raises(ValueError, match="broken input"):
+        generate_inputs(tasks, max_workers=max_workers)
+    if max_workers == 1:
+        assert done == []
+
+
+def test_data_interface_concurrent(tmp_path, data_interface):
+    grid = SwanGrid(x0=0, y0=0, dx=1, dy=1, nx=10, ny=10)
+    period = TimeRange(start="2000-01-01T00", end="2000-01-01T04", interval="1h")
+    (tmp_path / "serial").mkdir()
+    (tmp_path / "concurrent").mkdir()
+    serial = data_interface.get(tmp_path / "serial", grid, period)
+    data_interface.max_workers = 3
+    concurrent = data_interface.get(tmp_path / "concurrent", grid, period)
+    assert concurrent == serial
+    for filename in ["bottom.grd", "wind.grd", "wlevel.grd"]:
+        expected = (tmp_path / "serial" / filename).read_text()
+        assert (tmp_path / "concurrent" / filename).read_text() == expected
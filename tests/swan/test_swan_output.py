@@ -0,0 +1,200 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+
+from rompy.swan.components.group import OUTPUT
+from rompy.swan.components.output import BLOCK, FRAME, POINTS, SPECOUT, TABLE
+from rompy.swan.output import read_block, read_output, read_specout, read_table
+
+
+HERE = Path(__file__).parent
+
+NT, NY, NX = 5, 4, 7
+
+TIMES = dict(tbeg="2023-01-01T00:00:00", delt="PT1H")
+
+
+@pytest.fixture(scope="module")
+def values():
+    rng = np.random.default_rng(0)
+    return rng.normal(1, 1, (NT, 3, NY, NX))
+
+
+@pytest.fixture
+def frame():
+    grid = dict(xp=100.0, yp=-30.0, xlen=3.0, ylen=1.5, mx=NX - 1, my=NY - 1)
+    return FRAME(sname="outgrid", grid=grid)
+
+
+def write_block(filename, values, idla):
+    """Write values in SWAN NOHEADER block layout with 6 values per line."""
+    with open(filename, "w") as stream:
+        for blocks in values:
+            for block in blocks:
+                rows = block[::-1] if idla == 1 else block
+                for row in rows:
+                    for ind in range(0, row.size, 6):
+                        fields = [f"{value:13.5E}" for value in row[ind : ind + 6]]
+                        stream.write(" " + " ".join(fields) + "\n")
+
+
+@pytest.mark.parametrize("idla", [1, 3])
+def test_read_block_ascii(tmp_path, values, frame, idla):
+    filename = tmp_path / "block.txt"
+    write_block(filename, values, idla)
+    block = BLOCK(
+        sname="outgrid",
+        header=False,
+        fname=str(filename),
+        idla=idla,
+        output=["hsign", "wind"],
+        times=TIMES,
+    )
+    dset = read_block(filename, block, location=frame, ntime=2)
+    assert dset.hsign.chunks[0] == (2, 2, 1)
+    assert np.allclose(dset.hsign, values[:, 0], rtol=1e-5)
+    assert np.allclose(dset.wind_x, values[:, 1], rtol=1e-5)
+    assert np.allclose(dset.wind_y, values[:, 2], rtol=1e-5)
+    assert np.allclose(dset.x, np.linspace(100, 103, NX))
+    assert np.allclose(dset.y, np.linspace(-30, -28.5, NY))
+    assert dset.time.to_index().equals(
+        pd.date_range("2023-01-01", periods=NT, freq="h")
+    )
+
+
+def test_read_block_ascii_fill_value(tmp_path, values):
+    values = values.copy()
+    values[:, :, 0, 0] = -99.0
+    filename = tmp_path / "block.txt"
+    write_block(filename, values[:1, :1], idla=3)
+    block = BLOCK(
+        sname="COMPGRID", header=False, fname=str(filename), idla=3, output=["hsign"]
+    )
+    dset = read_block(filename, block, shape=(NY, NX), fill_value=-99.0)
+    assert "time" not in dset.dims
+    assert np.isnan(dset.hsign[0, 0])
+    assert np.allclose(dset.hsign[1:], values[0, 0, 1:], rtol=1e-5)
+
+
+def test_read_block_ascii_header(tmp_path, frame):
+    block = BLOCK(sname="outgrid", fname="block.txt", output=["hsign"])
+    with pytest.raises(ValueError, match="NOHEADER"):
+        read_block(tmp_path / "block.txt", block, location=frame)
+
+
+@pytest.mark.parametrize("compression", [False, True])
+def test_read_block_mat(tmp_path, values, frame, compression):
+    from scipy.io import savemat
+
+    times = pd.date_range("2023-01-01", periods=NT, freq="h")
+    data = {
+        f"Hsig_{time:%Y%m%d_%H%M%S}": values[ind, 0] for ind, time in enumerate(times)
+    }
+    data["Depth"] = values[0, 1].astype("float32")
+    filename = tmp_path / "block.mat"
+    savemat(filename, data, do_compression=compression)
+    dset = read_block(filename, ntime=2)
+    assert dset.Hsig.chunks[0] == (2, 2, 1)
+    assert dset.time.to_index().equals(times)
+    assert np.array_equal(dset.Hsig, values[:, 0])
+    assert dset.Depth.dtype == "float32"
+    assert np.array_equal(dset.Depth, values[0, 1].astype("float32"))
+    block = BLOCK(sname="outgrid", fname="block.mat", output=["hsign", "depth"])
+    dset = read_block(filename, block, location=frame)
+    assert np.allclose(dset.x, np.linspace(100, 103, NX))
+
+
+def test_read_table(tmp_path, values):
+    points = POINTS(sname="outpts", xp=[100.0, 101.0, 102.0], yp=[-30.0, -29.0, -28.0])
+    table = TABLE(
+        sname="outpts",
+        format="header",
+        fname="table.txt",
+        output=["hsign", "tps"],
+        times=TIMES,
+    )
+    output = OUTPUT(points=points, table=table)
+    filename = tmp_path / "table.txt"
+    with open(filename, "w") as stream:
+        stream.write("%\n%\n% Run:            Table:outpts       SWAN version:41.45\n")
+        stream.write(
+            "%\n%       Hsig          TPsmoo\n%       [m]           [sec]\n%\n"
+        )
+        for ind in range(NT):
+            for site in range(3):
+                tps = (
+                    "****"
+                    if (ind, site) == (1, 1)
+                    else f"{values[ind, 1, 0, site]:.5f}"
+                )
+                stream.write(f"  {values[ind, 0, 0, site]:12.5f}  {tps:>12}\n")
+    dset = read_table(filename, table, location=output, ntime=3)
+    assert dset.hsign.chunks[0] == (3, 2)
+    assert np.allclose(dset.hsign, values[:, 0, 0, :3], atol=1e-5)
+    assert np.isnan(dset.tps[1, 1])
+    assert np.allclose(dset.tps[0], values[0, 1, 0, :3], atol=1e-5)
+    assert list(dset.x.values) == points.xp
+
+
+@pytest.fixture(scope="module")
+def spectra(tmp_path_factory):
+    with xr.open_dataset(HERE.parent / "data/aus-20230101.nc") as dset:
+        dset = dset.isel(site=slice(0, 6)).load()
+    dset["efth"][1, 2] = np.nan
+    dset["efth"][2, 3] = 0.0
+    filename = tmp_path_factory.mktemp("spectra") / "spectra.swn"
+    dset.spec.to_swan(filename)
+    return filename
+
+
+@pytest.mark.parametrize("ntime", [None, 2])
+def test_read_specout_matches_wavespectra(spectra, ntime):
+    from wavespectra import read_swan
+
+    expected = read_swan(spectra, as_site=True)
+    dset = read_specout(spectra, SPECOUT(sname="outpts", fname="spectra.swn"), ntime)
+    if ntime is not None:
+        assert dset.efth.chunks[0] == (2, 2, 1)
+    for name in ["efth", "lon", "lat"]:
+        assert dset[name].dims == expected[name].dims
+        assert np.array_equal(dset[name], expected[name], equal_nan=True)
+    assert dset.time.to_index().equals(expected.time.to_index())
+    assert dset.spec.hs().notnull().sum() == expected.spec.hs().notnull().sum()
+
+
+def test_read_specout_incomplete(tmp_path, spectra):
+    filename = tmp_path / "spectra.swn"
+    text = spectra.read_text()
+    filename.write_text(text[: text.rindex("FACTOR")])
+    dset = read_specout(filename)
+    assert dset.time.size == 4
+
+
+def test_open_dataset_engine(tmp_path, values, spectra):
+    dset = xr.open_dataset(spectra, engine="swan_output")
+    assert dset.efth.dims == ("time", "site", "freq", "dir")
+    filename = tmp_path / "block.txt"
+    write_block(filename, values, idla=3)
+    block = dict(
+        model_type="block",
+        sname="COMPGRID",
+        header=False,
+        fname="block.txt",
+        idla=3,
+        output=["hsign", "wind"],
+        times=TIMES,
+    )
+    dset = xr.open_dataset(
+        filename,
+        engine="swan_output",
+        component=block,
+        shape=(NY, NX),
+        drop_variables=["wind_x", "wind_y"],
+    )
+    assert list(dset.data_vars) == ["hsign"]
+    xr.testing.assert_identical(
+        dset, read_output(filename, block, shape=(NY, NX))[["hsign"]]
+    )
@@ -3,6 +3,7 @@ import pytest
 import shapely
 
 from rompy.core import BaseGrid, RegularGrid
+from rompy.core.grid import interpolate_line
 
 
 class CustomGrid(BaseGrid):
@@ -82,3 +83,94 @@ def test_grid_minmax(grid):
 def test_equivalence(regulargrid, grid):
     assert np.array_equal(regulargrid.x, grid.x)
     assert np.array_equal(regulargrid.y, grid.y)
+
+
+@pytest.fixture
+def rotated():
+    return RegularGrid(x0=110, y0=-30, dx=0.5, dy=0.25, nx=21, ny=31, rot=25)
+
+
+def test_regulargrid_coords_cached(rotated):
+    x, y = rotated._cached_coords()
+    assert rotated._cached_coords()[0] is x
+    assert not x.flags.writeable
+    rotated.nx = 11
+    assert rotated._cached_coords()[0] is not x
+    assert rotated.x.shape == (31, 11)
+
+
+def test_regulargrid_coords_writeable(rotated):
+    x = rotated.x
+    expected = x.copy()
+    x += 1.0
+    assert np.array_equal(rotated.x, expected)
+
+
+def test_regulargrid_analytic_bbox(rotated):
+    xx, yy = rotated._gen_reg_cgrid()
+    expected = [xx.min(), yy.min(), xx.max(), yy.max()]
+    assert np.allclose(rotated.bbox(), expected)
+
+
+def test_regulargrid_analytic_boundary(rotated):
+    xx, yy = rotated._gen_reg_cgrid()
+    hull = shapely.MultiPoint(list(zip(xx.ravel(), yy.ravel()))).convex_hull
+    assert rotated.boundary().equals(hull.simplify(tolerance=0.2))
+
+
+def test_regulargrid_lazy(rotated):
+    pytest.importorskip("dask")
+    lazy = rotated.model_copy(update={"lazy": True})
+    assert hasattr(lazy.x, "dask")
+    assert np.allclose(lazy.x.compute(), rotated.x)
+    assert np.allclose(lazy.y.compute(), rotated.y)
+    assert lazy.bbox() == rotated.bbox()
+
+
+def test_interpolate_line_matches_shapely():
+    x = np.array([0.0, 3.0, 3.0, 7.0, 7.0])
+    y = np.array([0.0, 0.0, 4.0, 1.0, 1.0])
+    line = shapely.LineString(zip(x, y))
+    distances = np.linspace(0, line.length + 1, 57)
+    xi, yi = interpolate_line(x, y, distances)
+    points = [line.interpolate(d) for d in distances]
+    assert np.allclose(xi, [p.x for p in points])
+    assert np.allclose(yi, [p.y for p in points])
+
+
+def test_boundary_points_spacing_matches_shapely(rotated):
+    spacing = 0.3
+    xbnd, ybnd = rotated.boundary_points(spacing=spacing)
+    polygon = rotated.boundary()
+    npts = int(np.ceil(polygon.length / spacing))
+    points = [polygon.boundary.interpolate(i * spacing) for i in range(npts)]
+    assert isinstance(xbnd, np.ndarray) and xbnd.size == npts
+    assert np.allclose(xbnd, [p.x for p in points])
+    assert np.allclose(ybnd, [p.y for p in points])
+
+
+def test_grid_nearest(grid):
+    distance, (iy, ix) = grid.nearest([0.2, 8.6], [3.1, 9.4])
+    assert np.allclose(distance, np.hypot([0.2, 0.4], [0.1, 0.4]))
+    assert list(ix) == [0, 9] and list(iy) == [3, 9]
+    assert grid.kdtree is grid.kdtree
+
+
+def test_grid_contains_points(grid):
+    inside = grid.contains_points([0, 4.5, 9, 9.5], [0, 4.5, 9, 5])
+    assert list(inside) == [True, True, True, False]
+    assert grid.covers([1, 1, 8, 8])
+    assert not grid.covers(shapely.Point(10, 10).buffer(1))
+
+
+def test_regulargrid_contains_points(rotated):
+    xx, yy = rotated._gen_reg_cgrid()
+    assert rotated.contains_points(xx, yy).all()
+    hull = rotated.boundary()
+    x = np.random.uniform(rotated.minx - 1, rotated.maxx + 1, 1000)
+    y = np.random.uniform(rotated.miny - 1, rotated.maxy + 1, 1000)
+    inside = rotated.contains_points(x, y)
+    assert np.array_equal(inside, shapely.intersects_xy(hull, x, y))
+    assert rotated.covers(hull.buffer(-0.1))
+    assert not rotated.covers(hull.buffer(0.1))
+    assert rotated._coords is None
@@ -0,0 +1,100 @@
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+
+import rompy.core.data
+from rompy.core import DataGrid, RegularGrid
+from rompy.core.cache import OutputCache, cache_key
+from rompy.core.source import SourceDataset, SourceFile
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = OutputCache(cachedir=tmp_path / "cache", maxsize=int(1e9))
+    monkeypatch.setattr(rompy.core.data, "OUTPUT_CACHE", cache)
+    return cache
+
+
+@pytest.fixture
+def source(tmp_path):
+    ds = xr.Dataset(
+        {
+            "data": xr.DataArray(
+                np.random.rand(10, 10, 10),
+                dims=["time", "latitude", "longitude"],
+                coords={
+                    "time": pd.date_range("2000-01-01", periods=10),
+                    "latitude": np.arange(0, 10),
+                    "longitude": np.arange(0, 10),
+                },
+            )
+        }
+    )
+    ds.to_netcdf(tmp_path / "source.nc")
+    return SourceFile(uri=tmp_path / "source.nc")
+
+
+def test_cache_key():
+    assert cache_key("a", {"x": 1, "y": 2}) == cache_key("a", {"y": 2, "x": 1})
+    assert cache_key("a", {"x": 1}) != cache_key("a", {"x": 2})
+
+
+def test_cache_put_get(tmp_path, cache):
+    filename = tmp_path / "file.txt"
+    filename.write_text("hello")
+    cache.put("key", [filename], {"cmd": "CMD"})
+    destdir = tmp_path / "dest"
+    assert cache.get("key", destdir) == {"cmd": "CMD"}
+    assert (destdir / "file.txt").read_text() == "hello"
+    assert cache.get("missing", destdir) is None
+
+
+def test_cache_prune_lru(tmp_path, cache):
+    for key in ["a", "b", "c"]:
+        filename = tmp_path / f"{key}.txt"
+        filename.write_bytes(b"0" * 100)
+        cache.put(key, [filename])
+        time.sleep(0.01)
+    cache.get("a", tmp_path / "dest")
+    removed = cache.prune(maxsize=250)
+    assert removed == ["b"]
+    assert [entry["key"] for entry in cache.entries()] == ["c", "a"]
+
+
+def test_data_grid_cached(tmp_path, cache, source):
+    grid = RegularGrid(x0=2, y0=3, dx=1, dy=1, nx=5, ny=4)
+    data = DataGrid(id="grid", source=source, cache=True)
+    (tmp_path / "run1").mkdir()
+    outfile = data.get(tmp_path / "run1", grid=grid)
+    assert len(cache.entries()) == 1
+    data = DataGrid(id="grid", source=source, cache=True)
+    cached = data.get(tmp_path / "run2", grid=grid)
+    entry = cache.cachedir / cache.entries()[0]["key"]
+    assert os.path.samefile(cached, entry / "grid.nc")
+    with xr.open_dataset(outfile) as ds1, xr.open_dataset(cached) as ds2:
+        assert ds1.equals(ds2)
+
+
+def test_data_grid_cached_in_memory_source(tmp_path, cache, source):
+    grid = RegularGrid(x0=2, y0=3, dx=1, dy=1, nx=5, ny=4)
+    dset = source.open().load()
+    for run in range(1, 4):
+        data = DataGrid(id="grid", source=SourceDataset(obj=dset + run), cache=True)
+        (tmp_path / f"run{run}").mkdir()
+        with xr.open_dataset(data.get(tmp_path / f"run{run}", grid=grid)) as ds:
+            assert ds.equals(data.ds)
+    assert len(cache.entries()) == 3
+    data = DataGrid(id="grid", source=SourceDataset(obj=dset + 1), cache=True)
+    cached = data.get(tmp_path / "run4", grid=grid)
+    entry = cache.cachedir / data._output_cache_key(grid)
+    assert os.path.samefile(cached, entry / "grid.nc")
+
+
+def test_data_grid_not_cached_by_default(tmp_path, cache, source):
+    data = DataGrid(id="grid", source=source)
+    data.get(tmp_path)
+    assert cache.entries() == []
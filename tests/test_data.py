@@ -9,16 +9,24 @@ import xarray as xr
 from pydantic import ValidationError
 
 from rompy.core import DataBlob, DataGrid, DataPoint, RegularGrid, TimeRange
+from rompy.core import source as rompy_source
 from rompy.core.source import (
+    CATALOG_POOL,
+    DATASET_CACHE,
+    CatalogPool,
+    DatameshTiling,
+    DatasetCache,
     SourceDatamesh,
     SourceDataset,
     SourceFile,
     SourceIntake,
     SourceTimeseriesCSV,
     SourceTimeseriesDataFrame,
+    SourceTimeseriesParquet,
 )
 from rompy.core.filters import Filter
 from rompy.core.types import DatasetCoords
+from rompy.core.writer import DataWriter
 
 
 HERE = Path(__file__).parent
@@ -151,6 +159,52 @@ def test_source_csv():
     assert list(source.open().dims) == ["time"]
 
 
+def test_source_csv_arrow_matches_pandas():
+    filename = HERE / "data" / "wind.csv"
+    arrow = SourceTimeseriesCSV(filename=filename, sidecar=False)
+    plain = SourceTimeseriesCSV(filename=filename, sidecar=False, arrow=False)
+    xr.testing.assert_allclose(arrow._open(), plain._open())
+
+
+def test_source_csv_parquet_sidecar(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    monkeypatch.setattr(rompy_source, "TIMESERIES_DIR", tmp_path / "sidecars")
+    filename = tmp_path / "wind.csv"
+    filename.write_text((HERE / "data" / "wind.csv").read_text())
+    source = SourceTimeseriesCSV(filename=filename)
+    dset = source._open()
+    sidecar = source.sidecar_path
+    assert sidecar.is_file()
+    xr.testing.assert_identical(source._open(), dset)
+    # Modifying the csv invalidates the sidecar and removes the stale one
+    with open(filename, "a") as stream:
+        stream.write("2023-01-10 00:00:00,1.0,1.0,1.4,225.0\n")
+    assert source.sidecar_path != sidecar
+    assert source._open().time.size == dset.time.size + 1
+    assert list(sidecar.parent.glob("*.parquet")) == [source.sidecar_path]
+
+
+def test_source_parquet_pushdown(tmp_path):
+    pytest.importorskip("pyarrow")
+    df = pd.read_csv(HERE / "data" / "wind.csv", parse_dates=["time"])
+    df.set_index("time").to_parquet(tmp_path / "wind.parquet")
+    source = SourceTimeseriesParquet(filename=tmp_path / "wind.parquet")
+    assert set(source.metadata(refresh=True).variables) == {
+        "u10",
+        "v10",
+        "wspd",
+        "wdir",
+    }
+    filters = Filter(crop=dict(time=slice("2023-01-01T03", "2023-01-01T06")))
+    dset = source.open(variables=["u10"], filters=filters, coords=DatasetCoords())
+    assert list(dset.data_vars) == ["u10"]
+    assert dset.time.size == 4
+    expected = SourceTimeseriesCSV(filename=HERE / "data" / "wind.csv").open(
+        variables=["u10"], filters=filters
+    )
+    xr.testing.assert_allclose(dset, expected)
+
+
 def test_source_dataframe():
     df = pd.read_csv(HERE / "data" / "wind.csv", parse_dates=["time"], index_col="time")
     source = SourceTimeseriesDataFrame(obj=df)
@@ -166,6 +220,49 @@ def test_source_intake_uri():
     assert isinstance(source.open(), xr.Dataset)
 
 
+def test_source_intake_catalog_pool(monkeypatch):
+    CATALOG_POOL.clear()
+    calls = []
+    open_catalog = intake.open_catalog
+
+    def counting_open_catalog(uri):
+        calls.append(uri)
+        return open_catalog(uri)
+
+    monkeypatch.setattr(intake, "open_catalog", counting_open_catalog)
+    uri = HERE / "data" / "catalog.yaml"
+    for dataset_id in ["era5", "gebco", "era5"]:
+        source = SourceIntake(dataset_id=dataset_id, catalog_uri=uri)
+        assert source.catalog is source.catalog
+    assert len(calls) == 1
+    assert CATALOG_POOL.info().hits == 5
+
+
+def test_catalog_pool_ttl_and_size():
+    pool = CatalogPool(maxsize=2, ttl=3600)
+    for key in ["a", "b", "c"]:
+        pool.get(key, lambda: object())
+    assert "a" not in pool and len(pool) == 2
+    pool.ttl = 0
+    catalog = pool.get("b", lambda: "reopened")
+    assert catalog == "reopened"
+
+
+def test_source_intake_persist_entry(tmp_path, monkeypatch):
+    monkeypatch.setattr(rompy_source, "CATALOG_DIR", tmp_path)
+    kwargs = dict(dataset_id="era5", catalog_uri=HERE / "data" / "catalog.yaml")
+    source = SourceIntake(persist_entry=True, **kwargs)
+    if not hasattr(source.catalog["era5"], "yaml"):
+        pytest.skip("Intake entries cannot be serialised to yaml")
+    dset = source._open()
+    assert len(list(tmp_path.glob("*.yaml"))) == 1
+    CATALOG_POOL.clear()
+    persisted = source._open()
+    assert CATALOG_POOL.info().misses == 0
+    xr.testing.assert_identical(dset, persisted)
+    xr.testing.assert_identical(dset, SourceIntake(**kwargs)._open())
+
+
 @pytest.mark.skip
 def test_source_intake_yaml():
     dataset = intake.open_netcdf(str(HERE / "data/era5-20230101.nc"))
@@ -210,9 +307,375 @@ def test_source_datamesh():
     assert isinstance(dset, xr.Dataset)
 
 
+@pytest.fixture
+def datamesh_local(tmp_path):
+    times = pd.date_range("2000-01-01", "2000-01-03", freq="1h")
+    ds = xr.Dataset(
+        data_vars={
+            "u10": (
+                ("time", "latitude", "longitude"),
+                np.random.rand(times.size, 11, 21),
+            )
+        },
+        coords={
+            "time": times,
+            "latitude": np.linspace(-35, -30, 11),
+            "longitude": np.linspace(110, 120, 21),
+        },
+    )
+    ds.to_netcdf(tmp_path / "datamesh.nc")
+    return tmp_path / "datamesh.nc"
+
+
+def _datamesh_filters():
+    filters = Filter()
+    filters.crop.update(dict(time=slice("2000-01-01T03", "2000-01-02T21")))
+    filters.crop.update(dict(longitude=slice(111, 119), latitude=slice(-34, -31)))
+    return filters
+
+
+@pytest.mark.parametrize("descending", [[], ["latitude"], ["latitude", "longitude"]])
+@pytest.mark.parametrize("xsplit, ysplit", [(1, 1), (2, 3)])
+def test_source_datamesh_tiling(datamesh_local, xsplit, ysplit, descending):
+    if descending:
+        with xr.open_dataset(datamesh_local) as dset:
+            dset = dset.isel({dim: slice(None, None, -1) for dim in descending}).load()
+        dset.to_netcdf(datamesh_local)
+    kwargs = dict(datasource="local", token=None, local=datamesh_local)
+    single = SourceDatamesh(**kwargs).open(_datamesh_filters(), DatasetCoords())
+    tiling = DatameshTiling(time_chunk="6h", xsplit=xsplit, ysplit=ysplit)
+    source = SourceDatamesh(tiling=tiling, **kwargs)
+    tiled = source.open(_datamesh_filters(), DatasetCoords())
+    assert tiled.u10.chunks is not None
+    xr.testing.assert_identical(tiled.load(), single)
+    for dim in ["latitude", "longitude"]:
+        index = tiled.get_index(dim)
+        if dim in descending:
+            assert index.is_monotonic_decreasing
+        else:
+            assert index.is_monotonic_increasing
+
+
+def test_source_datamesh_tiling_retries(datamesh_local, monkeypatch):
+    tiling = DatameshTiling(time_chunk="12h", retries=2, backoff=0)
+    source = SourceDatamesh(
+        datasource="local", token=None, local=datamesh_local, tiling=tiling
+    )
+    query = source.connector.query
+    failures = []
+
+    def flaky(q):
+        if len(failures) < 2:
+            failures.append(q)
+            raise ConnectionError("transient")
+        return query(q)
+
+    monkeypatch.setattr(source.connector, "query", flaky)
+    dset = source.open(_datamesh_filters(), DatasetCoords())
+    assert len(failures) == 2
+    assert dset.time.size == 43
+
+
+def test_datamesh_tiling_time_windows():
+    tiling = DatameshTiling(time_chunk="1D")
+    windows = tiling.time_windows(
+        dict(type="range", times=["2000-01-01", "2000-01-03T12"])
+    )
+    assert len(windows) == 3
+    assert windows[-1]["times"][-1] == pd.Timestamp("2000-01-03T12")
+    for previous, window in zip(windows[:-1], windows[1:]):
+        assert previous["times"][1] < window["times"][0]
+
+
 def test_data_point(tmp_path, grid):
     source = SourceTimeseriesCSV(filename=HERE / "data" / "wind.csv")
     times = TimeRange(start="2023-01-01", end="2023-01-01T12")
     data = DataPoint(id="wind", source=source)
     outfile = data.get(tmp_path, grid, times)
     assert outfile.is_file()
+
+
+def test_source_open_cached(nc_data_source):
+    source = nc_data_source.source
+    DATASET_CACHE.clear()
+    ds1 = source.open(variables=["data"])
+    ds2 = source.open(variables=["data"])
+    assert ds1.equals(ds2)
+    assert DATASET_CACHE.info().hits == 1
+    assert DATASET_CACHE.info().misses == 1
+
+
+def test_source_open_cache_keyed_on_filter(nc_data_source, grid):
+    DATASET_CACHE.clear()
+    ds1 = nc_data_source.ds
+    nc_data_source._filter_grid(grid)
+    ds2 = nc_data_source.ds
+    assert ds2.latitude.size < ds1.latitude.size
+    assert DATASET_CACHE.info().misses == 2
+    nc_data_source.ds
+    assert DATASET_CACHE.info().hits == 1
+
+
+def test_source_open_cache_invalidate(nc_data_source):
+    source = nc_data_source.source
+    DATASET_CACHE.clear()
+    source.open()
+    assert len(DATASET_CACHE) == 1
+    source.invalidate_cache()
+    assert len(DATASET_CACHE) == 0
+
+
+def test_dataset_cache_lru():
+    cache = DatasetCache(maxsize=2)
+    dset = xr.Dataset()
+    for key in ["a", "b", "c"]:
+        cache.put((key,), dset)
+    assert ("a",) not in cache
+    assert cache.info().currsize == 2
+
+
+def test_source_open_cache_in_memory():
+    DATASET_CACHE.clear()
+    index = pd.date_range("2000-01-01", periods=4, freq="h", name="time")
+    for value in range(1, 4):
+        dset = xr.Dataset({"data": ("x", np.full(4, float(value)))})
+        assert (SourceDataset(obj=dset).open().data == value).all()
+        df = pd.DataFrame({"data": np.full(4, float(value))}, index=index)
+        assert (SourceTimeseriesDataFrame(obj=df).open().data == value).all()
+    assert DATASET_CACHE.info().hits == 0
+    SourceDataset(obj=dset.copy(deep=True)).open()
+    assert DATASET_CACHE.info().hits == 1
+
+
+def test_source_file_metadata(nc_data_source, cache_dir):
+    meta = nc_data_source.source.metadata(refresh=True)
+    assert meta.dims == {"time": 10, "latitude": 10, "longitude": 10}
+    assert "data" not in meta.coords
+    assert meta.variables["data"]["dims"] == ["time", "latitude", "longitude"]
+    # Metadata persisted in the sidecar cache
+    filename = cache_dir / "metadata" / f"{nc_data_source.source.fingerprint}.nc"
+    assert filename.is_file()
+    cached = nc_data_source.source.metadata()
+    assert cached.coords.equals(meta.coords)
+    assert cached.variables.keys() == meta.variables.keys()
+    for name, variable in meta.variables.items():
+        # Compare as strings since the nan fill values are never equal
+        assert str(cached.variables[name]) == str(variable)
+
+
+def test_source_csv_metadata():
+    source = SourceTimeseriesCSV(filename=HERE / "data" / "wind.csv")
+    meta = source.metadata(refresh=True)
+    dset = source.open()
+    assert meta.coords.time.equals(dset.time)
+    assert set(meta.variables) == set(dset.data_vars)
+
+
+def test_source_coordinates_from_metadata(nc_data_source):
+    coords = nc_data_source.source.coordinates
+    assert coords["time"].size == 10
+
+
+@pytest.fixture
+def nc_multifile(tmp_path):
+    ds = xr.Dataset(
+        {
+            "data": xr.DataArray(
+                np.random.rand(10 * 24, 5, 5),
+                dims=["time", "latitude", "longitude"],
+                coords={
+                    "time": pd.date_range("2000-01-01", periods=10 * 24, freq="h"),
+                    "latitude": np.arange(0, 5),
+                    "longitude": np.arange(0, 5),
+                },
+            )
+        }
+    )
+    for day, dsday in ds.groupby("time.day"):
+        dsday.to_netcdf(tmp_path / f"test-200001{day:02d}.nc")
+    return ds
+
+
+def test_source_file_pushdown():
+    uri = HERE / "data" / "era5-20230101.nc"
+    filters = Filter()
+    filters.crop.update(
+        dict(
+            time=slice("2023-01-01T03", "2023-01-01T09"),
+            longitude=slice(115.0, 117.0),
+            latitude=slice(-33.0, -31.0),
+        )
+    )
+    source = SourceFile(uri=uri, chunk_size="1MiB")
+    dset = source.open(filters=filters, coords=DatasetCoords())
+    expected = SourceFile(uri=uri, pushdown=False).open(
+        filters=filters, coords=DatasetCoords()
+    )
+    assert dset.u10.chunks is not None
+    xr.testing.assert_identical(dset.load(), expected.load())
+    # The hyperslab is selected before the filters are applied
+    source._filters = filters
+    window = source._open()
+    assert window.sizes["time"] == dset.sizes["time"]
+    assert window.sizes["longitude"] == dset.sizes["longitude"]
+
+
+def test_source_file_template(tmp_path, nc_multifile):
+    source = SourceFile(uri=str(tmp_path / "test-{time:%Y%m%d}.nc"), frequency="1D")
+    files = source.files("2000-01-02T12", "2000-01-04")
+    assert [Path(f).name for f in files] == [
+        "test-20000102.nc",
+        "test-20000103.nc",
+        "test-20000104.nc",
+    ]
+    filters = Filter(crop={"time": slice("2000-01-02T12", "2000-01-04")})
+    dset = source.open(filters=filters)
+    assert dset.equals(nc_multifile.sel(time=slice("2000-01-02T12", "2000-01-04")))
+
+
+def test_source_file_glob(tmp_path, nc_multifile):
+    source = SourceFile(uri=str(tmp_path / "test-*.nc"))
+    assert len(source.files()) == 10
+    assert source.open().equals(nc_multifile)
+
+
+@pytest.fixture
+def count_open_dataset(monkeypatch):
+    opened = []
+    open_dataset = xr.open_dataset
+
+    def counting_open_dataset(filename, *args, **kwargs):
+        opened.append(Path(filename).name)
+        return open_dataset(filename, *args, **kwargs)
+
+    monkeypatch.setattr(xr, "open_dataset", counting_open_dataset)
+    return opened
+
+
+def test_source_file_template_metadata(tmp_path, nc_multifile, count_open_dataset):
+    source = SourceFile(uri=str(tmp_path / "test-{time:%Y%m%d}.nc"), frequency="1D")
+    meta = source.metadata(refresh=True)
+    assert count_open_dataset == ["test-20000101.nc", "test-20000110.nc"]
+    assert meta.dims == {"time": 240, "latitude": 5, "longitude": 5}
+    assert meta.coords.time.to_index().equals(nc_multifile.time.to_index())
+
+
+@pytest.mark.parametrize("missing", [None, "test-20000105.nc"])
+def test_source_file_glob_metadata_single_step(
+    tmp_path, nc_multifile, count_open_dataset, missing
+):
+    daily = nc_multifile.resample(time="1D").mean()
+    for ind in range(daily.time.size):
+        dsday = daily.isel(time=[ind])
+        dsday.to_netcdf(tmp_path / f"test-{dsday.time.to_index()[0]:%Y%m%d}.nc")
+    if missing is not None:
+        (tmp_path / missing).unlink()
+        daily = daily.drop_sel(time="2000-01-05")
+    source = SourceFile(uri=str(tmp_path / "test-*.nc"))
+    meta = source.metadata(refresh=True)
+    assert meta.coords.time.to_index().equals(daily.time.to_index())
+    if missing is None:
+        assert len(count_open_dataset) == 3
+
+
+def test_source_file_template_requires_frequency(tmp_path):
+    with pytest.raises(ValidationError):
+        SourceFile(uri=str(tmp_path / "test-{time:%Y%m%d}.nc"))
+
+
+def test_source_file_reference(tmp_path, nc_multifile):
+    pytest.importorskip("kerchunk")
+    reference = tmp_path / "reference.json"
+    source = SourceFile(uri=str(tmp_path / "test-*.nc"), reference=reference)
+    dset = source.open()
+    assert reference.is_file()
+    assert dset.time.to_index().equals(nc_multifile.time.to_index())
+    assert dset.equals(nc_multifile)
+
+
+def test_writer_default(tmp_path, nc_data_source):
+    outfile = nc_data_source.get(tmp_path)
+    assert outfile.name == "grid.nc"
+    with xr.open_dataset(outfile) as dset:
+        assert dset.data.encoding["zlib"] is False
+
+
+def test_writer_netcdf_compressed(tmp_path, nc_data_source):
+    nc_data_source.writer = DataWriter(
+        compression="zlib", complevel=5, chunks={"time": 1}
+    )
+    outfile = nc_data_source.get(tmp_path)
+    with xr.open_dataset(outfile) as dset:
+        assert dset.data.encoding["zlib"] is True
+        assert dset.data.encoding["complevel"] == 5
+        assert dset.data.encoding["chunksizes"] == (1, 10, 10)
+        assert dset.equals(nc_data_source.ds)
+
+
+def test_writer_variable_chunks(nc_data_source):
+    writer = DataWriter(chunks={"time": 2}, variable_chunks={"data": {"latitude": 5}})
+    encoding = writer.encoding(nc_data_source.ds)
+    assert encoding["data"]["chunksizes"] == (2, 5, 10)
+
+
+def test_writer_zarr_parallel(tmp_path, nc_data_source):
+    pytest.importorskip("zarr")
+    nc_data_source.writer = DataWriter(
+        format="zarr", compression="zstd", chunks={"time": 5}, parallel=True
+    )
+    outfile = nc_data_source.get(tmp_path)
+    assert outfile.name == "grid.zarr"
+    dset = xr.open_zarr(outfile)
+    assert dset.data.encoding["chunks"] == (5, 10, 10)
+    assert dset.equals(nc_data_source.ds)
+
+
+@pytest.mark.parametrize(
+    "quantize_mode, significant_digits, atol",
+    [("BitRound", 10, 1e-3), ("BitGroom", 3, 1e-3)],
+)
+def test_writer_zarr_compressed_quantized(
+    tmp_path, nc_data_source, quantize_mode, significant_digits, atol
+):
+    pytest.importorskip("zarr")
+    nc_data_source.writer = DataWriter(
+        format="zarr",
+        compression="zlib",
+        quantize_mode=quantize_mode,
+        significant_digits=significant_digits,
+    )
+    outfile = nc_data_source.get(tmp_path)
+    dset = xr.open_zarr(outfile).load()
+    expected = nc_data_source.ds.load()
+    assert not dset.data.equals(expected.data)
+    xr.testing.assert_allclose(dset, expected, rtol=0, atol=atol)
+
+
+@pytest.mark.parametrize("compression", [None, "zlib"])
+def test_writer_netcdf_stream(tmp_path, nc_data_source, compression):
+    nc_data_source.writer = DataWriter(time_chunk=3, compression=compression)
+    outfile = nc_data_source.get(tmp_path)
+    with xr.open_dataset(outfile) as dset:
+        assert dset.encoding["unlimited_dims"] == {"time"}
+        xr.testing.assert_identical(dset, nc_data_source.ds.load())
+
+
+def test_writer_stream_datapoint(tmp_path, grid):
+    source = SourceTimeseriesCSV(filename=HERE / "data" / "wind.csv")
+    times = TimeRange(start="2023-01-01", end="2023-01-01T12")
+    data = DataPoint(id="wind", source=source, writer=DataWriter(time_chunk=5))
+    outfile = data.get(tmp_path, grid, times)
+    with xr.open_dataset(outfile) as dset:
+        xr.testing.assert_allclose(dset, data.ds)
+
+
+def test_writer_zarr_stream(tmp_path, nc_data_source):
+    pytest.importorskip("zarr")
+    nc_data_source.writer = DataWriter(format="zarr", time_chunk=4)
+    outfile = nc_data_source.get(tmp_path)
+    xr.testing.assert_identical(xr.open_zarr(outfile).load(), nc_data_source.ds)
+
+
+def test_writer_quantize_requires_digits():
+    with pytest.raises(ValidationError):
+        DataWriter(quantize_mode="BitRound")
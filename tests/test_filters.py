@@ -0,0 +1,211 @@
+
+import sys
+
+import numpy as np
+import pytest
+import xarray as xr
+
+from rompy.core.filters import (
+    Expression,
+    Filter,
+    crop_filter,
+    crop_indexers,
+    derived_filter,
+    sort_filter,
+)
+from rompy.core.types import Slice
+
+
+@pytest.fixture
+def dset():
+    lat = np.arange(10, -11, -1.0)
+    lon = np.arange(0, 21, 1.0)
+    return xr.Dataset(
+        {"data": (("latitude", "longitude"), np.random.rand(lat.size, lon.size))},
+        coords={"latitude": lat, "longitude": lon},
+    )
+
+
+@pytest.fixture
+def curvilinear():
+    ny, nx = 30, 40
+    jj, ii = np.meshgrid(np.arange(ny), np.arange(nx), indexing="ij")
+    lon = 100 + 0.5 * ii + 0.1 * jj
+    lat = -40 + 0.5 * jj + 0.1 * ii
+    return xr.Dataset(
+        {"data": (("y", "x"), np.random.rand(ny, nx))},
+        coords={"lon": (("y", "x"), lon), "lat": (("y", "x"), lat)},
+    )
+
+
+def test_sort_filter_descending_is_reversed(dset):
+    ds = sort_filter(dset, coords=["latitude"])
+    assert ds.equals(dset.sortby("latitude"))
+
+
+def test_sort_filter_increasing_untouched(dset):
+    assert sort_filter(dset, coords="longitude") is dset
+
+
+def test_plan_crops_before_sort(dset):
+    filters = Filter(
+        sort={"coords": ["latitude"]},
+        crop={"latitude": slice(-5, 5), "longitude": slice(2, 8)},
+    )
+    plan = filters.plan(dset)
+    assert [fn for fn, _ in plan] == ["crop", "sort"]
+    assert plan[0][1]["latitude"] == Slice(start=5, stop=-5)
+
+
+def test_plan_result_unchanged(dset):
+    filters = Filter(
+        sort={"coords": ["latitude"]},
+        crop={"latitude": slice(-5, 5), "longitude": slice(2, 8)},
+    )
+    expected = dset.sortby("latitude").sel(
+        latitude=slice(-5, 5), longitude=slice(2, 8)
+    )
+    assert filters(dset).equals(expected)
+
+
+def test_plan_sort_first_when_unsorted(dset):
+    dset = dset.isel(latitude=np.random.permutation(dset.latitude.size))
+    filters = Filter(sort={"coords": ["latitude"]}, crop={"latitude": slice(-5, 5)})
+    assert [fn for fn, _ in filters.plan(dset)] == ["sort", "crop"]
+
+
+def test_crop_curvilinear_matches_where(curvilinear):
+    crop = {"lon": Slice(start=105, stop=112), "lat": Slice(start=-35, stop=-30)}
+    expected = curvilinear
+    for key, value in crop.items():
+        expected = expected.where(expected[key] > value.start, drop=True)
+        expected = expected.where(expected[key] < value.stop, drop=True)
+    ds = crop_filter(curvilinear, **crop)
+    assert ds.sizes["x"] < curvilinear.sizes["x"]
+    assert ds.equals(expected)
+
+
+def test_crop_curvilinear_empty(curvilinear):
+    ds = crop_filter(curvilinear, lon=Slice(start=0, stop=1))
+    assert ds.data.size == 0
+
+
+@pytest.fixture
+def wind():
+    u10 = np.random.randn(4, 5, 6)
+    v10 = np.random.randn(4, 5, 6)
+    return xr.Dataset(
+        {
+            "u10": (("time", "latitude", "longitude"), u10),
+            "v10": (("time", "latitude", "longitude"), v10),
+        }
+    )
+
+
+def test_derived_filter_backward_compatible():
+    ds = xr.DataArray([-10, -11], coords={"x": [0, 1]}).to_dataset(name="elevation")
+    ds = derived_filter(ds, {"depth": "ds.elevation * -1"})
+    assert ds.depth.values.tolist() == [10, 11]
+
+
+@pytest.mark.parametrize(
+    "expr",
+    [
+        "np.sqrt(ds.u10 ** 2 + ds.v10 ** 2)",
+        "sqrt(u10 ** 2 + v10 ** 2)",
+        "hypot(ds['u10'], ds['v10'])",
+    ],
+)
+def test_expression_wind_speed(wind, expr):
+    expected = np.sqrt(wind.u10**2 + wind.v10**2)
+    assert np.allclose(Expression(expr)(wind), expected)
+
+
+def test_expression_lazy(wind):
+    wind = wind.chunk({"time": 1})
+    expr = "(270 - degrees(arctan2(ds.v10, ds.u10))) % 360"
+    darr = Expression(expr)(wind)
+    assert darr.chunks is not None
+    expected = (270 - np.degrees(np.arctan2(wind.v10, wind.u10))) % 360
+    assert np.allclose(darr.compute(), expected)
+
+
+@pytest.mark.parametrize(
+    "expr",
+    [
+        "__import__('os').system('ls')",
+        "ds.u10.load()",
+        "ds.__class__",
+        "open('file')",
+        "lambda: 1",
+        "'string'",
+    ],
+)
+def test_expression_unsafe(expr):
+    with pytest.raises(ValueError):
+        Expression(expr)
+
+
+@pytest.mark.parametrize("numexpr", [True, False])
+@pytest.mark.parametrize(
+    "expr, dtype",
+    [
+        ("ds.hs * 0.5", "float32"),
+        ("sqrt(ds.hs) * 2 + 1", "float32"),
+        ("ds.hs > 0.5", "bool"),
+        ("ds.hs * ds.tp", "float64"),
+    ],
+)
+def test_expression_dtype(monkeypatch, numexpr, expr, dtype):
+    if numexpr:
+        pytest.importorskip("numexpr")
+    else:
+        monkeypatch.setitem(sys.modules, "numexpr", None)
+    hs = np.linspace(0, 1, 5, dtype="float32")
+    ds = xr.Dataset({"hs": ("x", hs), "tp": ("x", np.linspace(5, 10, 5))})
+    assert Expression(expr)(ds).dtype == dtype
+    darr = Expression(expr)(ds.chunk())
+    assert darr.dtype == dtype
+    assert darr.compute().dtype == dtype
+
+
+def test_expression_missing_variable(wind):
+    with pytest.raises(ValueError):
+        Expression("ds.hs * 2")(wind)
+
+
+@pytest.mark.parametrize(
+    "crop",
+    [
+        {"latitude": Slice(start=-5, stop=5), "longitude": Slice(start=2, stop=7)},
+        {"latitude": Slice(start=5, stop=-5)},
+        {"longitude": Slice(start=30, stop=40)},
+    ],
+)
+def test_crop_indexers_window_contains_crop(dset, crop):
+    indexers = crop_indexers(dset, **crop)
+    assert all(isinstance(index, slice) for index in indexers.values())
+    expected = crop_filter(dset, **crop)
+    assert crop_filter(dset.isel(indexers), **crop).equals(expected)
+    for dim, index in indexers.items():
+        assert index.stop - index.start == max(expected.sizes[dim], 0)
+
+
+@pytest.mark.parametrize(
+    "crop, expected",
+    [
+        ({"latitude": Slice(start=5, stop=-5)}, {"latitude": slice(5, 16)}),
+        ({"latitude": slice(5, -5)}, {"latitude": slice(5, 16)}),
+        ({"latitude": Slice(start=-5, stop=5)}, {"latitude": slice(15, 15)}),
+        ({"longitude": Slice(start=7, stop=2)}, {"longitude": slice(7, 7)}),
+        ({"longitude": Slice(start=2.5, stop=7)}, {"longitude": slice(3, 8)}),
+    ],
+)
+def test_crop_indexers_window(dset, crop, expected):
+    assert crop_indexers(dset, **crop) == expected
+
+
+def test_filter_crop_windows_sorted(dset):
+    filters = Filter(sort={"coords": ["latitude"]}, crop={"latitude": slice(-5, 5)})
+    assert filters.crop_windows(dset) == {"latitude": slice(5, 16)}
+    assert filters(dset.isel(filters.crop_windows(dset))).equals(filters(dset))
@@ -0,0 +1,44 @@
+import subprocess
+import sys
+
+import pytest
+
+
+HEAVY = ["cartopy", "matplotlib", "intake", "wavespectra", "oceanum"]
+
+
+def imported_modules(module):
+    """Top level packages imported by `module` parsed from `python -X importtime`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = set()
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            name = line.rsplit("|", 1)[-1].strip()
+            modules.add(name.split(".")[0])
+    return modules
+
+
+# The vendored pyschism mesh still imports matplotlib so rompy.schism is not checked
+@pytest.mark.parametrize(
+    "module", ["rompy.core.data", "rompy.core.grid", "rompy.core.source", "rompy.swan"]
+)
+def test_heavy_dependencies_imported_on_first_use(module):
+    modules = imported_modules(module)
+    assert "rompy" in modules
+    assert not modules.intersection(HEAVY)
+
+
+def test_swan_output_backend_is_light():
+    """xarray imports the backend module whenever it resolves the engines."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import rompy.swan.output"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert "rompy.swan.components" not in result.stderr
@@ -0,0 +1,89 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+import xarray as xr
+
+import rompy.core.interpolate
+from rompy.core.interpolate import InterpolationPlan, interpolation_plan
+
+
+HERE = Path(__file__).parent
+
+
+@pytest.fixture(scope="module")
+def dset():
+    with xr.open_dataset(HERE / "data/aus-20230101.nc") as ds:
+        yield ds.load()
+
+
+@pytest.fixture
+def plan_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(rompy.core.interpolate, "PLAN_DIR", tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def points():
+    # Away from the site lattice to avoid ties in the neighbour search
+    lons = np.linspace(112.0, 116.0, 9) + 0.137
+    lats = np.linspace(-34.0, -30.0, 9) + 0.071
+    return lons, lats
+
+
+@pytest.mark.parametrize(
+    "kwargs", [dict(tolerance=2.0), dict(tolerance=0.3), dict(max_sites=None)]
+)
+def test_idw_matches_wavespectra(dset, points, kwargs):
+    lons, lats = points
+    plan = InterpolationPlan.idw(dset.lon.values, dset.lat.values, lons, lats, **kwargs)
+    dsout = plan.apply(dset)
+    expected = dset.spec.sel(lons=lons, lats=lats, method="idw", **kwargs)
+    for name in ["efth", "dpt", "wspd", "lon", "lat"]:
+        assert dsout[name].dims == expected[name].dims
+        assert np.allclose(dsout[name], expected[name], equal_nan=True, rtol=1e-5)
+
+
+def test_idw_exact_match(dset):
+    lons, lats = dset.lon.values[[10, 20]], dset.lat.values[[10, 20]]
+    plan = InterpolationPlan.idw(dset.lon.values, dset.lat.values, lons, lats)
+    assert np.allclose(plan.weights.toarray().sum(axis=1), 1.0)
+    dsout = plan.apply(dset)
+    assert np.allclose(dsout.efth, dset.efth.isel(site=[10, 20]))
+
+
+def test_nearest_matches_wavespectra(dset, points):
+    lons, lats = points
+    plan = InterpolationPlan.nearest(dset.lon.values, dset.lat.values, lons, lats)
+    dsout = plan.apply(dset)
+    expected = dset.spec.sel(lons=lons, lats=lats, method="nearest")
+    xr.testing.assert_identical(dsout, expected)
+
+
+def test_nearest_out_of_tolerance(dset):
+    with pytest.raises(ValueError):
+        InterpolationPlan.nearest(dset.lon.values, dset.lat.values, [0.0], [0.0])
+
+
+def test_apply_time_chunk(dset, points):
+    plan = InterpolationPlan.idw(dset.lon.values, dset.lat.values, *points)
+    dsout = plan.apply(dset, time_chunk=2)
+    assert dsout.efth.chunks[0] == (2, 2, 1)
+    xr.testing.assert_allclose(dsout.compute(), plan.apply(dset))
+
+
+def test_apply_wrong_sites(dset, points):
+    plan = InterpolationPlan.idw(dset.lon.values, dset.lat.values, *points)
+    with pytest.raises(ValueError):
+        plan.apply(dset.isel(site=slice(0, 10)))
+
+
+def test_interpolation_plan_persisted(dset, points, plan_dir):
+    args = ("idw", dset.lon.values, dset.lat.values, *points)
+    plan = interpolation_plan(*args, tolerance=2.0)
+    assert len(list(plan_dir.glob("*.npz"))) == 1
+    loaded = interpolation_plan(*args, tolerance=2.0)
+    assert (loaded.weights != plan.weights).nnz == 0
+    assert np.array_equal(loaded.mask, plan.mask)
+    interpolation_plan(*args, tolerance=3.0)
+    assert len(list(plan_dir.glob("*.npz"))) == 2
@@ -0,0 +1,107 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+
+import rompy.swan.data  # noqa: F401 - registers the swan accessor
+from rompy.swan.ascii import format_blocks, write_swan_grid
+
+
+@pytest.fixture
+def values():
+    rng = np.random.default_rng(0)
+    return np.concatenate(
+        [
+            rng.normal(0, 10, 1000),
+            rng.normal(0, 1e6, 100),
+            rng.normal(0, 5, 100).astype("float32"),
+            np.arange(-2000, 2000) / 800,
+            [0.0, -0.0, -1e-9, np.nan, np.inf, -np.inf, 1e20, 0.125, 1.005, 2.675],
+            [9.995, -9.995, 4503599627370495.5],
+        ]
+    )
+
+
+@pytest.fixture
+def dset():
+    rng = np.random.default_rng(0)
+    u10 = rng.normal(0, 8, (5, 4, 6))
+    u10[:, 0, :2] = np.nan
+    return xr.Dataset(
+        {
+            "u10": (("time", "lat", "lon"), u10),
+            "v10": (("time", "lat", "lon"), -u10),
+            "depth": (("lat", "lon"), rng.normal(10, 50, (4, 6))),
+        },
+        coords={
+            "time": pd.date_range("2023-01-01", periods=5, freq="h"),
+            "lat": np.arange(4.0),
+            "lon": np.arange(6.0),
+        },
+    )
+
+
+def savetxt(arr, **kwargs):
+    stream = io.StringIO()
+    np.savetxt(stream, arr, **kwargs)
+    return stream.getvalue()
+
+
+@pytest.mark.parametrize("fmt", ["%4.2f", "%.2f", "%.0f", "%10.3f", "%e"])
+@pytest.mark.parametrize("delimiter", ["\t", " ", ""])
+def test_format_blocks_matches_savetxt(values, fmt, delimiter):
+    arr = values[: values.size // 30 * 30].reshape(2, -1, 15)
+    blocks = format_blocks(arr, fmt=fmt, delimiter=delimiter)
+    for block, expected in zip(blocks, arr):
+        assert block.decode() == savetxt(expected, fmt=fmt, delimiter=delimiter)
+
+
+def test_format_blocks_single_column(values):
+    arr = values[:100].reshape(2, 50)
+    blocks = format_blocks(arr, fmt="%.2f")
+    assert blocks[1].decode() == savetxt(arr[1], fmt="%.2f")
+
+
+@pytest.mark.parametrize("max_workers", [None, 2])
+def test_to_inpgrid_matches_savetxt(tmp_path, dset, max_workers):
+    output_file = tmp_path / "wind.grd"
+    dset.swan.to_inpgrid(output_file, z1="u10", z2="v10", max_workers=max_workers)
+    expected = ""
+    for ind, time in enumerate(dset.time.to_index()):
+        expected += f"{time:%Y%m%d.%H%M%S}\n"
+        expected += savetxt(dset.u10[ind].values, fmt="%.2f")
+        expected += savetxt(dset.v10[ind].values, fmt="%.2f")
+    assert output_file.read_text() == expected
+
+
+def test_write_swan_grid_time_blocks(tmp_path, dset):
+    variables = ["u10", "v10"]
+    write_swan_grid(dset, tmp_path / "all.grd", variables, fill_value=-99.0)
+    write_swan_grid(dset, tmp_path / "blocks.grd", variables, fill_value=-99.0, ntime=2)
+    assert (tmp_path / "all.grd").read_text() == (tmp_path / "blocks.grd").read_text()
+
+
+def test_to_bottom_grid_masks_only_depth(tmp_path, dset):
+    output_file = tmp_path / "bottom.grd"
+    dset.swan.to_bottom_grid(output_file, z="depth", vmin=0.0)
+    depth = dset.depth.where(dset.depth > 0.0).fillna(-99.0).values
+    expected = savetxt(depth, fmt="%4.2f", delimiter="\t")
+    assert output_file.read_text() == expected
+
+
+def test_to_inpgrid_unformatted(tmp_path, dset):
+    from scipy.io import FortranFile
+
+    output_file = tmp_path / "wind.bin"
+    inpgrid, readinp = dset.swan.to_inpgrid(
+        output_file, z1="u10", z2="v10", format="unformatted"
+    )
+    assert readinp.endswith("nhedt=0 nhedvec=0 UNFORMATTED")
+    stream = FortranFile(output_file)
+    for ind in range(dset.time.size):
+        for var in ["u10", "v10"]:
+            data = np.array([stream.read_reals("f4") for _ in range(dset.lat.size)])
+            expected = dset[var][ind].values.astype("f4")
+            assert np.array_equal(data, expected, equal_nan=True)
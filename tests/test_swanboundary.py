@@ -1,13 +1,30 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 from pathlib import Path
+import numpy as np
 import xarray as xr
 from wavespectra import read_swan
 
+import rompy.core.boundary
+import rompy.swan.boundary
+from rompy.core.boundary import (
+    SPACING_CACHE,
+    find_minimum_distance,
+    nearest_neighbour_distances,
+    spacing_stats,
+)
 from rompy.core.time import TimeRange
 from rompy.swan.grid import SwanGrid
 from rompy.core.source import SourceFile, SourceIntake
 from rompy.core.source import SourceWavespectra
-from rompy.swan.boundary import Boundnest1, BoundspecSide, BoundspecSegmentXY
+from rompy.swan.boundary import (
+    Boundnest1,
+    BoundspecSide,
+    BoundspecSegmentXY,
+    write_swan_spectra,
+    write_tpar,
+)
 
 
 HERE = Path(__file__).parent
@@ -151,6 +168,29 @@ def test_boundspecsegmentxy_from_sides(tmp_path, time, grid):
     cmds = bnd.get(destdir=tmp_path, grid=grid, time=time)
 
 
+def test_boundspecsegmentxy_tpar_matches_segment_mean(tmp_path, time, grid):
+    bnd = BoundspecSegmentXY(
+        id="westaus",
+        source=SourceFile(
+            uri=HERE / "data/aus-20230101.nc",
+            kwargs=dict(engine="netcdf4"),
+        ),
+        sel_method="idw",
+        sel_method_kwargs={"tolerance": 3.0},
+        location={"model_type": "side", "side": "west"},
+    )
+    filenames, cmds = bnd.get(destdir=tmp_path, grid=grid, time=time)
+    assert len(filenames) == len(cmds.split("\n"))
+    ds = bnd._sel_boundary(grid).sortby("dir")
+    assert len(filenames) == ds.site.size - 1
+    for ind in [0, len(filenames) - 1]:
+        dsite = ds.isel(site=slice(ind, ind + 2)).mean("site")
+        stats = dsite.spec.stats(["hs", "tp", "dpm", "dspr"]).to_pandas()
+        expected = tmp_path / "expected.bnd"
+        write_tpar(stats, expected)
+        assert filenames[ind].read_text() == expected.read_text()
+
+
 def test_source_wavespectra_ploting(tmp_path):
     Boundnest1(
         id="westaus",
@@ -164,3 +204,112 @@ def test_source_wavespectra_ploting(tmp_path):
         rectangle="closed",
         coords={"x": "lon", "y": "lat"},
     ).plot()
+
+
+def test_find_minimum_distance_bruteforce():
+    points = [tuple(p) for p in np.random.rand(200, 2) * 10]
+    original = list(points)
+    xy = np.array(points)
+    dist = np.hypot(*(xy[:, None, :] - xy[None, :, :]).transpose(2, 0, 1))
+    np.fill_diagonal(dist, np.inf)
+    assert find_minimum_distance(points) == pytest.approx(dist.min())
+    assert points == original
+    assert find_minimum_distance(points[:1]) == float("inf")
+
+
+def test_nearest_neighbour_distances_geodesic():
+    # One degree of longitude at 60S is half a degree of great-circle arc
+    lon = np.array([110.0, 111.0, 113.0])
+    lat = np.array([-60.0, -60.0, -60.0])
+    cartesian = nearest_neighbour_distances(lon, lat)
+    geodesic = nearest_neighbour_distances(lon, lat, geodesic=True)
+    assert cartesian == pytest.approx([1.0, 1.0, 2.0])
+    assert geodesic[0] == pytest.approx(0.5, rel=1e-3)
+    assert (geodesic < cartesian).all()
+
+
+def test_spacing_stats():
+    stats = spacing_stats([0, 1, 3, 6], [0, 0, 0, 0])
+    assert stats.min == 1
+    assert stats.max == 3
+    assert stats.median == 1.5
+    assert stats.count == 4
+
+
+def test_source_grid_spacing_cached(grid):
+    SPACING_CACHE.clear()
+    bnd = Boundnest1(
+        id="westaus",
+        source=SourceFile(
+            uri=HERE / "data/aus-20230101.nc",
+            kwargs=dict(engine="netcdf4"),
+        ),
+        rectangle="closed",
+    )
+    spacing = bnd._source_grid_spacing(grid)
+    assert len(SPACING_CACHE) == 1
+    stats = list(SPACING_CACHE.values())[0]
+    assert stats.min == spacing
+    assert stats.median >= spacing
+    assert bnd._source_grid_spacing(grid) == spacing
+    assert len(SPACING_CACHE) == 1
+
+
+def test_source_grid_spacing_concurrent(monkeypatch):
+    monkeypatch.setattr(rompy.core.boundary, "SPACING_CACHE_SIZE", 2)
+    SPACING_CACHE.clear()
+    bnd = Boundnest1(
+        id="westaus",
+        source=SourceFile(uri=HERE / "data/aus-20230101.nc"),
+        rectangle="closed",
+    )
+    grids = [
+        SwanGrid(x0=110 + 0.5 * ind, y0=-30, dx=0.5, dy=0.5, nx=10, ny=10)
+        for ind in range(8)
+    ]
+    expected = [bnd._source_grid_spacing(grid) for grid in grids]
+    SPACING_CACHE.clear()
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        spacings = list(executor.map(bnd._source_grid_spacing, grids * 4))
+    assert spacings == expected * 4
+    assert len(SPACING_CACHE) == 2
+
+
+@pytest.mark.parametrize("ntime", [None, 2])
+def test_write_swan_spectra_matches_wavespectra(tmp_path, ntime):
+    dset = xr.open_dataset(HERE / "data/aus-20230101.nc").load()
+    efth = dset.efth.values
+    efth[0, 0] = np.nan
+    efth[1, 1] = 0.0
+    efth[2, 2] *= -1e-6
+    efth[3, 3, 0, 0] = -1e9
+    dset["efth"] = dset.efth.copy(data=efth)
+    for ds in [dset.chunk(time=3), dset.astype("float32"), dset.isel(time=0)]:
+        ds.spec.to_swan(tmp_path / "expected.spec")
+        write_swan_spectra(ds, tmp_path / "spectra.spec", ntime=ntime)
+        expected = (tmp_path / "expected.spec").read_bytes()
+        assert (tmp_path / "spectra.spec").read_bytes() == expected
+
+
+def test_boundspec_spec2d_written_lazily(tmp_path, monkeypatch):
+    dset = xr.open_dataset(HERE / "data/aus-20230101.nc").isel(site=[0, 1])
+    bnd = BoundspecSide(
+        id="westaus",
+        source=SourceFile(uri=HERE / "data/aus-20230101.nc"),
+        location={"side": "west"},
+        file_type="spec2d",
+    )
+    lazy = []
+
+    def write(dsite, filename, ntime=None):
+        lazy.append(dsite.efth.chunks is not None)
+        write_swan_spectra(dsite, filename, ntime=ntime)
+
+    monkeypatch.setattr(rompy.swan.boundary, "write_swan_spectra", write)
+    filenames = [tmp_path / f"spec2d_{ind:03d}.bnd" for ind in range(2)]
+    bnd._write_files(dset.chunk(time=4), filenames)
+    assert lazy == [True, True]
+    for ind, filename in enumerate(filenames):
+        expected = tmp_path / "expected.bnd"
+        write_swan_spectra(dset.isel(site=ind, drop=True).load(), expected)
+        assert filename.read_text() == expected.read_text()
@@ -82,3 +82,67 @@ def test_swandata_write(tmp_path, nc_data_source):
 
 def test_bathy_write(tmp_path, nc_bathy):
     config = nc_bathy.get(tmp_path)
+
+
+def test_swandata_write_unformatted(tmp_path, nc_data_source):
+    swangrid = SwanGrid(x0=0, y0=0, dx=1, dy=1, nx=10, ny=10)
+    nc_data_source.format = "unformatted"
+    config = nc_data_source.get(tmp_path, swangrid)
+    readinp = config.strip().split("\n")[-1]
+    assert readinp == (
+        "READINP WIND fac=1.0 fname1='wind.bin' idla=3 nhedf=0 nhedt=0 nhedvec=0 "
+        "UNFORMATTED"
+    )
+    # 10 times of 10 rows for each component, each with 10 values and 2 markers
+    assert (tmp_path / "wind.bin").stat().st_size == 10 * 2 * 10 * (10 * 4 + 8)
+
+
+def test_to_tpar_boundary(tmp_path):
+    from shapely.geometry import Polygon
+    from shapely.ops import substring
+
+    lon = np.arange(110, 115.01, 0.1)
+    lat = np.arange(-35, -29.99, 0.1)
+    times = pd.date_range("2023-01-01", periods=6, freq="h")
+    shape = (times.size, lat.size, lon.size)
+    hs = np.random.rand(*shape).astype("float32")
+    hs[:, :10, :10] = np.nan
+    dims = ("time", "lat", "lon")
+    ds = xr.Dataset(
+        {
+            "sig_wav_ht": (dims, hs),
+            "pk_wav_per": (dims, np.random.rand(*shape).astype("float32") * 15),
+            "pk_wav_dir": (dims, np.random.rand(*shape).astype("float32") * 360),
+        },
+        coords={"time": times, "lat": lat, "lon": lon},
+    )
+    poly = Polygon(
+        [
+            (110.2, -34.8),
+            (112.3, -34.9),
+            (114.8, -34.7),
+            (114.7, -30.2),
+            (110.3, -30.3),
+        ]
+    )
+    cmd = ds.swan.to_tpar_boundary(tmp_path, poly, 0.37)
+    # Expected points and files from the substrings of the boundary
+    splits = np.linspace(0, 1.0, int(poly.length / 0.37))
+    expected = []
+    for i in range(len(splits) - 1):
+        segment = substring(poly.exterior, splits[i], splits[i + 1], normalized=True)
+        xp, yp = segment.coords[1]
+        dsp = ds.sel(lon=xp, lat=yp, method="nearest")
+        if not dsp.sig_wav_ht.isnull().any():
+            expected.append((splits[i + 1], dsp))
+    assert len(list(tmp_path.glob("*.TPAR"))) == len(expected)
+    assert cmd.count(".TPAR") == len(expected)
+    split, dsp = expected[0]
+    assert f"{split * poly.length:0.8f} '0.TPAR'" in cmd
+    lines = (tmp_path / "0.TPAR").read_text().splitlines()
+    assert lines[0] == "TPAR"
+    assert lines[1] == (
+        f"20230101.000000 {float(dsp.sig_wav_ht[0]):0.2f} "
+        f"{float(dsp.pk_wav_per[0]):0.2f} {float(dsp.pk_wav_dir[0]):0.1f} 20.00"
+    )
+    assert len(lines) == times.size + 1
@@ -78,3 +78,13 @@ def test_grid_from_component(grid):
     )
     grid2 = SwanGrid.from_component(regular_grid_component)
     assert grid == grid2
+
+
+def test_boundary_matches_grid_edges():
+    grid = SwanGrid(x0=110, y0=-30, dx=0.5, dy=0.25, nx=21, ny=31, rot=25)
+    x, y = grid.x, grid.y
+    xedge = np.concatenate([x[0, :], x[1:, -1], x[-1, -2::-1], x[-2::-1, 0]])
+    yedge = np.concatenate([y[0, :], y[1:, -1], y[-1, -2::-1], y[-2::-1, 0]])
+    xbnd, ybnd = grid.boundary().exterior.coords.xy
+    assert np.allclose(xbnd, xedge)
+    assert np.allclose(ybnd, yedge)